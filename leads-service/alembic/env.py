@@ -10,8 +10,9 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.postgres import Base
-from app.models.lead import Lead
+from app.models.lead import Lead, LeadCount
 from app.authentication.models import User
+from app.models.outbox import OutboxEvent
 
 config = context.config
 
@@ -0,0 +1,42 @@
+"""Add (created_at, id) index for keyset pagination of leads
+
+Revision ID: 3f9a1c7b2d4e
+Revises: e49e5261287d
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7b2d4e'
+down_revision: Union[str, None] = 'e49e5261287d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build without blocking lead inserts; CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_alma_lead_service_leads_created_at_id',
+            'leads',
+            [sa.text('created_at DESC'), sa.text('id DESC')],
+            unique=False,
+            schema='alma_lead_service',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_alma_lead_service_leads_created_at_id',
+            table_name='leads',
+            schema='alma_lead_service',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,31 @@
+"""Add version column to leads for optimistic concurrency
+
+Revision ID: 5d8e2a4c9f13
+Revises: b81d5f3e6c27
+Create Date: 2026-10-17 15:20:41.118306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8e2a4c9f13'
+down_revision: Union[str, None] = 'b81d5f3e6c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default is stored in the catalog, so this does not rewrite the table
+    op.add_column(
+        'leads',
+        sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+        schema='alma_lead_service'
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('leads', 'version', schema='alma_lead_service')
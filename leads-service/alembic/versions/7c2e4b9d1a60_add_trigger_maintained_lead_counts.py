@@ -0,0 +1,116 @@
+"""Add trigger-maintained per-status lead counts
+
+Revision ID: 7c2e4b9d1a60
+Revises: 3f9a1c7b2d4e
+Create Date: 2026-10-17 10:41:05.527731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e4b9d1a60'
+down_revision: Union[str, None] = '3f9a1c7b2d4e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('lead_counts',
+    sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+    sa.Column('status', postgresql.ENUM(name='leadstatus', create_type=False), nullable=False),
+    sa.Column('delta', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    schema='alma_lead_service'
+    )
+
+    # Statement-level triggers with transition tables: one delta row per status
+    # per statement, so a bulk COPY costs a single insert here, not one per lead.
+    op.execute("""
+        CREATE FUNCTION alma_lead_service.lead_counts_on_insert() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO alma_lead_service.lead_counts (status, delta)
+            SELECT status, count(*) FROM new_rows GROUP BY status;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION alma_lead_service.lead_counts_on_delete() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO alma_lead_service.lead_counts (status, delta)
+            SELECT status, -count(*) FROM old_rows GROUP BY status;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION alma_lead_service.lead_counts_on_update() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO alma_lead_service.lead_counts (status, delta)
+            SELECT status, sum(delta) FROM (
+                SELECT status, -1 AS delta FROM old_rows
+                UNION ALL
+                SELECT status, 1 AS delta FROM new_rows
+            ) changes
+            GROUP BY status
+            HAVING sum(delta) <> 0;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION alma_lead_service.lead_counts_on_truncate() RETURNS trigger AS $$
+        BEGIN
+            DELETE FROM alma_lead_service.lead_counts;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE FUNCTION alma_lead_service.compact_lead_counts() RETURNS void AS $$
+            WITH folded AS (
+                DELETE FROM alma_lead_service.lead_counts RETURNING status, delta
+            )
+            INSERT INTO alma_lead_service.lead_counts (status, delta)
+            SELECT status, sum(delta) FROM folded GROUP BY status
+        $$ LANGUAGE sql
+    """)
+
+    # Seed and attach triggers while inserts are held off so no row is missed or counted twice
+    op.execute("LOCK TABLE alma_lead_service.leads IN SHARE ROW EXCLUSIVE MODE")
+    op.execute("""
+        INSERT INTO alma_lead_service.lead_counts (status, delta)
+        SELECT status, count(*) FROM alma_lead_service.leads GROUP BY status
+    """)
+    op.execute("""
+        CREATE TRIGGER leads_count_insert AFTER INSERT ON alma_lead_service.leads
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION alma_lead_service.lead_counts_on_insert()
+    """)
+    op.execute("""
+        CREATE TRIGGER leads_count_delete AFTER DELETE ON alma_lead_service.leads
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION alma_lead_service.lead_counts_on_delete()
+    """)
+    op.execute("""
+        CREATE TRIGGER leads_count_update AFTER UPDATE ON alma_lead_service.leads
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION alma_lead_service.lead_counts_on_update()
+    """)
+    op.execute("""
+        CREATE TRIGGER leads_count_truncate AFTER TRUNCATE ON alma_lead_service.leads
+        FOR EACH STATEMENT EXECUTE FUNCTION alma_lead_service.lead_counts_on_truncate()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS leads_count_truncate ON alma_lead_service.leads")
+    op.execute("DROP TRIGGER IF EXISTS leads_count_update ON alma_lead_service.leads")
+    op.execute("DROP TRIGGER IF EXISTS leads_count_delete ON alma_lead_service.leads")
+    op.execute("DROP TRIGGER IF EXISTS leads_count_insert ON alma_lead_service.leads")
+    op.execute("DROP FUNCTION IF EXISTS alma_lead_service.compact_lead_counts()")
+    op.execute("DROP FUNCTION IF EXISTS alma_lead_service.lead_counts_on_truncate()")
+    op.execute("DROP FUNCTION IF EXISTS alma_lead_service.lead_counts_on_update()")
+    op.execute("DROP FUNCTION IF EXISTS alma_lead_service.lead_counts_on_delete()")
+    op.execute("DROP FUNCTION IF EXISTS alma_lead_service.lead_counts_on_insert()")
+    op.drop_table('lead_counts', schema='alma_lead_service')
@@ -0,0 +1,63 @@
+"""Enforce lead email uniqueness case-insensitively
+
+Replaces the unique index on email with one on lower(email), which is the
+conflict target for INSERT ... ON CONFLICT on lead creation and serves the
+case-insensitive email lookups. Building the index fails if the table
+already holds emails that differ only by case; merge those first.
+
+Revision ID: a4f7c1e8b2d9
+Revises: 5d8e2a4c9f13
+Create Date: 2026-10-17 16:02:57.640193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f7c1e8b2d9'
+down_revision: Union[str, None] = '5d8e2a4c9f13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build the new index before dropping the old one so uniqueness is never unenforced
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_alma_lead_service_leads_email_lower',
+            'leads',
+            [sa.text('lower(email)')],
+            unique=True,
+            schema='alma_lead_service',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_alma_lead_service_leads_email',
+            table_name='leads',
+            schema='alma_lead_service',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_alma_lead_service_leads_email',
+            'leads',
+            ['email'],
+            unique=True,
+            schema='alma_lead_service',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.drop_index(
+            'ix_alma_lead_service_leads_email_lower',
+            table_name='leads',
+            schema='alma_lead_service',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
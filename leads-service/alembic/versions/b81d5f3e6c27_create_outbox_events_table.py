@@ -0,0 +1,48 @@
+"""Create outbox_events table
+
+Revision ID: b81d5f3e6c27
+Revises: 7c2e4b9d1a60
+Create Date: 2026-10-17 12:03:19.402611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d5f3e6c27'
+down_revision: Union[str, None] = '7c2e4b9d1a60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_events',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('topic', sa.String(length=255), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=True),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    schema='alma_lead_service'
+    )
+    op.create_index(
+        'ix_alma_lead_service_outbox_events_pending',
+        'outbox_events',
+        ['next_attempt_at'],
+        unique=False,
+        schema='alma_lead_service',
+        postgresql_where=sa.text('published_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alma_lead_service_outbox_events_pending', table_name='outbox_events', schema='alma_lead_service')
+    op.drop_table('outbox_events', schema='alma_lead_service')
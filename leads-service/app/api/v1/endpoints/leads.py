@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile, Query, Body
-from sqlalchemy.orm import Session
-from app.core.postgres import get_postgres_db
+from fastapi import APIRouter, Depends, Form, File, UploadFile, Query, Body, Header, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.postgres import get_async_postgres_db, get_async_read_db, replica_router
 from app.authentication.jwt import get_current_user, require_attorney
-from app.schemas.lead import LeadResponse, LeadListResponse, LeadStatusUpdateRequest
+from app.schemas.lead import (
+    LeadResponse,
+    LeadListResponse,
+    LeadStatusUpdateRequest,
+    LeadBulkStatusUpdateRequest,
+    LeadBulkStatusUpdateResponse,
+    CountStrategy,
+    LeadImportReport,
+)
 from app.services.lead_service import LeadService
+from app.services.lead_import_service import LeadImportService
+from app.services.lead_cache import lead_cache
+from app.utils import make_etag, is_not_modified
 from app.models.lead import LeadStatus
 
 router = APIRouter()
 lead_service = LeadService()
+lead_import_service = LeadImportService()
 
 
 @router.post("/leads", response_model=LeadResponse, status_code=201)
@@ -16,19 +30,58 @@ async def create_lead(
     last_name: str = Form(...),
     email: str = Form(...),
     resume: UploadFile = File(...),
-    db: Session = Depends(get_postgres_db)
+    db: AsyncSession = Depends(get_async_postgres_db)
 ):
     """Create a new lead with resume upload"""
     return await lead_service.create_lead(first_name, last_name, email, resume, db)
 
-@router.get("/leads/{lead_id}", response_model=LeadResponse)
+@router.post(
+    "/leads/import",
+    response_model=LeadImportReport,
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "Progress lines when stream=true"}}
+)
+async def import_leads(
+    file: UploadFile = File(..., description="NDJSON or CSV rows with first_name, last_name, email and optional resume"),
+    resumes: UploadFile = File(None, description="Zip archive holding the files named in the resume column"),
+    stream: bool = Query(False, description="Stream NDJSON progress lines, ending with the report"),
+    current_user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_postgres_db)
+):
+    """Import a batch of leads (requires authentication)"""
+    job = await lead_import_service.prepare(file, resumes)
+    replica_router.record_write(current_user["username"])
+    if stream:
+        return StreamingResponse(lead_import_service.stream(job), media_type="application/x-ndjson")
+    return await lead_import_service.run(db, job)
+
+@router.get(
+    "/leads/{lead_id}",
+    response_model=LeadResponse,
+    responses={304: {"description": "Lead unchanged since the ETag the client sent"}}
+)
 async def get_lead_by_id(
     lead_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_postgres_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
-    """Get a specific lead by ID"""
-    return lead_service.get_lead_by_id(db, lead_id)
+    """Get a specific lead by ID; supports If-None-Match"""
+    lead = await lead_service.get_lead_by_id(db, lead_id)
+
+    # resume_url is part of the representation, so a re-signed URL is a new ETag. There is no
+    # Last-Modified/If-Modified-Since: a date can't tell a client its cached URL has expired.
+    last_modified = lead.updated_at or lead.created_at
+    headers = {
+        "ETag": make_etag(lead.id, lead.version, last_modified.isoformat(), lead.resume_url),
+        "Cache-Control": "private, no-cache",
+    }
+    not_modified = is_not_modified(headers["ETag"], if_none_match)
+    lead_cache.record_response(not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return lead
 
 @router.put("/leads/{lead_id}", response_model=LeadResponse)
 async def update_lead(
@@ -37,35 +90,58 @@ async def update_lead(
     last_name: str = Form(None),
     email: str = Form(None),
     resume: UploadFile = File(None),
+    version: Optional[int] = Form(None, description="Expected lead version; the update fails with 409 if the lead has changed"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_postgres_db)
+    db: AsyncSession = Depends(get_async_postgres_db)
 ):
     """Update lead information (supports file upload)"""
-    return await lead_service.update_lead(
+    lead = await lead_service.update_lead(
         db=db,
         lead_id=lead_id,
         first_name=first_name,
         last_name=last_name,
         email=email,
-        resume_file=resume
+        resume_file=resume,
+        expected_version=version
     )
+    replica_router.record_write(current_user["username"])
+    return lead
 
 @router.get("/leads", response_model=LeadListResponse)
 async def get_leads(
     page: int = Query(1, ge=1, description="Page number (starts from 1)"),
     page_size: int = Query(10, ge=1, le=100, description="Number of items per page (1-100)"),
+    cursor: Optional[str] = Query(None, description="Opaque next_cursor from a previous page; takes precedence over page"),
+    count: Optional[CountStrategy] = Query(None, description="How to compute total (defaults to LEADS_COUNT_STRATEGY)"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_postgres_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get paginated leads with resume download URLs (requires authentication)"""
-    return lead_service.get_paginated_leads(db, page=page, page_size=page_size)
+    return await lead_service.get_paginated_leads(
+        db, page=page, page_size=page_size, cursor=cursor, count_strategy=count
+    )
 
 
 @router.patch("/leads/status", response_model=LeadResponse)
 async def update_lead_status(
     request: LeadStatusUpdateRequest = Body(...),
     current_user: dict = Depends(require_attorney),  # Only attorneys can update status
-    db: Session = Depends(get_postgres_db)
+    db: AsyncSession = Depends(get_async_postgres_db)
 ):
     """Update lead status by email (attorney only)"""
-    return lead_service.update_lead_status(db, request.email, request.status)
+    lead = await lead_service.update_lead_status(db, request.email, request.status, request.version)
+    replica_router.record_write(current_user["username"])
+    return lead
+
+
+@router.patch("/leads/status/bulk", response_model=LeadBulkStatusUpdateResponse)
+async def update_lead_status_bulk(
+    request: LeadBulkStatusUpdateRequest = Body(...),
+    current_user: dict = Depends(require_attorney),  # Only attorneys can update status
+    db: AsyncSession = Depends(get_async_postgres_db)
+):
+    """Update the status of many leads by email or ID (attorney only)"""
+    result = await lead_service.update_lead_status_bulk(db, request)
+    replica_router.record_write(current_user["username"])
+    return result
+
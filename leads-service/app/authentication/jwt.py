@@ -3,10 +3,31 @@ from jose import JWTError, jwt
 from fastapi import HTTPException, Security
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.core.config import settings
+from app.utils import TTLCache
 from typing import Dict
+import hashlib
+import threading
+import time
 
 security = HTTPBearer()
 
+# Verified claims by token digest. Entries live until the token's exp or
+# JWT_CACHE_MAX_TTL_SECONDS, whichever is sooner. TTLCache is lock-protected, so
+# the sync dependencies below can share it from FastAPI's threadpool.
+token_cache: TTLCache[bytes, Dict[str, str]] = TTLCache(
+    maxsize=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_MAX_TTL_SECONDS
+)
+_token_cache_secret = settings.SECRET_KEY
+_token_cache_lock = threading.Lock()
+
+
+def flush_token_cache() -> None:
+    """Drop every cached verification, e.g. after SECRET_KEY rotation"""
+    global _token_cache_secret
+    with _token_cache_lock:
+        token_cache.clear()
+        _token_cache_secret = settings.SECRET_KEY
+
 
 def create_access_token(data: dict) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -15,17 +36,38 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> Dict[str, str]:
+def _verify_token(token: str) -> Dict[str, str]:
+    """Verify signature and expiry; returns the user claims and caches them"""
     try:
-        payload = jwt.decode(credentials.credentials, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username: str = payload.get("sub")
-        role: str = payload.get("role")
-        if username is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        return {"username": username, "role": role}
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    username: str = payload.get("sub")
+    role: str = payload.get("role")
+    if username is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = {"username": username, "role": role}
+
+    ttl = settings.JWT_CACHE_MAX_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, float(payload["exp"]) - time.time())
+    if ttl > 0:
+        token_cache.set(hashlib.sha256(token.encode("utf-8")).digest(), user, ttl=ttl)
+    return user
+
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Security(security)) -> Dict[str, str]:
+    if settings.SECRET_KEY != _token_cache_secret:
+        # Tokens verified with the old key must be checked again
+        flush_token_cache()
+
+    token = credentials.credentials
+    cached = token_cache.get(hashlib.sha256(token.encode("utf-8")).digest())
+    if cached is not None:
+        return dict(cached)
+    return dict(_verify_token(token))
+
 
 def require_attorney(credentials: HTTPAuthorizationCredentials = Security(security)) -> Dict[str, str]:
     """Require attorney role"""
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.postgres import get_postgres_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.postgres import get_async_postgres_db
 from app.authentication.jwt import create_access_token
 from app.authentication.schemas import UserCreate, UserLogin, TokenResponse
 from app.authentication.service import AuthService
@@ -10,8 +10,8 @@ auth_service = AuthService()
 
 
 @router.post("/signup", response_model=TokenResponse, status_code=201)
-async def signup(user_data: UserCreate, db: Session = Depends(get_postgres_db)):
-    user = auth_service.create_user(user_data, db)
+async def signup(user_data: UserCreate, db: AsyncSession = Depends(get_async_postgres_db)):
+    user = await auth_service.create_user(user_data, db)
     access_token = create_access_token(data={
         "sub": user.username,
         "role": user.role
@@ -20,8 +20,8 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_postgres_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(user_data: UserLogin, db: Session = Depends(get_postgres_db)):
-    user = auth_service.authenticate_user(user_data.username, user_data.password, db)
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_postgres_db)):
+    user = await auth_service.authenticate_user(user_data.username, user_data.password, db)
     access_token = create_access_token(data={
         "sub": user.username,
         "role": user.role
@@ -1,9 +1,10 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 from app.authentication.models import User
 from app.authentication.schemas import UserCreate
-from app.authentication.security import hash_password, verify_password
+from app.authentication.security import password_hasher
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,10 +12,9 @@ logger = logging.getLogger(__name__)
 
 class AuthService:
     
-    def create_user(self, user_data: UserCreate, db: Session) -> User:
+    async def create_user(self, user_data: UserCreate, db: AsyncSession) -> User:
+        hashed_password = await password_hasher.hash(user_data.password)
         try:
-            hashed_password = hash_password(user_data.password)
-            
             db_user = User(
                 username=user_data.username,
                 hashed_password=hashed_password,
@@ -22,14 +22,14 @@ class AuthService:
             )
             
             db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
+            await db.commit()
+            await db.refresh(db_user)
             
             logger.info(f"Created user: {user_data.username} with role: {user_data.role}")
             return db_user
             
         except IntegrityError as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Integrity error creating user {user_data.username}: {e}")
             if "username" in str(e.orig).lower():
                 raise HTTPException(status_code=400, detail="Username already exists")
@@ -37,20 +37,24 @@ class AuthService:
                 raise HTTPException(status_code=400, detail="User creation failed")
                 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             logger.error(f"Error creating user {user_data.username}: {e}")
             raise HTTPException(status_code=500, detail="Failed to create user")
     
-    def authenticate_user(self, username: str, password: str, db: Session) -> User:
+    async def authenticate_user(self, username: str, password: str, db: AsyncSession) -> User:
         try:
-            user = db.query(User).filter(User.username == username).first()
+            result = await db.execute(select(User).where(User.username == username))
+            user = result.scalars().first()
             
             if not user:
                 raise HTTPException(status_code=401, detail="Invalid credentials")
             
-            if not verify_password(password, user.hashed_password):
+            verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+            if not verified:
                 raise HTTPException(status_code=401, detail="Invalid credentials")
             
+            if new_hash is not None:
+                await self._rehash_password(user, new_hash, db)
             return user
             
         except HTTPException:
@@ -58,3 +62,13 @@ class AuthService:
         except Exception as e:
             logger.error(f"Error authenticating user {username}: {e}")
             raise HTTPException(status_code=500, detail="Authentication failed")
+
+    async def _rehash_password(self, user: User, new_hash: str, db: AsyncSession):
+        """Store a hash with the current cost; login still succeeds if this fails"""
+        try:
+            user.hashed_password = new_hash
+            await db.commit()
+            logger.info(f"Rehashed password for user: {user.username}")
+        except Exception as e:
+            await db.rollback()
+            logger.warning(f"Could not rehash password for user {user.username}: {e}")
@@ -0,0 +1,233 @@
+"""Admission control for the public lead form: rate limits, a concurrency cap and load shedding."""
+from collections import deque
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple
+import asyncio
+import logging
+import math
+import time
+from app.core.config import settings
+from app.core.metrics import ADMISSION_DECISIONS
+from app.utils import ORJSONResponse, TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for the moving average of how long an admitted request holds its slot
+SERVICE_TIME_ALPHA = 0.1
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average and bursts of up to `burst`"""
+
+    def __init__(self, rate: float, burst: int, timer: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.timer = timer
+        self.tokens = float(burst)
+        self.updated = timer()
+
+    def try_acquire(self) -> float:
+        """Take a token; returns 0 on success, otherwise the seconds until one is available"""
+        now = self.timer()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class Rejection:
+    """Why a request was shed and what to tell the client"""
+
+    def __init__(self, outcome: str, status_code: int, message: str, retry_after: float):
+        self.outcome = outcome
+        self.status_code = status_code
+        self.message = message
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class AdmissionController:
+    """Decides, before a request body is read, whether the service can take the request on.
+
+    Requests pass a per-client token bucket, then a global one (429 when either is
+    empty), then wait for one of `max_concurrency` slots. A request that would wait
+    longer than `queue_target` seconds, judged from the queue length and recent
+    service times, or finds `max_queue` requests already waiting, gets 503 at once.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_target: float,
+        global_rate: float,
+        global_burst: int,
+        client_rate: float,
+        client_burst: int,
+        max_clients: int,
+        retry_after: float
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_target = queue_target
+        self.retry_after = retry_after
+        self.global_bucket = TokenBucket(global_rate, global_burst) if global_rate > 0 else None
+        self.client_rate = client_rate
+        self.client_burst = client_burst
+        # An idle bucket refills completely after burst / rate seconds, so expiring it then loses nothing
+        self.client_buckets: Optional[TTLCache[str, TokenBucket]] = (
+            TTLCache(max_clients, client_burst / client_rate) if client_rate > 0 else None
+        )
+        self.in_flight = 0
+        self.service_time: Optional[float] = None
+        self.counts: Dict[str, int] = {outcome: 0 for outcome in (
+            "admitted", "rate_limited_client", "rate_limited_global", "overloaded"
+        )}
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    def _record(self, outcome: str) -> None:
+        self.counts[outcome] += 1
+        ADMISSION_DECISIONS.labels(outcome).inc()
+
+    def _check_rates(self, client: str) -> Optional[Rejection]:
+        if self.client_buckets is not None:
+            bucket = self.client_buckets.get(client)
+            if bucket is None:
+                bucket = TokenBucket(self.client_rate, self.client_burst)
+            wait = bucket.try_acquire()
+            self.client_buckets.set(client, bucket)
+            if wait:
+                return Rejection("rate_limited_client", 429, "Too many submissions, please retry later", wait)
+        if self.global_bucket is not None:
+            wait = self.global_bucket.try_acquire()
+            if wait:
+                return Rejection("rate_limited_global", 429, "Too many submissions, please retry later", wait)
+        return None
+
+    def _expected_wait(self) -> float:
+        # Every max_concurrency requests ahead of us take about one service time to drain
+        if self.service_time is None:
+            return 0.0
+        return (len(self._waiters) + 1) / self.max_concurrency * self.service_time
+
+    def _overloaded(self) -> Rejection:
+        return Rejection("overloaded", 503, "Service is busy, please retry shortly", self.retry_after)
+
+    async def admit(self, client: str) -> Optional[Rejection]:
+        """Admit the request (the caller must then call release()) or return why it was shed"""
+        rejection = self._check_rates(client)
+        if rejection is None and self.in_flight >= self.max_concurrency:
+            if len(self._waiters) >= self.max_queue or self._expected_wait() > self.queue_target:
+                rejection = self._overloaded()
+            elif not await self._wait_for_slot():
+                rejection = self._overloaded()
+        elif rejection is None:
+            self.in_flight += 1
+
+        if rejection is not None:
+            self._record(rejection.outcome)
+            return rejection
+        self._record("admitted")
+        return None
+
+    async def _wait_for_slot(self) -> bool:
+        """Queue for a slot released by release(); gives up after queue_target seconds"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_target)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            # The slot may have been handed over just as the client went away; pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self, held_for: Optional[float] = None) -> None:
+        """Free the slot, handing it straight to the longest-waiting request if there is one"""
+        if held_for is not None:
+            self.service_time = held_for if self.service_time is None else (
+                (1 - SERVICE_TIME_ALPHA) * self.service_time + SERVICE_TIME_ALPHA * held_for
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Admitted and shed counts plus current load"""
+        return {
+            **self.counts,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "max_concurrency": self.max_concurrency,
+            "service_time_ms": round(self.service_time * 1000, 2) if self.service_time is not None else None,
+            "tracked_clients": len(self.client_buckets) if self.client_buckets is not None else 0,
+        }
+
+
+def client_address(scope: Scope, trusted_hops: int) -> str:
+    """The caller's IP, as seen by the outermost of `trusted_hops` proxies that append to X-Forwarded-For"""
+    if trusted_hops > 0:
+        hops = [
+            hop.strip()
+            for name, value in scope.get("headers", ())
+            if name == b"x-forwarded-for"
+            for hop in value.decode("latin-1").split(",")
+        ]
+        # Entries left of the ones our proxies appended come from the client and can be forged
+        if len(hops) >= trusted_hops:
+            return hops[-trusted_hops]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class AdmissionControlMiddleware:
+    """Runs guarded routes through an AdmissionController before their body is read"""
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController, routes: Iterable[Tuple[str, str]]):
+        self.app = app
+        self.controller = controller
+        self.routes = frozenset(routes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or (scope["method"], scope["path"].rstrip("/")) not in self.routes:
+            await self.app(scope, receive, send)
+            return
+
+        rejection = await self.controller.admit(client_address(scope, settings.ADMISSION_TRUSTED_PROXY_HOPS))
+        if rejection is not None:
+            response = ORJSONResponse(
+                status_code=rejection.status_code,
+                content={"error": "Request rejected", "message": rejection.message},
+                headers={"Retry-After": str(rejection.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(time.perf_counter() - started)
+
+
+admission_controller = AdmissionController(
+    max_concurrency=settings.ADMISSION_MAX_CONCURRENCY,
+    max_queue=settings.ADMISSION_MAX_QUEUE,
+    queue_target=settings.ADMISSION_QUEUE_TARGET_MS / 1000,
+    global_rate=settings.ADMISSION_GLOBAL_RATE,
+    global_burst=settings.ADMISSION_GLOBAL_BURST,
+    client_rate=settings.ADMISSION_CLIENT_RATE,
+    client_burst=settings.ADMISSION_CLIENT_BURST,
+    max_clients=settings.ADMISSION_MAX_TRACKED_CLIENTS,
+    retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS
+)
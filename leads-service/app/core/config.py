@@ -1,5 +1,13 @@
 from pydantic_settings import BaseSettings
 from typing import Optional
+from enum import Enum
+
+
+class CountStrategy(str, Enum):
+    EXACT = "exact"        # SELECT count(*) over the table
+    COUNTER = "counter"    # sum of trigger-maintained per-status counts (exact)
+    ESTIMATE = "estimate"  # planner estimate from pg_class.reltuples
+    CACHED = "cached"      # exact count reused for LEADS_COUNT_CACHE_TTL_SECONDS
 
 
 class Settings(BaseSettings):
@@ -16,6 +24,27 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     POSTGRES_PORT: int = 5432
+    POSTGRES_STATEMENT_CACHE_SIZE: int = 100
+    
+    # Connection pools (per engine)
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 30.0
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 1800  # -1 never recycles
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_WARMUP_CONNECTIONS: int = 5  # opened at startup, capped at POSTGRES_POOL_SIZE
+    
+    # SQL profiling
+    SQL_PROFILER_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
+    N_PLUS_ONE_THRESHOLD: int = 10  # the same statement this many times in one request is logged
+    
+    # Read replica (optional; without one every read goes to the primary)
+    POSTGRES_REPLICA_SERVER: Optional[str] = None
+    POSTGRES_REPLICA_PORT: Optional[int] = None  # defaults to POSTGRES_PORT
+    POSTGRES_REPLICA_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    POSTGRES_REPLICA_RETRY_SECONDS: float = 30.0  # reads stay on the primary this long after a replica failure
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # a user's reads go to the primary this long after they write; 0 disables
     
     # MinIO/S3
     MINIO_URL: str
@@ -24,19 +53,105 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str
     MINIO_BUCKET_NAME: str
     MINIO_SECURE: bool = False
+    MINIO_REGION: str = "us-east-1"  # set so presigning never has to look the bucket region up
+    MINIO_PUBLIC_ENDPOINT: Optional[str] = None  # host[:port] readers download from; defaults to MINIO_ENDPOINT
+    
+    # Object storage
+    STORAGE_BACKEND: str = "minio"  # minio | local | memory
+    STORAGE_LOCAL_ROOT: str = "/tmp/alma-storage"
+    S3_MAX_WORKERS: int = 8
+    
+    # Resume uploads
+    RESUME_MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    RESUME_UPLOAD_STREAMING: bool = True
+    RESUME_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    RESUME_UPLOAD_PART_SIZE: int = 5 * 1024 * 1024  # S3 minimum multipart part size
+    LEAD_CREATE_PIPELINED: bool = True  # upload the resume while the email is reserved; false uploads after
+    
+    # Admission control for the public POST /leads (rates are requests/second; 0 disables that limit)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 32  # lead submissions processed at once per worker
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_QUEUE_TARGET_MS: float = 500.0  # longest a submission may wait for a slot before 503
+    ADMISSION_GLOBAL_RATE: float = 50.0
+    ADMISSION_GLOBAL_BURST: int = 100
+    ADMISSION_CLIENT_RATE: float = 0.5
+    ADMISSION_CLIENT_BURST: int = 5
+    ADMISSION_MAX_TRACKED_CLIENTS: int = 100_000
+    ADMISSION_TRUSTED_PROXY_HOPS: int = 0  # proxies in front of the service that append to X-Forwarded-For
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    
+    # Single-lead cache (per worker; 0 disables)
+    LEAD_CACHE_TTL_SECONDS: float = 0.0
+    LEAD_CACHE_SIZE: int = 10_000
+    
+    # Resume download URLs
+    RESUME_URL_EXPIRY_SECONDS: int = 3600
+    RESUME_URL_CACHE_SIZE: int = 10_000
+    RESUME_URL_CACHE_MARGIN_SECONDS: int = 300  # cached URLs are dropped this long before they expire
     
     # Kafka
     KAFKA_BOOTSTRAP_SERVERS: str
     KAFKA_NEW_LEADS_TOPIC: str
+    KAFKA_PRODUCER_MODE: str = "reliable"  # reliable | throughput
+    KAFKA_LINGER_MS: int = 20
+    KAFKA_MAX_BATCH_SIZE: int = 64 * 1024
+    KAFKA_COMPRESSION_TYPE: Optional[str] = "gzip"  # gzip | snappy | lz4 | zstd (needs the codec library) | None
+    KAFKA_FLUSH_TIMEOUT_SECONDS: float = 10.0
+    
+    # Transactional outbox
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_MAX_BACKOFF_SECONDS: float = 300.0
+    OUTBOX_RETENTION_HOURS: int = 24
+    
+    # Lead listings
+    LEADS_COUNT_STRATEGY: CountStrategy = CountStrategy.COUNTER
+    LEADS_COUNT_CACHE_TTL_SECONDS: float = 5.0
+    LEADS_COUNT_COMPACT_INTERVAL_SECONDS: float = 60.0
+    
+    # Bulk import
+    LEADS_IMPORT_MAX_ROWS: int = 10_000
+    LEADS_IMPORT_UPLOAD_CONCURRENCY: int = 8
+    LEADS_IMPORT_PROGRESS_INTERVAL: int = 100  # rows between streamed upload progress lines
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_CACHE_SIZE: int = 10_000
+    JWT_CACHE_MAX_TTL_SECONDS: float = 300.0  # 0 disables the verified-token cache
+    
+    # Password hashing
+    PASSWORD_HASH_ROUNDS: int = 12  # stored hashes with another cost are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    
+    # Startup (dependency checks run concurrently, each bounded by its deadline)
+    STARTUP_POSTGRES_TIMEOUT_SECONDS: float = 10.0  # includes pool warm-up
+    STARTUP_S3_TIMEOUT_SECONDS: float = 5.0
+    STARTUP_KAFKA_TIMEOUT_SECONDS: float = 10.0
+    
+    # Health checks (run in the background; /health/ready serves the cached results)
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 10.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
     
     @property
     def database_url(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    @property
+    def async_database_url(self) -> str:
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+    
+    @property
+    def async_replica_database_url(self) -> Optional[str]:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        port = self.POSTGRES_REPLICA_PORT or self.POSTGRES_PORT
+        return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_REPLICA_SERVER}:{port}/{self.POSTGRES_DB}"
     
     class Config:
         env_file = ".env"
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from app.utils import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from sqlalchemy.exc import SQLAlchemyError
 import logging
@@ -9,15 +9,16 @@ logger = logging.getLogger(__name__)
 
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with consistent response format"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content={"error": "Request failed", "message": exc.detail}
+        content={"error": "Request failed", "message": exc.detail},
+        headers=getattr(exc, "headers", None)
     )
 
 
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         content={"error": "Validation failed", "message": str(exc)}
     )
@@ -26,7 +27,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def database_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handle database errors"""
     logger.error(f"Database error: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"error": "Database error", "message": "Internal server error"}
     )
@@ -35,7 +36,7 @@ async def database_exception_handler(request: Request, exc: SQLAlchemyError):
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions"""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"error": "Internal server error", "message": "Something went wrong"}
     )
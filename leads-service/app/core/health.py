@@ -0,0 +1,145 @@
+"""Background dependency probing behind the liveness and readiness endpoints."""
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+import time
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Check = Callable[[], Awaitable[Any]]
+
+
+class HealthProber:
+    """Checks dependencies on a timer and caches the results, so health endpoints never wait on them.
+
+    A check passes unless it returns False, raises, or exceeds the probe timeout.
+    Only critical checks decide readiness; the others are reported for visibility.
+    A check registered with its own interval (e.g. one that costs the dependency
+    something) runs on that interval instead of every round.
+    """
+
+    def __init__(self, interval: float, timeout: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.started = False
+        self._checks: Dict[str, Check] = {}
+        self._critical: Dict[str, bool] = {}
+        self._intervals: Dict[str, float] = {}
+        self._last_probe: Dict[str, float] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._running: Dict[str, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, name: str, check: Check, critical: bool = True, interval: Optional[float] = None) -> None:
+        self._checks[name] = check
+        self._critical[name] = critical
+        self._intervals[name] = interval or self.interval
+
+    async def start(self):
+        """Start the probe loop; the first round runs immediately"""
+        if self.started:
+            return
+        self._task = asyncio.create_task(self._run())
+        self.started = True
+        logger.info(f"Health prober started ({len(self._checks)} checks every {self.interval}s)")
+
+    async def stop(self):
+        """Stop the probe loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for running in self._running.values():
+            running.cancel()
+        self._running.clear()
+        self.started = False
+
+    async def _run(self):
+        while True:
+            await self.probe_due()
+            await asyncio.sleep(self.interval)
+
+    async def probe_all(self):
+        """Run every check concurrently and cache the outcomes"""
+        await asyncio.gather(*(self._probe(name, check) for name, check in self._checks.items()))
+
+    async def probe_due(self):
+        """Run the checks whose interval has elapsed since they last ran"""
+        now = time.monotonic()
+        await asyncio.gather(*(
+            self._probe(name, check) for name, check in self._checks.items()
+            if now - self._last_probe.get(name, float("-inf")) >= self._intervals[name]
+        ))
+
+    async def _probe(self, name: str, check: Check):
+        running = self._running.get(name)
+        if running is not None and not running.done():
+            # A check stuck in a worker thread can't be cancelled; don't stack another one on top of it
+            self._record(name, False, None, "previous check still running")
+            return
+
+        self._last_probe[name] = time.monotonic()
+        running = self._running[name] = asyncio.ensure_future(check())
+        # Retrieve the outcome even when the wait below gives up on it, so late failures aren't logged as unhandled
+        running.add_done_callback(lambda future: future.cancelled() or future.exception())
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            healthy = await asyncio.wait_for(asyncio.shield(running), self.timeout) is not False
+        except asyncio.TimeoutError:
+            healthy, error = False, f"timed out after {self.timeout}s"
+        except Exception as e:
+            healthy, error = False, str(e) or type(e).__name__
+        self._record(name, healthy, time.perf_counter() - started, error)
+
+    def _record(self, name: str, healthy: bool, seconds: Optional[float], error: Optional[str]):
+        previous = self._results.get(name)
+        if previous is None or previous["healthy"] != healthy:
+            if healthy:
+                logger.info(f"Health check {name} passing")
+            else:
+                logger.warning(f"Health check {name} failing: {error or 'unhealthy'}")
+        self._results[name] = {
+            "healthy": healthy,
+            "critical": self._critical[name],
+            "latency_ms": round(seconds * 1000, 2) if seconds is not None else None,
+            "error": error,
+            "checked_at": time.monotonic(),
+        }
+
+    def _is_fresh(self, name: str, result: Dict[str, Any], now: float) -> bool:
+        # A result older than a few of its rounds means the prober itself has stalled
+        return now - result["checked_at"] <= 3 * self._intervals[name] + self.timeout
+
+    def ready(self) -> bool:
+        """Whether every critical check passed in a recent round"""
+        now = time.monotonic()
+        for name, critical in self._critical.items():
+            result = self._results.get(name)
+            if critical and (result is None or not result["healthy"] or not self._is_fresh(name, result, now)):
+                return False
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached results of every check; never runs a check"""
+        now = time.monotonic()
+        checks: Dict[str, Any] = {}
+        for name, critical in self._critical.items():
+            result = self._results.get(name)
+            if result is None:
+                checks[name] = {"healthy": None, "critical": critical, "latency_ms": None, "error": "not checked yet",
+                                "age_seconds": None, "stale": None}
+                continue
+            checks[name] = {
+                **{key: value for key, value in result.items() if key != "checked_at"},
+                "age_seconds": round(now - result["checked_at"], 3),
+                "stale": not self._is_fresh(name, result, now),
+            }
+        return {"ready": self.ready(), "checks": checks}
+
+
+health_prober = HealthProber(settings.HEALTH_PROBE_INTERVAL_SECONDS, settings.HEALTH_PROBE_TIMEOUT_SECONDS)
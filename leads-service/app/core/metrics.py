@@ -0,0 +1,110 @@
+"""Prometheus metrics for the leads service, exposed on GET /metrics."""
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import time
+from app.utils import LATENCY_BUCKETS
+
+# Resume sizes, 16KB to the 10MB upload limit and beyond
+UPLOAD_BYTES_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 10 * 1024 * 1024, 16 * 1024 * 1024)
+
+# Statement label values; anything else is reported as OTHER to keep cardinality fixed
+SQL_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE", "COPY", "WITH"})
+HTTP_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "leads_http_requests_in_flight", "HTTP requests currently being served"
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "leads_http_request_duration_seconds", "HTTP request latency by route template and status",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+DB_QUERY_DURATION = Histogram(
+    "leads_db_query_duration_seconds", "Time from sending a statement to Postgres until it returns",
+    ["engine", "operation"], buckets=LATENCY_BUCKETS
+)
+S3_UPLOAD_DURATION = Histogram(
+    "leads_s3_upload_duration_seconds", "Resume upload time to object storage",
+    ["outcome"], buckets=LATENCY_BUCKETS
+)
+S3_UPLOAD_BYTES = Histogram(
+    "leads_s3_upload_bytes", "Size of stored resumes", buckets=UPLOAD_BYTES_BUCKETS
+)
+KAFKA_PUBLISH_DURATION = Histogram(
+    "leads_kafka_publish_duration_seconds", "Time from buffering a message until the broker acknowledges it",
+    ["topic"], buckets=LATENCY_BUCKETS
+)
+KAFKA_PUBLISH_FAILURES = Counter(
+    "leads_kafka_publish_failures_total", "Messages Kafka did not acknowledge", ["topic"]
+)
+ADMISSION_DECISIONS = Counter(
+    "leads_admission_decisions_total", "Lead submissions admitted or shed by admission control", ["outcome"]
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording in-flight requests and latency per route template.
+
+    Routes are labelled by their path template (e.g. /api/v1/leads/{lead_id}) so
+    label cardinality stays bounded; requests matching no route are "unmatched".
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                _http_method(scope["method"]), getattr(route, "path", "unmatched"), str(status)
+            ).observe(time.perf_counter() - started)
+
+
+def _http_method(method: str) -> str:
+    # Clients choose the method, so arbitrary ones must not become new series
+    return method if method in HTTP_METHODS else "OTHER"
+
+
+def _sql_operation(statement: str) -> str:
+    words = statement.lstrip()[:7].split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in SQL_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Time every statement run through engine (pass async_engine.sync_engine for async engines)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_metrics_started", None)
+        if started is not None:
+            DB_QUERY_DURATION.labels(name, _sql_operation(statement)).observe(time.perf_counter() - started)
+
+
+def render_metrics() -> bytes:
+    """Current metric values in the Prometheus text format"""
+    return generate_latest(REGISTRY)
+
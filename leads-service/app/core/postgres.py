@@ -1,21 +1,145 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from fastapi import Depends
+from typing import Any, AsyncGenerator, Dict, List, Optional
+import asyncio
 import logging
+import time
 from app.core.config import settings
+from app.core.pool import PoolMetrics, pool_options
+from app.core.metrics import instrument_engine
+from app.core.sql_profiler import sql_profiler
+from app.authentication.jwt import get_current_user
+from app.utils import TTLCache, dumps_str, loads
 
 logger = logging.getLogger(__name__)
 
+# Checkout wait times and occupancy per engine, reported on /diagnostics
+pool_metrics: Dict[str, PoolMetrics] = {
+    "sync": PoolMetrics("sync"),
+    "primary": PoolMetrics("primary"),
+    "replica": PoolMetrics("replica"),
+}
+
 # Create PostgreSQL engine
-postgres_engine = create_engine(settings.database_url)
+postgres_engine = create_engine(
+    settings.database_url,
+    json_serializer=dumps_str,
+    json_deserializer=loads,
+    **pool_options(QueuePool, pool_metrics["sync"])
+)
 
 # Create session factory
 PostgresSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=postgres_engine)
 
+# Create async PostgreSQL engine (asyncpg) used by the request path.
+# asyncpg keeps a per-connection LRU of prepared statements, so repeated
+# CRUD queries skip the parse/plan round trip after first use.
+async_postgres_engine = create_async_engine(
+    settings.async_database_url,
+    json_serializer=dumps_str,
+    json_deserializer=loads,
+    connect_args={"prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE},
+    **pool_options(AsyncAdaptedQueuePool, pool_metrics["primary"])
+)
+
+instrument_engine(postgres_engine, "sync")
+instrument_engine(async_postgres_engine.sync_engine, "primary")
+if settings.SQL_PROFILER_ENABLED:
+    sql_profiler.instrument(postgres_engine)
+    sql_profiler.instrument(async_postgres_engine.sync_engine)
+
+# Create async session factory. Objects stay loaded after commit so responses
+# can be built without triggering lazy loads outside of an awaitable context.
+AsyncPostgresSessionLocal = async_sessionmaker(
+    bind=async_postgres_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Optional read replica for read-only endpoints. Same credentials and database
+# as the primary.
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+if settings.async_replica_database_url:
+    async_replica_engine = create_async_engine(
+        settings.async_replica_database_url,
+        json_serializer=dumps_str,
+        json_deserializer=loads,
+        connect_args={
+            "prepared_statement_cache_size": settings.POSTGRES_STATEMENT_CACHE_SIZE,
+            "timeout": settings.POSTGRES_REPLICA_CONNECT_TIMEOUT_SECONDS
+        },
+        **pool_options(AsyncAdaptedQueuePool, pool_metrics["replica"])
+    )
+    instrument_engine(async_replica_engine.sync_engine, "replica")
+    if settings.SQL_PROFILER_ENABLED:
+        sql_profiler.instrument(async_replica_engine.sync_engine)
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        bind=async_replica_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
 # Create declarative base
 Base = declarative_base()
 
 
+class ReplicaRouter:
+    """Decides whether a read may be served by the replica.
+
+    Reads go to the primary for READ_YOUR_WRITES_SECONDS after the same user
+    wrote, so replication lag never hides their own change, and for
+    POSTGRES_REPLICA_RETRY_SECONDS after the replica could not be reached.
+    """
+
+    def __init__(self, read_your_writes_seconds: float, retry_seconds: float):
+        self.read_your_writes = read_your_writes_seconds > 0
+        self.recent_writers: TTLCache[str, bool] = TTLCache(maxsize=100_000, ttl=read_your_writes_seconds)
+        self.retry_seconds = retry_seconds
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.fallbacks = 0
+        self._replica_down_until = 0.0
+
+    def record_write(self, username: Optional[str]):
+        """Pin the user's reads to the primary for the read-your-writes window"""
+        if self.read_your_writes and username:
+            self.recent_writers.set(username, True)
+
+    def use_replica(self, username: Optional[str]) -> bool:
+        if time.monotonic() < self._replica_down_until:
+            return False
+        if self.read_your_writes and username and self.recent_writers.get(username):
+            return False
+        return True
+
+    def replica_failed(self, error: Exception):
+        self.fallbacks += 1
+        self._replica_down_until = time.monotonic() + self.retry_seconds
+        logger.warning(f"Read replica unavailable, reading from primary for {self.retry_seconds}s: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Read routing counters"""
+        return {
+            "configured": AsyncReplicaSessionLocal is not None,
+            "replica_available": time.monotonic() >= self._replica_down_until,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "fallbacks": self.fallbacks,
+            "pinned_users": len(self.recent_writers)
+        }
+
+
+replica_router = ReplicaRouter(
+    read_your_writes_seconds=settings.READ_YOUR_WRITES_SECONDS,
+    retry_seconds=settings.POSTGRES_REPLICA_RETRY_SECONDS
+)
+
+
 def get_postgres_db() -> Session:
     """Dependency function to get PostgreSQL database session"""
     db = PostgresSessionLocal()
@@ -25,16 +149,95 @@ def get_postgres_db() -> Session:
         db.close()
 
 
+async def get_async_postgres_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency function to get async PostgreSQL database session"""
+    async with AsyncPostgresSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db(
+    current_user: Dict[str, str] = Depends(get_current_user)
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only endpoints: a replica session when one is usable, else the primary"""
+    db = await _open_replica_session(current_user.get("username"))
+    if db is None:
+        replica_router.primary_reads += 1
+        db = AsyncPostgresSessionLocal()
+    async with db:
+        yield db
+
+
+async def _open_replica_session(username: Optional[str]) -> Optional[AsyncSession]:
+    if AsyncReplicaSessionLocal is None or not replica_router.use_replica(username):
+        return None
+    db = AsyncReplicaSessionLocal()
+    try:
+        # Connect up front so an unreachable replica falls back before any query runs
+        await db.connection()
+    except Exception as e:
+        await db.close()
+        replica_router.replica_failed(e)
+        return None
+    replica_router.replica_reads += 1
+    return db
+
+
 def get_postgres_engine():
     """Get the PostgreSQL engine instance"""
     return postgres_engine
 
 
+def pool_stats() -> Dict[str, Any]:
+    """Occupancy and checkout wait histograms of the pools in use"""
+    return {
+        name: metrics.snapshot()
+        for name, metrics in pool_metrics.items()
+        if metrics.pool is not None
+    }
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open up to `connections` pooled connections concurrently so early requests skip the connect.
+
+    Returns how many were opened; failures are logged and leave the pool to connect lazily.
+    """
+    connections = min(connections, settings.POSTGRES_POOL_SIZE)
+    if connections <= 0:
+        return 0
+    results: List[Any] = await asyncio.gather(
+        *(engine.connect() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    for connection in opened:
+        await connection.close()
+    if len(opened) < connections:
+        errors = [result for result in results if isinstance(result, BaseException)]
+        logger.warning(f"Pool warm-up opened {len(opened)}/{connections} connections: {errors[0]}")
+    return len(opened)
+
+
+async def warm_up_pools() -> None:
+    """Warm the request-path pools (primary and, when configured, replica)"""
+    engines = [("primary", async_postgres_engine)]
+    if async_replica_engine is not None:
+        engines.append(("replica", async_replica_engine))
+    for name, engine in engines:
+        started = time.perf_counter()
+        opened = await warm_up_pool(engine, settings.POSTGRES_POOL_WARMUP_CONNECTIONS)
+        logger.info(f"Warmed {name} pool with {opened} connections in {time.perf_counter() - started:.3f}s")
+
+
+async def ping_postgres() -> None:
+    """SELECT 1 through the primary pool; raises when Postgres or a pooled connection is unavailable"""
+    async with async_postgres_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
 async def check_postgres_health() -> bool:
     """Check PostgreSQL database health"""
     try:
-        with postgres_engine.connect() as connection:
-            connection.info
+        async with async_postgres_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
             logger.info("PostgreSQL health check passed")
             return True
     except Exception as e:
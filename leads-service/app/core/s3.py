@@ -1,71 +1,54 @@
 from minio import Minio
-from minio.error import S3Error
+import urllib3
 import logging
+import threading
 from typing import Optional
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Created on first use, so importing the app never touches the network
+_s3_client: Optional[Minio] = None
+_s3_client_lock = threading.Lock()
+
 
 def create_s3_client() -> Minio:
     """Create and return a MinIO/S3 client instance"""
+    # One connection per storage worker thread so concurrent transfers reuse sockets
+    http_client = urllib3.PoolManager(
+        maxsize=settings.S3_MAX_WORKERS,
+        timeout=urllib3.Timeout(connect=5, read=60),
+        retries=urllib3.Retry(total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504])
+    )
     return Minio(
         settings.MINIO_ENDPOINT,
         access_key=settings.MINIO_ACCESS_KEY,
         secret_key=settings.MINIO_SECRET_KEY,
-        secure=settings.MINIO_SECURE
+        secure=settings.MINIO_SECURE,
+        http_client=http_client
     )
 
 
-def ensure_s3_bucket_exists(client: Minio, bucket_name: str) -> None:
-    """Ensure the specified S3 bucket exists, create if it doesn't"""
-    try:
-        if not client.bucket_exists(bucket_name):
-            client.make_bucket(bucket_name)
-            logger.info(f"Created S3 bucket: {bucket_name}")
-        else:
-            logger.info(f"S3 bucket already exists: {bucket_name}")
-    except S3Error as e:
-        logger.error(f"Error with S3 bucket: {e}")
-        raise
-
-
-async def check_s3_health() -> bool:
-    """Check S3/MinIO connectivity and health"""
-    try:
-        client = create_s3_client()
-        
-        # Test connection by listing buckets
-        buckets = client.list_buckets()
-        logger.info(f"S3/MinIO health check passed - Found {len(buckets)} buckets")
-        
-        # Check if default bucket exists
-        bucket_name = getattr(settings, 'MINIO_BUCKET_NAME', None)
-        if bucket_name:
-            bucket_exists = client.bucket_exists(bucket_name)
-            if bucket_exists:
-                logger.info(f"Default bucket '{bucket_name}' exists")
-            else:
-                logger.warning(f"Default bucket '{bucket_name}' does not exist")
-        
-        return True
-    except S3Error as e:
-        logger.error(f"S3/MinIO health check failed: {e}")
-        return False
-    except Exception as e:
-        logger.error(f"S3/MinIO health check error: {e}")
-        return False
-
+def create_signing_client() -> Minio:
+    """Create a MinIO client used only to presign URLs, addressed at the public endpoint.
 
-s3_client = create_s3_client()
-
-if hasattr(settings, 'MINIO_BUCKET_NAME') and settings.MINIO_BUCKET_NAME:
-    try:
-        ensure_s3_bucket_exists(s3_client, settings.MINIO_BUCKET_NAME)
-    except Exception as e:
-        logger.warning(f"Could not ensure default bucket exists: {e}")
+    Presigning is pure computation once the region is known; setting it here means
+    the client never issues a bucket location request.
+    """
+    return Minio(
+        settings.MINIO_PUBLIC_ENDPOINT or settings.MINIO_ENDPOINT,
+        access_key=settings.MINIO_ACCESS_KEY,
+        secret_key=settings.MINIO_SECRET_KEY,
+        secure=settings.MINIO_SECURE,
+        region=settings.MINIO_REGION
+    )
 
 
 def get_s3_client() -> Minio:
-    """Dependency function to get S3/MinIO client instance"""
-    return s3_client
+    """Dependency function to get the shared S3/MinIO client, creating it on first use"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = create_s3_client()
+    return _s3_client
@@ -0,0 +1,167 @@
+"""Per-request SQL profiling: statement counts and timings, slow-query log, N+1 detection."""
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import logging
+import threading
+import time
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryProfile:
+    """Statements issued within one request (or one query_budget block)"""
+
+    def __init__(self):
+        self.statements: Counter = Counter()
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slow: List[Tuple[str, float]] = []
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        key = " ".join(statement.split())
+        with self._lock:
+            self.statements[key] += 1
+            self.count += 1
+            self.total_seconds += seconds
+            if seconds * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+                self.slow.append((key, seconds))
+
+    def repeated(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Statements run at least threshold times, the usual sign of an N+1 loop"""
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class SQLProfiler:
+    """Engine hooks feeding the current request's QueryProfile plus process-wide counters"""
+
+    def __init__(self):
+        self.current: ContextVar[Optional[QueryProfile]] = ContextVar("sql_profile", default=None)
+        self.requests = 0
+        self.statements = 0
+        self.slow_queries = 0
+        self.n_plus_one_requests = 0
+        # Profiles that see every statement regardless of context, for query_budget
+        self._global: Set[QueryProfile] = set()
+
+    def instrument(self, engine: Engine) -> None:
+        """Attach to engine (pass async_engine.sync_engine for async engines)"""
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._profiler_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_profiler_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        self.statements += 1
+
+        profile = self.current.get()
+        if profile is not None:
+            profile.record(statement, elapsed)
+        for observer in tuple(self._global):
+            observer.record(statement, elapsed)
+
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.slow_queries += 1
+            logger.warning(
+                f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())} "
+                f"params={redact_parameters(parameters)}"
+            )
+
+    @contextmanager
+    def profile(self) -> Iterator[QueryProfile]:
+        """Collect the statements issued in this context"""
+        profile = QueryProfile()
+        token = self.current.set(profile)
+        try:
+            yield profile
+        finally:
+            self.current.reset(token)
+
+    def finish_request(self, profile: QueryProfile, method: str, path: str):
+        """Count the request and warn about repeated statements"""
+        self.requests += 1
+        repeated = profile.repeated()
+        if repeated:
+            self.n_plus_one_requests += 1
+            statement, count = repeated[0]
+            logger.warning(f"Possible N+1 in {method} {path}: {count}x {statement[:300]}")
+        logger.debug(
+            f"{method} {path}: {profile.count} statements in {profile.total_seconds * 1000:.1f} ms"
+        )
+
+    @contextmanager
+    def query_budget(self, max_statements: int) -> Iterator[QueryProfile]:
+        """Fail with QueryBudgetExceeded if the block issues more than max_statements statements.
+
+        Sees statements from every thread and task, so it also covers requests made
+        through TestClient, whose app runs on a separate event loop.
+        """
+        profile = QueryProfile()
+        self._global.add(profile)
+        try:
+            yield profile
+        finally:
+            self._global.discard(profile)
+        if profile.count > max_statements:
+            listing = "\n".join(f"  {count}x {statement}" for statement, count in profile.statements.most_common())
+            raise QueryBudgetExceeded(f"{profile.count} statements issued, budget is {max_statements}:\n{listing}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Profiling counters since startup"""
+        return {
+            "enabled": settings.SQL_PROFILER_ENABLED,
+            "requests": self.requests,
+            "statements": self.statements,
+            "slow_queries": self.slow_queries,
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "slow_query_threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        }
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type names so logs never carry lead data"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact_parameters(value) if isinstance(value, (dict, list, tuple)) else type(value).__name__
+                for value in parameters]
+    return type(parameters).__name__
+
+
+class SQLProfilerMiddleware:
+    """Opens a QueryProfile for each HTTP request and reports it when the request ends"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with sql_profiler.profile() as profile:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = scope.get("route")
+                sql_profiler.finish_request(profile, scope["method"], getattr(route, "path", scope["path"]))
+
+
+sql_profiler = SQLProfiler()
@@ -0,0 +1,60 @@
+"""Concurrent, deadline-bounded startup phases with per-phase timings."""
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# A phase is a coroutine factory plus its deadline in seconds (None waits forever)
+Phase = Tuple[Callable[[], Awaitable[Any]], Optional[float]]
+
+
+class StartupReport:
+    """Outcome and duration of each startup phase, reported on /diagnostics"""
+
+    def __init__(self):
+        self.phases: Dict[str, Dict[str, Any]] = {}
+        self.total_seconds: Optional[float] = None
+        self._started = time.perf_counter()
+
+    @property
+    def healthy(self) -> bool:
+        return all(phase["ok"] for phase in self.phases.values())
+
+    async def run_phase(self, name: str, step: Callable[[], Awaitable[Any]], timeout: Optional[float]) -> bool:
+        """Run one phase under its deadline; a False result, an error or a timeout marks it failed"""
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            ok = await asyncio.wait_for(step(), timeout) is not False
+        except asyncio.TimeoutError:
+            ok, error = False, f"timed out after {timeout}s"
+        except Exception as e:
+            ok, error = False, str(e) or type(e).__name__
+        seconds = time.perf_counter() - started
+
+        self.phases[name] = {"ok": ok, "seconds": round(seconds, 3), "error": error}
+        if ok:
+            logger.info(f"Startup phase {name} finished in {seconds:.3f}s")
+        else:
+            logger.error(f"Startup phase {name} failed after {seconds:.3f}s: {error or 'unhealthy'}")
+        return ok
+
+    async def run_concurrently(self, phases: Dict[str, Phase]) -> Dict[str, bool]:
+        """Run independent phases at once, so boot takes as long as the slowest one rather than their sum"""
+        results = await asyncio.gather(
+            *(self.run_phase(name, step, timeout) for name, (step, timeout) in phases.items())
+        )
+        return dict(zip(phases, results))
+
+    def finish(self) -> None:
+        self.total_seconds = time.perf_counter() - self._started
+        logger.info(f"Startup finished in {self.total_seconds:.3f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "healthy": self.healthy,
+            "total_seconds": round(self.total_seconds, 3) if self.total_seconds is not None else None,
+            "phases": dict(self.phases),
+        }
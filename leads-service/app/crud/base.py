@@ -1,7 +1,7 @@
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.postgres import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
@@ -10,53 +10,110 @@ UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
-    def __init__(self, model: Type[ModelType]):
+    def __init__(self, model: Type[ModelType], version_column: Optional[str] = None):
         """
         CRUD object with default methods to Create, Read, Update, Delete (CRUD).
         **Parameters**
         * `model`: A SQLAlchemy model class
-        * `schema`: A Pydantic model (schema) class
+        * `version_column`: Optional integer column bumped on every update, for optimistic concurrency
         """
         self.model = model
+        self.version_column = version_column
+        self._columns = set(model.__table__.columns.keys())
 
-    def get(self, db: Session, id: Any) -> Optional[ModelType]:
-        return db.query(self.model).filter(self.model.id == id).first()
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        result = await db.execute(select(self.model).where(self.model.id == id))
+        return result.scalars().first()
 
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
+    async def get_multi(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
-        return db.query(self.model).offset(skip).limit(limit).all()
-
-    def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)  # type: ignore
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+        result = await db.execute(select(self.model).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def create(self, db: AsyncSession, *, obj_in: CreateSchemaType, commit: bool = True) -> ModelType:
+        """Insert obj_in with a single INSERT ... RETURNING; with commit=False the caller owns the transaction"""
+        values = self._column_values(obj_in.model_dump(exclude_none=True))
+        db_obj = await db.scalar(insert(self.model).values(**values).returning(self.model))
+        if commit:
+            await db.commit()
         return db_obj
 
-    def update(
+    async def update(
         self,
-        db: Session,
+        db: AsyncSession,
         *,
         db_obj: ModelType,
-        obj_in: Union[UpdateSchemaType, Dict[str, Any]]
-    ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        commit: bool = True
+    ) -> Optional[ModelType]:
+        """Update a loaded object; with a version column the update only applies if the row is unchanged"""
+        expected_version = getattr(db_obj, self.version_column) if self.version_column else None
+        return await self.update_by_id(
+            db, id=db_obj.id, obj_in=obj_in, expected_version=expected_version, commit=commit
+        )
+
+    async def update_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        expected_version: Optional[int] = None,
+        commit: bool = True
+    ) -> Optional[ModelType]:
+        """Update a row with a single UPDATE ... WHERE id = :id RETURNING.
+
+        Returns None when no row matched: the id does not exist, or expected_version
+        was given and the row has since been updated by someone else.
+        """
+        return await self._update_returning(
+            db, self.model.id == id, obj_in, expected_version=expected_version, commit=commit
+        )
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> ModelType:
+        obj = await db.get(self.model, id)
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def _update_returning(
+        self,
+        db: AsyncSession,
+        condition: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        expected_version: Optional[int] = None,
+        commit: bool = True
+    ) -> Optional[ModelType]:
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
+            update_data = obj_in.model_dump(exclude_unset=True)
+        values = self._column_values(update_data)
+        version = getattr(self.model, self.version_column) if self.version_column else None
+        if not values:
+            # Nothing to write, but a stale expected_version must still fail like a real update
+            query = select(self.model).where(condition)
+            if version is not None and expected_version is not None:
+                query = query.where(version == expected_version)
+            return await db.scalar(query)
+
+        stmt = update(self.model).where(condition)
+        if version is not None:
+            if expected_version is not None:
+                stmt = stmt.where(version == expected_version)
+            values[self.version_column] = version + 1
+
+        stmt = (
+            stmt.values(**values)
+            .returning(self.model)
+            # Refresh an already loaded instance from the RETURNING row
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        db_obj = await db.scalar(stmt)
+        if commit:
+            await db.commit()
         return db_obj
 
-    def remove(self, db: Session, *, id: int) -> ModelType:
-        obj = db.query(self.model).get(id)
-        db.delete(obj)
-        db.commit()
-        return obj
+    def _column_values(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in data.items() if key in self._columns}
@@ -1,40 +1,222 @@
-from typing import List, Tuple, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from typing import Any, Dict, Iterable, List, Set, Tuple, Optional
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select, update, tuple_, literal, text, any_, bindparam, table, column, String
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
 from app.crud.base import CRUDBase
-from app.models.lead import Lead
-from app.schemas.lead import LeadCreate, LeadResponse
+from app.models.lead import Lead, LeadCount, LeadStatus
+from app.schemas.lead import LeadCreate, LeadResponse, CountStrategy
+from app.core.config import settings
+from app.utils import TTLCache
+
+# Below this many rows an exact count is cheap enough to run instead of trusting
+# reltuples, which is 0 or -1 until the table has been vacuumed/analyzed.
+EXACT_COUNT_BELOW = 10_000
+
+# Columns bulk_insert loads with COPY; created_at comes from the column default
+IMPORT_COLUMNS = ("id", "first_name", "last_name", "email", "resume_path", "status")
+IMPORT_STAGING_TABLE = "lead_import_staging"
+
+# Emails are unique case-insensitively (ix_alma_lead_service_leads_email_lower);
+# lookups compare on the same expression so they can use that index.
+EMAIL_KEY = func.lower(Lead.email)
 
 
 class CRUDLead(CRUDBase[Lead, LeadCreate, LeadResponse]):
-    def get_paginated(
-        self, 
-        db: Session, 
-        page: int = 1, 
+    def __init__(self, model):
+        super().__init__(model, version_column="version")
+        self._count_cache: TTLCache[str, int] = TTLCache(maxsize=1, ttl=settings.LEADS_COUNT_CACHE_TTL_SECONDS)
+
+    async def get_paginated(
+        self,
+        db: AsyncSession,
+        page: int = 1,
         page_size: int = 10
-    ) -> Tuple[List[Lead], int]:
-        """Get paginated leads with total count"""
-        
+    ) -> Tuple[List[Lead], bool]:
+        """Get a page of leads by page number and whether more pages follow"""
+
         # Calculate offset
         offset = (page - 1) * page_size
-        
-        # Get total count
-        total = db.query(func.count(Lead.id)).scalar()
-        
-        # Get paginated results
-        leads = (
-            db.query(Lead)
-            .order_by(Lead.created_at.desc())
+
+        # Get paginated results, plus one row to learn whether another page exists
+        result = await db.execute(
+            select(Lead)
+            .order_by(Lead.created_at.desc(), Lead.id.desc())
             .offset(offset)
-            .limit(page_size)
-            .all()
+            .limit(page_size + 1)
+        )
+        leads = list(result.scalars().all())
+
+        return leads[:page_size], len(leads) > page_size
+
+    async def get_keyset_page(
+        self,
+        db: AsyncSession,
+        page_size: int = 10,
+        after: Optional[Tuple[datetime, UUID]] = None
+    ) -> Tuple[List[Lead], bool]:
+        """Get the page of leads following the (created_at, id) position, newest first.
+
+        Served by ix_alma_lead_service_leads_created_at_id, so the cost depends on
+        page_size only, not on how deep into the listing the position is.
+        Returns the leads and whether more rows follow.
+        """
+        query = select(Lead).order_by(Lead.created_at.desc(), Lead.id.desc())
+        if after is not None:
+            created_at, lead_id = after
+            query = query.where(
+                tuple_(Lead.created_at, Lead.id) < tuple_(
+                    literal(created_at, Lead.created_at.type),
+                    literal(lead_id, Lead.id.type)
+                )
+            )
+
+        # Fetch one extra row to learn whether another page exists
+        result = await db.execute(query.limit(page_size + 1))
+        leads = list(result.scalars().all())
+
+        return leads[:page_size], len(leads) > page_size
+
+    async def count(self, db: AsyncSession, strategy: CountStrategy) -> Tuple[int, bool]:
+        """Count leads using the given strategy; returns (total, total_is_estimate)"""
+        if strategy == CountStrategy.COUNTER:
+            return await self._count_from_counter_table(db), False
+
+        if strategy == CountStrategy.ESTIMATE:
+            estimate = await db.scalar(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'alma_lead_service.leads'::regclass")
+            )
+            if estimate is not None and estimate >= EXACT_COUNT_BELOW:
+                return estimate, True
+            return await self._count_exact(db), False
+
+        if strategy == CountStrategy.CACHED:
+            cached = self._count_cache.get("total")
+            if cached is not None:
+                return cached, True
+            total = await self._count_exact(db)
+            self._count_cache.set("total", total)
+            return total, False
+
+        return await self._count_exact(db), False
+
+    async def _count_exact(self, db: AsyncSession) -> int:
+        return await db.scalar(select(func.count(Lead.id)))
+
+    async def _count_from_counter_table(self, db: AsyncSession) -> int:
+        # Read-only: LeadCountCompactor folds the deltas in the background, so this stays a small scan
+        total = await db.scalar(select(func.coalesce(func.sum(LeadCount.delta), 0)))
+        return int(total)
+
+    @staticmethod
+    async def compact_counts(db: AsyncSession):
+        """Fold lead_counts deltas into one row per status (needs a primary session)"""
+        await db.execute(text("SELECT alma_lead_service.compact_lead_counts()"))
+        await db.commit()
+
+    async def get_by_email(self, db: AsyncSession, email: str) -> Optional[Lead]:
+        """Get lead by email, ignoring case"""
+        result = await db.execute(select(self.model).where(EMAIL_KEY == email.lower()))
+        return result.scalars().first()
+
+    async def update_by_email(
+        self,
+        db: AsyncSession,
+        *,
+        email: str,
+        obj_in: Dict[str, Any],
+        expected_version: Optional[int] = None,
+        commit: bool = True
+    ) -> Optional[Lead]:
+        """Update the lead with this email (ignoring case) in one UPDATE ... RETURNING; None when nothing matched"""
+        return await self._update_returning(
+            db, EMAIL_KEY == email.lower(), obj_in, expected_version=expected_version, commit=commit
+        )
+
+    async def create_if_email_absent(self, db: AsyncSession, *, obj_in: LeadCreate) -> Optional[Lead]:
+        """Insert a lead unless its email is taken, in one INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        Returns None for a duplicate. Nothing is committed: until the caller commits
+        or rolls back, the new row holds the email and a concurrent insert of the same
+        email waits on it, then sees the conflict.
+        """
+        values = self._column_values(obj_in.model_dump(exclude_none=True))
+        return await db.scalar(
+            insert(Lead)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[EMAIL_KEY])
+            .returning(Lead)
+        )
+
+    async def get_existing_emails(self, db: AsyncSession, emails: Iterable[str]) -> Set[str]:
+        """Return which of the given emails already belong to a lead, lowercased, in one query"""
+        emails = [email.lower() for email in emails]
+        if not emails:
+            return set()
+        result = await db.execute(
+            select(EMAIL_KEY).where(EMAIL_KEY == any_(bindparam("emails", emails, type_=ARRAY(String))))
+        )
+        return set(result.scalars().all())
+
+    async def update_status_bulk(
+        self,
+        db: AsyncSession,
+        status: LeadStatus,
+        emails: Optional[List[str]] = None,
+        ids: Optional[List[UUID]] = None
+    ) -> List[Tuple[UUID, str]]:
+        """Set status on every lead matching emails or ids in one UPDATE; returns (id, email) of updated rows"""
+        if emails is not None:
+            emails = [email.lower() for email in emails]
+            condition = EMAIL_KEY == any_(bindparam("emails", emails, type_=ARRAY(String)))
+        else:
+            condition = Lead.id == any_(bindparam("ids", ids, type_=ARRAY(PG_UUID(as_uuid=True))))
+
+        result = await db.execute(
+            update(Lead)
+            .where(condition)
+            .values(status=status, version=Lead.version + 1)
+            .returning(Lead.id, Lead.email)
+            .execution_options(synchronize_session=False)
+        )
+        rows = [(row.id, row.email) for row in result]
+        await db.commit()
+        return rows
+
+    async def bulk_insert(self, db: AsyncSession, rows: List[Dict[str, Any]]) -> List[Lead]:
+        """Insert many leads with COPY; rows whose email already exists are skipped.
+
+        Rows are streamed into a transaction-scoped temp table with COPY and moved
+        into leads with a single INSERT ... SELECT ... ON CONFLICT (lower(email)) DO NOTHING,
+        so concurrent inserts of the same email are skipped rather than failing the
+        batch. Returns the inserted leads; nothing is committed.
+        """
+        if not rows:
+            return []
+
+        await db.execute(text(
+            f"CREATE TEMP TABLE {IMPORT_STAGING_TABLE} "
+            f"(LIKE alma_lead_service.leads INCLUDING DEFAULTS) ON COMMIT DROP"
+        ))
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            IMPORT_STAGING_TABLE,
+            records=[tuple(row[name] for name in IMPORT_COLUMNS) for row in rows],
+            columns=IMPORT_COLUMNS
+        )
+
+        columns = IMPORT_COLUMNS + ("created_at",)
+        staging = table(IMPORT_STAGING_TABLE, *(column(name) for name in columns))
+        stmt = (
+            insert(Lead)
+            .from_select(list(columns), select(*(staging.c[name] for name in columns)))
+            .on_conflict_do_nothing(index_elements=[EMAIL_KEY])
+            .returning(Lead)
         )
-        
-        return leads, total
-    
-    def get_by_email(self, db: Session, email: str) -> Optional[Lead]:
-        """Get lead by email"""
-        return db.query(self.model).filter(self.model.email == email).first()
+        result = await db.scalars(stmt)
+        return list(result.all())
 
 
 lead = CRUDLead(Lead)
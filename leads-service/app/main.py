@@ -1,30 +1,121 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
 from app.api import api_router
+from app.core.admission import AdmissionControlMiddleware, admission_controller
 from app.core.config import settings
-from app.core.postgres import check_postgres_health
-from app.core.s3 import check_s3_health
+from app.core.health import health_prober
+from app.core.postgres import check_postgres_health, ping_postgres, replica_router, warm_up_pools, pool_stats
 from app.core.exceptions import configure_exception_handlers
+from app.core.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, render_metrics
+from app.core.sql_profiler import SQLProfilerMiddleware, sql_profiler
+from app.core.startup import StartupReport
 from app.messaging.kafka_client import kafka_client
+from app.messaging.outbox_relay import outbox_relay
+from app.utils import ORJSONResponse
+from app.authentication.jwt import token_cache
+from app.authentication.security import password_hasher
+from app.services.resume_url_service import resume_url_service
+from app.services.lead_cache import lead_cache
+from app.services.lead_count_compactor import lead_count_compactor
+from app.storage import get_storage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+async def check_storage() -> bool:
+    return await get_storage().health_check()
+
+
+async def check_kafka_producer() -> bool:
+    return kafka_client.started
+
+# Dependencies behind /health/ready. Kafka is reported but doesn't gate readiness:
+# leads are still accepted while it is down, their events wait in the outbox.
+health_prober.register("postgres", ping_postgres)
+health_prober.register("storage", check_storage)
+health_prober.register("kafka", check_kafka_producer, critical=False)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start dependencies concurrently, each under its own deadline, then stop them on shutdown"""
+    logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
+    logger.info(f"Documentation available at: /docs")
+    report = StartupReport()
+    app.state.startup_report = report
+
+    async def start_postgres() -> bool:
+        healthy = await check_postgres_health()
+        if healthy:
+            await warm_up_pools()
+        return healthy
+
+    async def start_storage() -> None:
+        # Creates the storage client and, on first boot, the resume bucket
+        await get_storage().ensure_bucket()
+
+    async def start_kafka() -> bool:
+        await kafka_client.start()
+        return kafka_client.started
+
+    await report.run_concurrently({
+        "postgres": (start_postgres, settings.STARTUP_POSTGRES_TIMEOUT_SECONDS),
+        "storage": (start_storage, settings.STARTUP_S3_TIMEOUT_SECONDS),
+        "kafka": (start_kafka, settings.STARTUP_KAFKA_TIMEOUT_SECONDS),
+    })
+
+    # Relay outbox events to Kafka; events queue up in Postgres while Kafka is down
+    await report.run_phase("outbox_relay", outbox_relay.start, None)
+    # Keep the lead_counts table small so listing totals stay a read-only scan
+    await report.run_phase("lead_count_compactor", lead_count_compactor.start, None)
+    report.finish()
+
+    # Summary
+    if report.healthy:
+        logger.info("All services healthy! Application ready.")
+    else:
+        logger.warning("Some services are not healthy. Check logs above.")
+
+    await health_prober.start()
+
+    yield
+
+    logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    await health_prober.stop()
+    await lead_count_compactor.stop()
+    # Stop the outbox relay before the producer it publishes through
+    await outbox_relay.stop()
+    # Stop Kafka on app shutdown
+    await kafka_client.stop()
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure exception handling
 configure_exception_handlers(app)
 
+# Sheds excess lead submissions before their upload is read, keeping capacity for attorney traffic.
+# Added before CORS so rejections still carry CORS headers and the form can read Retry-After.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        controller=admission_controller,
+        routes=[("POST", f"{settings.API_V1_STR}/leads")]
+    )
+
 # Configure CORS middleware
 allowed_origins = settings.ALLOWED_ORIGINS.split(",")
 
@@ -33,62 +124,79 @@ app.add_middleware(
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag", "Retry-After"],
 )
 
+if settings.SQL_PROFILER_ENABLED:
+    app.add_middleware(SQLProfilerMiddleware)
+
+# Outermost, so latency covers CORS handling and error responses too
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup event handler"""
-    logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
-    logger.info(f"Documentation available at: /docs")
-    
-    # Check PostgreSQL connectivity
-    logger.info("Checking PostgreSQL connection...")
-    postgres_healthy = await check_postgres_health()
-    
-    # Check S3/MinIO connectivity
-    logger.info("Checking S3/MinIO connection...")
-    s3_healthy = await check_s3_health()
-    
-    # Start Kafka on app startup
-    logger.info("Starting Kafka connection...")
-    await kafka_client.start()
-    kafka_healthy = kafka_client.started
-    
-    if kafka_healthy:
-        logger.info("Kafka connection established")
-    else:
-        logger.error("Kafka connection failed")
-    
-    # Summary
-    if postgres_healthy and s3_healthy and kafka_healthy:
-        logger.info("All services healthy! Application ready.")
-    else:
-        logger.warning("Some services are not healthy. Check logs above.")
-    
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event handler"""
-    logger.info(f"Shutting down {settings.PROJECT_NAME}")
-    # Stop Kafka on app shutdown
-    await kafka_client.stop()
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and its event loop is serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe from the background prober's cached results; never waits on a dependency"""
+    health = health_prober.snapshot()
+    return ORJSONResponse(
+        status_code=200 if health["ready"] else 503,
+        content={"status": "ready" if health["ready"] else "not_ready", **health, "version": settings.VERSION}
+    )
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (cached dependency state, always 200; use /health/ready for routing)"""
+    health = health_prober.snapshot()
+    services = {
+        name: "unknown" if check["healthy"] is None else "connected" if check["healthy"] else "disconnected"
+        for name, check in health["checks"].items()
+    }
+    services["outbox_relay"] = "running" if outbox_relay.started else "stopped"
     return {
-        "status": "healthy" if kafka_client.started else "degraded",
-        "services": {
-            "postgres": "connected",
-            "s3": "connected", 
-            "kafka": "connected" if kafka_client.started else "disconnected"
-        },
+        "status": "healthy" if all(check["healthy"] for check in health["checks"].values()) else "degraded",
+        "services": services,
         "version": settings.VERSION
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint"""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/diagnostics")
+async def diagnostics():
+    """Startup timings and runtime counters for the producer, outbox relay and in-process caches"""
+    report = getattr(app.state, "startup_report", None)
+    return {
+        "startup": report.snapshot() if report else None,
+        "kafka_producer": {
+            "mode": settings.KAFKA_PRODUCER_MODE,
+            **kafka_client.metrics.snapshot()
+        },
+        "outbox_relay": {
+            "running": outbox_relay.started,
+            "published": outbox_relay.published,
+            "failed": outbox_relay.failed
+        },
+        "jwt_cache": token_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "resume_url_cache": resume_url_service.cache.stats(),
+        "lead_cache": lead_cache.stats(),
+        "lead_count_compactor": lead_count_compactor.stats(),
+        "read_routing": replica_router.stats(),
+        "postgres_pools": pool_stats(),
+        "sql_profiler": sql_profiler.stats(),
+        "admission": admission_controller.stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,54 +1,206 @@
 from aiokafka import AIOKafkaProducer
-import json
+import asyncio
 import logging
+import time
+from typing import Any, Dict, List, Optional
 from app.core.config import settings
+from app.core.metrics import KAFKA_PUBLISH_DURATION, KAFKA_PUBLISH_FAILURES
+from app.schemas.events import KafkaMessage
+from app.utils import Histogram, dumps
 
 logger = logging.getLogger(__name__)
 
+# Messages per send_batch call and serialized bytes per message
+BATCH_SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000)
+MESSAGE_BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class ProducerMetrics:
+    """Counters and histograms describing what the producer is doing"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.sent = 0
+        self.failed = 0
+        self.send_latency = Histogram()
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.message_bytes = Histogram(MESSAGE_BYTES_BUCKETS)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "sent": self.sent,
+            "failed": self.failed,
+            "send_latency_seconds": self.send_latency.snapshot(),
+            "batch_sizes": self.batch_sizes.snapshot(),
+            "message_bytes": self.message_bytes.snapshot(),
+        }
+
+
+def _serialize_key(key: Optional[str]) -> Optional[bytes]:
+    return key.encode('utf-8') if key is not None else None
+
+
+def _encode_headers(headers: Optional[Dict[str, str]]) -> Optional[List[tuple]]:
+    if not headers:
+        return None
+    return [(name, str(value).encode('utf-8')) for name, value in headers.items()]
+
+
 class KafkaClient:
     def __init__(self):
         self.producer = None
         self.started = False
-    
+        self.metrics = ProducerMetrics()
+        self._pending: set = set()
+
+    def _serialize_value(self, value: Any) -> bytes:
+        data = dumps(value)
+        self.metrics.message_bytes.observe(len(data))
+        return data
+
+    @property
+    def throughput_mode(self) -> bool:
+        return settings.KAFKA_PRODUCER_MODE == "throughput"
+
+    def _producer_config(self) -> Dict[str, Any]:
+        config: Dict[str, Any] = {
+            "bootstrap_servers": settings.KAFKA_BOOTSTRAP_SERVERS,
+            "value_serializer": self._serialize_value,
+            "key_serializer": _serialize_key,
+        }
+        if self.throughput_mode:
+            # Let the accumulator hold messages briefly so they leave in fewer, larger, compressed batches
+            config.update(
+                linger_ms=settings.KAFKA_LINGER_MS,
+                max_batch_size=settings.KAFKA_MAX_BATCH_SIZE,
+                compression_type=settings.KAFKA_COMPRESSION_TYPE,
+            )
+        return config
+
     async def start(self):
         """Start Kafka producer"""
         if self.started:
             return
-            
+
         try:
-            self.producer = AIOKafkaProducer(
-                bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
-                value_serializer=lambda x: json.dumps(x).encode('utf-8')
-            )
+            self.producer = AIOKafkaProducer(**self._producer_config())
             await self.producer.start()
             self.started = True
-            logger.info("Kafka producer started")
+            logger.info(f"Kafka producer started ({settings.KAFKA_PRODUCER_MODE} mode)")
+        except asyncio.CancelledError:
+            # Startup deadline hit while connecting; close the half-started producer so a later start() begins clean
+            await self._discard_producer()
+            raise
         except Exception as e:
             logger.error(f"Failed to start Kafka producer: {e}")
             self.started = False
-    
+
+    async def _discard_producer(self):
+        producer, self.producer = self.producer, None
+        if producer is not None:
+            try:
+                await producer.stop()
+            except Exception as e:
+                logger.warning(f"Error closing Kafka producer: {e}")
+
     async def stop(self):
         """Stop Kafka producer"""
         if self.producer and self.started:
+            # Give fire-and-forget sends a chance to be delivered before closing
+            if self._pending:
+                await asyncio.wait(list(self._pending), timeout=settings.KAFKA_FLUSH_TIMEOUT_SECONDS)
             await self.producer.stop()
             self.started = False
             logger.info("Kafka producer stopped")
-    
-    async def send_message(self, topic: str, message: dict):
-        """Send message to Kafka topic"""
+
+    async def _ensure_started(self) -> bool:
         if not self.started:
             await self.start()
-        
         if not self.started:
             logger.error("Kafka producer not available")
             return False
-        
+        return True
+
+    async def _enqueue(self, topic: str, message: dict, key: Optional[str], headers: Optional[Dict[str, str]]) -> asyncio.Future:
+        """Hand a message to the producer's accumulator and track its delivery future"""
+        started = time.perf_counter()
+        delivery = await self.producer.send(topic, value=message, key=key, headers=_encode_headers(headers))
+        self.metrics.in_flight += 1
+        self._pending.add(delivery)
+
+        def _on_delivery(future: asyncio.Future):
+            self._pending.discard(future)
+            self.metrics.in_flight -= 1
+            elapsed = time.perf_counter() - started
+            self.metrics.send_latency.observe(elapsed)
+            if future.cancelled() or future.exception() is not None:
+                self.metrics.failed += 1
+                KAFKA_PUBLISH_FAILURES.labels(topic).inc()
+                error = "cancelled" if future.cancelled() else future.exception()
+                logger.error(f"Failed to deliver message to {topic}: {error}")
+            else:
+                self.metrics.sent += 1
+                KAFKA_PUBLISH_DURATION.labels(topic).observe(elapsed)
+
+        delivery.add_done_callback(_on_delivery)
+        return delivery
+
+    async def send_message(
+        self,
+        topic: str,
+        message: dict,
+        key: Optional[str] = None,
+        headers: Optional[Dict[str, str]] = None,
+        wait: Optional[bool] = None
+    ):
+        """Send message to Kafka topic.
+
+        wait=None waits for the broker ack in reliable mode and returns as soon as
+        the message is buffered in throughput mode (delivery is tracked in metrics).
+        """
+        if not await self._ensure_started():
+            return False
+
+        if wait is None:
+            wait = not self.throughput_mode
+
         try:
-            await self.producer.send_and_wait(topic, value=message)
-            logger.info(f"Message sent to {topic}")
+            delivery = await self._enqueue(topic, message, key, headers)
+            if wait:
+                await delivery
+            logger.debug(f"Message sent to {topic}")
             return True
         except Exception as e:
             logger.error(f"Failed to send message: {e}")
             return False
 
-kafka_client = KafkaClient()
\ No newline at end of file
+    async def send_batch(self, messages: List[KafkaMessage]) -> List[bool]:
+        """Buffer all messages at once, then wait for every delivery; returns per-message success"""
+        if not messages:
+            return []
+        if not await self._ensure_started():
+            return [False] * len(messages)
+
+        self.metrics.batch_sizes.observe(len(messages))
+        deliveries = []
+        for message in messages:
+            try:
+                deliveries.append(await self._enqueue(message.topic, message.value, message.key, message.headers))
+            except Exception as e:
+                logger.error(f"Failed to enqueue message for {message.topic}: {e}")
+                deliveries.append(None)
+
+        results = []
+        for delivery in deliveries:
+            if delivery is None:
+                results.append(False)
+                continue
+            try:
+                await delivery
+                results.append(True)
+            except Exception:
+                results.append(False)
+        return results
+
+kafka_client = KafkaClient()
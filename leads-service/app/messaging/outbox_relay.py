@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import select, update, delete, func
+from app.core.config import settings
+from app.core.postgres import AsyncPostgresSessionLocal
+from app.messaging.kafka_client import kafka_client
+from app.models.outbox import OutboxEvent
+from app.schemas.events import KafkaMessage
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Background task that drains the outbox table to Kafka in batches.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so several service instances can
+    relay concurrently without publishing the same event twice. Failed sends are
+    retried with exponential backoff; events stay in the table until Kafka accepts them.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.published = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._last_cleanup = datetime.min.replace(tzinfo=timezone.utc)
+
+    async def start(self):
+        """Start the relay loop"""
+        if self.started or not settings.OUTBOX_RELAY_ENABLED:
+            return
+        self._task = asyncio.create_task(self._run())
+        self.started = True
+        logger.info("Outbox relay started")
+
+    async def stop(self):
+        """Stop the relay loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.started = False
+        logger.info("Outbox relay stopped")
+
+    def notify(self):
+        """Wake the relay so freshly committed events go out without waiting for the next poll"""
+        self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                drained = await self.drain()
+                await self._cleanup_published()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Outbox relay error: {e}")
+                drained = 0
+
+            # A full batch means more rows are probably waiting; keep going
+            if drained >= settings.OUTBOX_BATCH_SIZE:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.OUTBOX_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain(self) -> int:
+        """Relay one batch of due events; returns the number of rows claimed"""
+        async with AsyncPostgresSessionLocal() as db:
+            result = await db.execute(
+                select(OutboxEvent)
+                .where(OutboxEvent.published_at.is_(None), OutboxEvent.next_attempt_at <= func.now())
+                .order_by(OutboxEvent.next_attempt_at, OutboxEvent.created_at)
+                .limit(settings.OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            events = list(result.scalars().all())
+            if not events:
+                return 0
+
+            published_ids, failures = await self.publish_batch(events)
+
+            if published_ids:
+                await db.execute(
+                    update(OutboxEvent)
+                    .where(OutboxEvent.id.in_(published_ids))
+                    .values(published_at=func.now(), attempts=OutboxEvent.attempts + 1, last_error=None)
+                )
+            for event in events:
+                if event.id in failures:
+                    event.attempts += 1
+                    event.last_error = failures[event.id][:1000]
+                    event.next_attempt_at = datetime.now(timezone.utc) + self.backoff(event.attempts)
+            await db.commit()
+
+        self.published += len(published_ids)
+        self.failed += len(failures)
+        if failures:
+            logger.warning(f"Outbox relay: {len(failures)} of {len(events)} events failed, will retry")
+        return len(events)
+
+    async def publish_batch(self, events: List[OutboxEvent]) -> Tuple[List[UUID], Dict[UUID, str]]:
+        """Send events to Kafka as one batch; returns (published ids, {failed id: error})"""
+        messages = [
+            KafkaMessage(topic=event.topic, key=event.key, value=event.payload, headers=event.headers)
+            for event in events
+        ]
+        try:
+            results = await kafka_client.send_batch(messages)
+        except Exception as e:
+            results = [e] * len(events)
+
+        published_ids: List[UUID] = []
+        failures: Dict[UUID, str] = {}
+        for event, result in zip(events, results):
+            if result is True:
+                published_ids.append(event.id)
+            elif isinstance(result, BaseException):
+                failures[event.id] = str(result)
+            else:
+                failures[event.id] = "Kafka did not acknowledge the message"
+        return published_ids, failures
+
+    @staticmethod
+    def backoff(attempts: int) -> timedelta:
+        """Delay before the next attempt: 1s, 2s, 4s, ... capped at OUTBOX_MAX_BACKOFF_SECONDS"""
+        return timedelta(seconds=min(2 ** max(attempts - 1, 0), settings.OUTBOX_MAX_BACKOFF_SECONDS))
+
+    async def _cleanup_published(self):
+        """Delete published events past the retention window, at most once a minute"""
+        now = datetime.now(timezone.utc)
+        if now - self._last_cleanup < timedelta(minutes=1):
+            return
+        self._last_cleanup = now
+        async with AsyncPostgresSessionLocal() as db:
+            await db.execute(
+                delete(OutboxEvent).where(
+                    OutboxEvent.published_at < now - timedelta(hours=settings.OUTBOX_RETENTION_HOURS)
+                )
+            )
+            await db.commit()
+
+
+outbox_relay = OutboxRelay()
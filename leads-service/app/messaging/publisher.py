@@ -2,6 +2,8 @@ from app.messaging.kafka_client import kafka_client
 from app.core.config import settings
 from app.schemas.events import LeadCreatedEvent, KafkaMessage
 from app.schemas.lead import LeadResponse
+from app.models.outbox import OutboxEvent
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 from typing import Optional
 
@@ -14,13 +16,15 @@ class EventPublisher:
     async def publish_lead_created(lead_response: LeadResponse, metadata: Optional[dict] = None) -> bool:
         """Publish lead created event with proper DTOs"""
         try:
-            event = LeadCreatedEvent.from_lead_response(lead_response)
+            event = LeadCreatedEvent.from_lead_response(lead_response, metadata=metadata)
             
             kafka_message = event.to_kafka_message(topic=settings.KAFKA_NEW_LEADS_TOPIC)
             
             success = await kafka_client.send_message(
                 kafka_message.topic,
-                kafka_message.value
+                kafka_message.value,
+                key=kafka_message.key,
+                headers=kafka_message.headers
             )
             
             if success:
@@ -33,5 +37,20 @@ class EventPublisher:
         except Exception as e:
             logger.error(f"Error publishing lead created event: {e}")
             return False
+
+    @staticmethod
+    def enqueue_lead_created(db: AsyncSession, lead_response: LeadResponse, metadata: Optional[dict] = None) -> OutboxEvent:
+        """Stage lead created event in the outbox; it is committed with the caller's transaction"""
+        event = LeadCreatedEvent.from_lead_response(lead_response, metadata=metadata)
+        kafka_message = event.to_kafka_message(topic=settings.KAFKA_NEW_LEADS_TOPIC)
+
+        outbox_event = OutboxEvent(
+            topic=kafka_message.topic,
+            key=kafka_message.key,
+            payload=kafka_message.value,
+            headers=kafka_message.headers
+        )
+        db.add(outbox_event)
+        return outbox_event
         
 event_publisher = EventPublisher()
\ No newline at end of file
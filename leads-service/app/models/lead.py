@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, String, DateTime, BigInteger, Integer, Enum as SQLEnum
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import uuid
@@ -23,3 +23,20 @@ class Lead(Base):
     status = Column(SQLEnum(LeadStatus), nullable=False, default=LeadStatus.PENDING)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # bumped on every update
+
+
+
+class LeadCount(Base):
+    """Append-only per-status row count deltas, written by triggers on leads.
+
+    Summing delta per status gives the exact row count. Triggers only ever
+    insert here, so concurrent lead writes never contend on a counter row;
+    compact_lead_counts() periodically folds the deltas into one row per status.
+    """
+    __tablename__ = "lead_counts"
+    __table_args__ = {'schema': 'alma_lead_service'}
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    status = Column(SQLEnum(LeadStatus), nullable=False)
+    delta = Column(BigInteger, nullable=False)
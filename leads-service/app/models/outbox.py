@@ -0,0 +1,29 @@
+from sqlalchemy import Column, String, DateTime, Integer, Text, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+from app.core.postgres import Base
+
+
+class OutboxEvent(Base):
+    """Event waiting to be relayed to Kafka, written in the same transaction as the change it describes"""
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index(
+            "ix_alma_lead_service_outbox_events_pending",
+            "next_attempt_at",
+            postgresql_where=text("published_at IS NULL")
+        ),
+        {'schema': 'alma_lead_service'},
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    topic = Column(String(255), nullable=False)
+    key = Column(String(255), nullable=True)
+    payload = Column(JSONB, nullable=False)
+    headers = Column(JSONB, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text, nullable=True)
@@ -5,7 +5,6 @@ from pydantic import BaseModel, Field
 from uuid import UUID, uuid4
 
 from app.schemas.lead import LeadResponse
-from app.utils import make_json_safe
 
 
 class KafkaMessage(BaseModel):
@@ -42,14 +41,14 @@ class LeadCreatedEvent(BaseModel):
         )
 
     def to_kafka_message(self, topic: str = "lead-events") -> KafkaMessage:
-        """Convert to Kafka message format with JSON-safe values."""
-        # Convert all data to JSON-safe format
-        json_safe_value = make_json_safe(self.model_dump())
-        
+        """Convert to Kafka message format.
+
+        UUID and datetime values are left as-is; the JSON serializer encodes them natively.
+        """
         return KafkaMessage(
             topic=topic,
             key=str(self.lead_id),
-            value=json_safe_value,
+            value=self.model_dump(),
             headers={
                 "event_type": self.event_type,
                 "event_id": self.event_id,
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
+from enum import Enum
+from app.core.config import CountStrategy
 from app.models.lead import LeadStatus
 
 
@@ -17,6 +19,26 @@ class LeadCreate(BaseModel):
 class LeadStatusUpdateRequest(BaseModel):
     email: EmailStr = Field(..., description="Email of the lead to update")
     status: LeadStatus = Field(..., description="New status for the lead")
+    version: Optional[int] = Field(None, description="Expected lead version; the update fails with 409 if the lead has changed")
+
+
+class LeadBulkStatusUpdateRequest(BaseModel):
+    emails: Optional[List[EmailStr]] = Field(None, max_length=1000, description="Emails of the leads to update")
+    ids: Optional[List[UUID]] = Field(None, max_length=1000, description="IDs of the leads to update")
+    status: LeadStatus = Field(..., description="New status for the leads")
+
+    @model_validator(mode="after")
+    def exactly_one_key_list(self) -> "LeadBulkStatusUpdateRequest":
+        if bool(self.emails) == bool(self.ids):
+            raise ValueError("Provide a non-empty list of either emails or ids")
+        return self
+
+
+class LeadBulkStatusUpdateResponse(BaseModel):
+    status: LeadStatus
+    updated: int
+    matched: List[str]
+    unmatched: List[str]
 
 
 class LeadResponse(BaseModel):
@@ -29,14 +51,41 @@ class LeadResponse(BaseModel):
     status: LeadStatus
     created_at: datetime
     updated_at: Optional[datetime] = None
+    version: Optional[int] = None
 
     class Config:
         from_attributes = True
 
 
+class LeadImportRowStatus(str, Enum):
+    CREATED = "created"
+    DUPLICATE = "duplicate"  # email already stored, or repeated earlier in the file
+    INVALID = "invalid"      # row failed validation or its resume is missing from the archive
+    FAILED = "failed"        # resume upload or insert failed
+
+
+class LeadImportRowResult(BaseModel):
+    row: int
+    email: Optional[str] = None
+    status: LeadImportRowStatus
+    lead_id: Optional[UUID] = None
+    message: Optional[str] = None
+
+
+class LeadImportReport(BaseModel):
+    total_rows: int
+    created: int
+    duplicates: int
+    invalid: int
+    failed: int
+    rows: List[LeadImportRowResult]
+
+
 class LeadListResponse(BaseModel):
     leads: List[LeadResponse]
     total: int
-    page: int
+    total_is_estimate: bool = False
+    page: Optional[int] = None  # None when the page was requested by cursor
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None
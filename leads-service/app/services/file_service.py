@@ -1,51 +1,142 @@
 from fastapi import UploadFile, HTTPException
-from minio.error import S3Error
+from typing import BinaryIO, Optional
 import os
 import io
 import logging
-from app.core.s3 import get_s3_client
+import time
+from app.storage import get_storage, StorageError
 from app.core.config import settings
+from app.core.metrics import S3_UPLOAD_DURATION, S3_UPLOAD_BYTES
 
 logger = logging.getLogger(__name__)
 
 
+def file_too_large(max_size: int) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"File too large (max {max_size // (1024 * 1024)}MB)")
+
+
+class SizeLimitedReader:
+    """File-like wrapper that hands out an upload in bounded chunks and aborts past max_size"""
+
+    def __init__(self, source: BinaryIO, max_size: int, chunk_size: int):
+        self.source = source
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0 or size > self.chunk_size:
+            size = self.chunk_size
+
+        chunk = self.source.read(size)
+        self.bytes_read += len(chunk)
+        if self.bytes_read > self.max_size:
+            raise file_too_large(self.max_size)
+        return chunk
+
+
 class FileUploadService:
     def __init__(self):
-        self.s3_client = get_s3_client()
-        self.bucket_name = settings.MINIO_BUCKET_NAME
-        self.max_file_size = 10 * 1024 * 1024  # 10MB
+        self.storage = get_storage()
+        self.max_file_size = settings.RESUME_MAX_FILE_SIZE
+        self.streaming = settings.RESUME_UPLOAD_STREAMING
+        self.chunk_size = settings.RESUME_UPLOAD_CHUNK_SIZE
+        self.part_size = settings.RESUME_UPLOAD_PART_SIZE
+
+    @staticmethod
+    def resume_path(email: str, filename: str, lead_id: Optional[object] = None) -> str:
+        """Object name a lead's resume is stored under, unique per lead when lead_id is given"""
+        if lead_id is not None:
+            return f"{email}/resume/{lead_id}/{filename}"
+        return f"{email}/resume/{filename}"
+
+    async def upload_resume_bytes(
+        self, data: bytes, filename: str, email: str, content_type: str, lead_id: Optional[object] = None
+    ) -> str:
+        """Upload an in-memory resume (e.g. from an import archive) and return the file path"""
+        if len(data) > self.max_file_size:
+            raise file_too_large(self.max_file_size)
+
+        resume_path = self.resume_path(email, filename, lead_id)
+        started = time.perf_counter()
+        try:
+            await self.storage.put_object(resume_path, io.BytesIO(data), length=len(data), content_type=content_type)
+        except StorageError as e:
+            S3_UPLOAD_DURATION.labels("error").observe(time.perf_counter() - started)
+            logger.error(f"Storage error for {email}: {e}")
+            raise HTTPException(status_code=500, detail="Failed to upload file")
+        self._record_upload(started, len(data))
+        return resume_path
+
+    async def upload_resume(self, file: UploadFile, email: str, resume_path: Optional[str] = None) -> str:
+        """Upload resume to object storage and return the file path"""
 
-    async def upload_resume(self, file: UploadFile, email: str) -> str:
-        """Upload resume to S3 and return the file path"""
-        
+        started = time.perf_counter()
         try:
             if not file.filename:
                 raise HTTPException(status_code=400, detail="No file provided")
-            
-            resume_path = f"{email}/resume/{file.filename}"
-            
-            file_content = await file.read()
-            if len(file_content) > self.max_file_size:
-                raise HTTPException(status_code=400, detail="File too large (max 10MB)")
-            
-            file_data = io.BytesIO(file_content)
-            self.s3_client.put_object(
-                bucket_name=self.bucket_name,
-                object_name=resume_path,
-                data=file_data,
-                length=len(file_content),
-                content_type=file.content_type or "application/octet-stream"
-            )
-            
+
+            resume_path = resume_path or self.resume_path(email, file.filename)
+            content_type = file.content_type or "application/octet-stream"
+
+            if self.streaming:
+                size = await self._upload_streaming(file, resume_path, content_type)
+            else:
+                size = await self._upload_buffered(file, resume_path, content_type)
+
+            self._record_upload(started, size)
             return resume_path
-            
+
         except HTTPException:
+            S3_UPLOAD_DURATION.labels("rejected").observe(time.perf_counter() - started)
             raise
-        except S3Error as e:
-            logger.error(f"S3 error for {email}: {e}")
+        except StorageError as e:
+            S3_UPLOAD_DURATION.labels("error").observe(time.perf_counter() - started)
+            logger.error(f"Storage error for {email}: {e}")
             raise HTTPException(status_code=500, detail="Failed to upload file")
         except Exception as e:
+            S3_UPLOAD_DURATION.labels("error").observe(time.perf_counter() - started)
             logger.error(f"Upload error for {email}: {e}")
             raise HTTPException(status_code=500, detail="File upload failed")
         finally:
-            await file.seek(0)
\ No newline at end of file
+            await file.seek(0)
+
+    @staticmethod
+    def _record_upload(started: float, size: int) -> None:
+        S3_UPLOAD_DURATION.labels("success").observe(time.perf_counter() - started)
+        S3_UPLOAD_BYTES.observe(size)
+
+    async def _upload_streaming(self, file: UploadFile, resume_path: str, content_type: str) -> int:
+        """Pipe the upload into storage part by part, never holding more than one part in memory; returns bytes sent"""
+        # The multipart parser already knows the size, so reject before reading a byte
+        if file.size is not None and file.size > self.max_file_size:
+            raise file_too_large(self.max_file_size)
+
+        await file.seek(0)
+        reader = SizeLimitedReader(file.file, self.max_file_size, self.chunk_size)
+        # length=-1 makes MinIO read part_size chunks and switch to a multipart
+        # upload once more than one part is needed; an exception raised by the
+        # reader aborts the multipart upload server side.
+        await self.storage.put_object(
+            resume_path,
+            reader,
+            length=-1,
+            content_type=content_type,
+            part_size=self.part_size
+        )
+        return reader.bytes_read
+
+    async def _upload_buffered(self, file: UploadFile, resume_path: str, content_type: str) -> int:
+        """Read the whole upload into memory and send it in a single request; returns bytes sent"""
+        file_content = await file.read()
+        if len(file_content) > self.max_file_size:
+            raise file_too_large(self.max_file_size)
+
+        file_data = io.BytesIO(file_content)
+        await self.storage.put_object(
+            resume_path,
+            file_data,
+            length=len(file_content),
+            content_type=content_type
+        )
+        return len(file_content)
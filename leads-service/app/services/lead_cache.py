@@ -0,0 +1,65 @@
+from typing import Any, Dict, Iterable, Optional, Union
+from uuid import UUID
+import logging
+from app.schemas.lead import LeadResponse
+from app.core.config import settings
+from app.utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class LeadCache:
+    """Per-worker cache of single-lead responses for GET /leads/{id}.
+
+    Disabled when LEAD_CACHE_TTL_SECONDS is 0. Writes made through LeadService
+    invalidate their leads in this worker only, so another worker can serve a
+    lead up to LEAD_CACHE_TTL_SECONDS old; keep the TTL short.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.enabled = ttl > 0
+        self.cache: TTLCache[str, LeadResponse] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.not_modified = 0
+        self.full_responses = 0
+
+    @staticmethod
+    def key(lead_id: Union[str, UUID]) -> str:
+        try:
+            return str(UUID(str(lead_id)))
+        except ValueError:
+            return str(lead_id)
+
+    def get(self, lead_id: Union[str, UUID]) -> Optional[LeadResponse]:
+        if not self.enabled:
+            return None
+        return self.cache.get(self.key(lead_id))
+
+    def set(self, lead: LeadResponse):
+        if self.enabled:
+            self.cache.set(self.key(lead.id), lead)
+
+    def invalidate(self, lead_ids: Iterable[Union[str, UUID]]):
+        """Drop leads that were just written"""
+        for lead_id in lead_ids:
+            self.cache.pop(self.key(lead_id))
+
+    def record_response(self, not_modified: bool):
+        """Count how GET /leads/{id} was answered"""
+        if not_modified:
+            self.not_modified += 1
+        else:
+            self.full_responses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache hit/miss counters plus conditional GET outcomes"""
+        answered = self.not_modified + self.full_responses
+        return {
+            "enabled": self.enabled,
+            **self.cache.stats(),
+            "not_modified": self.not_modified,
+            "full_responses": self.full_responses,
+            "not_modified_ratio": round(self.not_modified / answered, 4) if answered else 0.0
+        }
+
+
+lead_cache = LeadCache(maxsize=settings.LEAD_CACHE_SIZE, ttl=settings.LEAD_CACHE_TTL_SECONDS)
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.core.postgres import AsyncPostgresSessionLocal
+from app.crud.lead import lead as lead_crud
+
+logger = logging.getLogger(__name__)
+
+
+class LeadCountCompactor:
+    """Background task that folds lead_counts deltas into one row per status.
+
+    Runs on the primary every LEADS_COUNT_COMPACT_INTERVAL_SECONDS, so counting
+    leads stays a read of a handful of rows and never writes in the request path.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.compactions = 0
+        self.failed = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the compaction loop"""
+        if self.started:
+            return
+        self._task = asyncio.create_task(self._run())
+        self.started = True
+        logger.info(f"Lead count compactor started (every {settings.LEADS_COUNT_COMPACT_INTERVAL_SECONDS}s)")
+
+    async def stop(self):
+        """Stop the compaction loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.started = False
+        logger.info("Lead count compactor stopped")
+
+    async def _run(self):
+        while True:
+            await self.compact()
+            await asyncio.sleep(settings.LEADS_COUNT_COMPACT_INTERVAL_SECONDS)
+
+    async def compact(self):
+        """Fold the accumulated deltas once; failures are logged and retried next round"""
+        try:
+            async with AsyncPostgresSessionLocal() as db:
+                await lead_crud.compact_counts(db)
+            self.compactions += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Lead count compaction failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": self.started, "compactions": self.compactions, "failed": self.failed}
+
+
+lead_count_compactor = LeadCountCompactor()
@@ -0,0 +1,321 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import UploadFile, HTTPException
+from pydantic import ValidationError
+from typing import Any, AsyncIterator, BinaryIO, Dict, List, Optional
+import asyncio
+import csv
+import io
+import logging
+import mimetypes
+import posixpath
+import uuid
+import zipfile
+from app.models.lead import LeadStatus
+from app.schemas.lead import (
+    LeadCreate,
+    LeadResponse,
+    LeadImportReport,
+    LeadImportRowResult,
+    LeadImportRowStatus,
+)
+from app.services.file_service import FileUploadService
+from app.crud.lead import lead as lead_crud
+from app.messaging.publisher import event_publisher
+from app.messaging.outbox_relay import outbox_relay
+from app.core.postgres import AsyncPostgresSessionLocal
+from app.core.config import settings
+from app.utils import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class ImportRow:
+    """One data row of an import file and what happened to it"""
+
+    def __init__(self, number: int, fields: Dict[str, Any]):
+        self.number = number
+        self.fields = fields
+        self.lead: Optional[LeadCreate] = None
+        self.resume_name: Optional[str] = None
+        self.result: Optional[LeadImportRowResult] = None
+
+    @property
+    def email(self) -> Optional[str]:
+        if self.lead is not None:
+            return self.lead.email
+        email = self.fields.get("email")
+        return str(email).strip() if email else None
+
+    def finish(self, status: LeadImportRowStatus, message: Optional[str] = None, lead_id: Optional[uuid.UUID] = None):
+        self.result = LeadImportRowResult(
+            row=self.number, email=self.email, status=status, lead_id=lead_id, message=message
+        )
+
+
+class LeadImportJob:
+    """Parsed rows plus the resume archive, owned independently of the request's upload files"""
+
+    def __init__(self, rows: List[ImportRow], archive_file: Optional[BinaryIO] = None):
+        self.rows = rows
+        self.archive_file = archive_file
+        self.archive = zipfile.ZipFile(archive_file) if archive_file is not None else None
+        self.members: Dict[str, zipfile.ZipInfo] = {}
+        if self.archive is not None:
+            for info in self.archive.infolist():
+                if not info.is_dir():
+                    # Rows may name a resume by its path in the archive or by file name alone
+                    self.members.setdefault(info.filename, info)
+                    self.members.setdefault(posixpath.basename(info.filename), info)
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+            self.archive_file.close()
+
+
+class LeadImportService:
+    def __init__(self):
+        self.file_service = FileUploadService()
+
+    async def prepare(self, file: UploadFile, resumes: Optional[UploadFile] = None) -> LeadImportJob:
+        """Parse the import file and open the resume archive"""
+        content = await file.read()
+        rows = self.parse_rows(content, file.filename or "", file.content_type or "")
+        if len(rows) > settings.LEADS_IMPORT_MAX_ROWS:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Import has {len(rows)} rows (max {settings.LEADS_IMPORT_MAX_ROWS})"
+            )
+
+        if resumes is None or not resumes.filename:
+            return LeadImportJob(rows)
+
+        # Take the spooled file away from the UploadFile: FastAPI closes request
+        # files as soon as the endpoint returns, before a streamed import has run.
+        archive_file: BinaryIO = resumes.file
+        resumes.file = io.BytesIO()
+        try:
+            return LeadImportJob(rows, archive_file)
+        except zipfile.BadZipFile:
+            archive_file.close()
+            raise HTTPException(status_code=400, detail="Resume archive is not a valid zip file")
+
+    @staticmethod
+    def parse_rows(content: bytes, filename: str, content_type: str) -> List[ImportRow]:
+        """Split an NDJSON or CSV import file into rows; CSV is detected by extension or content type"""
+        try:
+            text = content.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="Import file must be UTF-8 encoded")
+
+        rows: List[ImportRow] = []
+        if filename.lower().endswith(".csv") or "csv" in content_type:
+            reader = csv.DictReader(io.StringIO(text))
+            for number, record in enumerate(reader, start=1):
+                fields = {(key or "").strip().lower(): (value or "").strip() for key, value in record.items()}
+                rows.append(ImportRow(number, fields))
+            return rows
+
+        for number, line in enumerate((line for line in text.splitlines() if line.strip()), start=1):
+            try:
+                record = loads(line)
+            except ValueError:
+                record = None
+            row = ImportRow(number, record if isinstance(record, dict) else {})
+            if not isinstance(record, dict):
+                row.finish(LeadImportRowStatus.INVALID, "Line is not a JSON object")
+            rows.append(row)
+        return rows
+
+    async def run(self, db: AsyncSession, job: LeadImportJob) -> LeadImportReport:
+        """Run an import to completion and return its report"""
+        try:
+            report = None
+            async for progress in self.import_leads(db, job):
+                report = progress.get("report")
+            return LeadImportReport(**report)
+        finally:
+            job.close()
+
+    async def stream(self, job: LeadImportJob) -> AsyncIterator[bytes]:
+        """Run an import, yielding NDJSON progress lines; the last line carries the report.
+
+        Uses its own session because the request's session is closed before a
+        streaming response body is produced.
+        """
+        try:
+            async with AsyncPostgresSessionLocal() as db:
+                async for progress in self.import_leads(db, job):
+                    yield dumps(progress) + b"\n"
+        finally:
+            job.close()
+
+    async def import_leads(self, db: AsyncSession, job: LeadImportJob) -> AsyncIterator[Dict[str, Any]]:
+        """Validate, dedupe, upload resumes, COPY rows in and stage their events, reporting progress"""
+        pending = self._validate(job)
+        yield {"stage": "validated", "rows": len(job.rows), "valid": len(pending)}
+
+        # One set-based lookup instead of a duplicate check per row
+        existing = await lead_crud.get_existing_emails(db, [row.lead.email for row in pending])
+        for row in pending:
+            if row.lead.email.lower() in existing:
+                row.finish(LeadImportRowStatus.DUPLICATE, "A lead with this email already exists")
+        pending = [row for row in pending if row.result is None]
+        yield {"stage": "deduplicated", "duplicates": len(existing), "remaining": len(pending)}
+
+        async for progress in self._upload_resumes(job, pending):
+            yield progress
+        pending = [row for row in pending if row.result is None]
+
+        created = await self._insert(db, pending)
+        yield {"stage": "inserted", "created": created}
+
+        yield {"stage": "done", "report": self._report(job).model_dump()}
+
+    def _validate(self, job: LeadImportJob) -> List[ImportRow]:
+        """Validate rows and drop repeated emails; returns the rows still to import"""
+        seen = set()
+        valid: List[ImportRow] = []
+        for row in job.rows:
+            if row.result is not None:
+                continue
+            try:
+                row.lead = LeadCreate(
+                    first_name=str(row.fields.get("first_name") or "").strip(),
+                    last_name=str(row.fields.get("last_name") or "").strip(),
+                    email=str(row.fields.get("email") or "").strip()
+                )
+            except ValidationError as e:
+                error = e.errors()[0]
+                row.finish(LeadImportRowStatus.INVALID, f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+                continue
+
+            resume_name = str(row.fields.get("resume") or "").strip() or None
+            if resume_name is not None:
+                info = job.members.get(resume_name)
+                if info is None:
+                    row.finish(LeadImportRowStatus.INVALID, f"Resume {resume_name} not found in archive")
+                    continue
+                if info.file_size > self.file_service.max_file_size:
+                    row.finish(LeadImportRowStatus.INVALID, f"Resume {resume_name} is too large")
+                    continue
+                row.resume_name = resume_name
+
+            email_key = row.lead.email.lower()
+            if email_key in seen:
+                row.finish(LeadImportRowStatus.DUPLICATE, "Email appears earlier in the file")
+                continue
+            seen.add(email_key)
+            valid.append(row)
+        return valid
+
+    async def _upload_resumes(self, job: LeadImportJob, rows: List[ImportRow]) -> AsyncIterator[Dict[str, Any]]:
+        """Upload resumes with at most LEADS_IMPORT_UPLOAD_CONCURRENCY in flight, yielding progress"""
+        with_resume = [row for row in rows if row.resume_name is not None]
+        for row in rows:
+            # Ids are assigned before the upload so every resume gets its own object name
+            row.lead.id = uuid.uuid4()
+            if row.resume_name is None:
+                row.lead.resume_path = ""
+        if not with_resume:
+            return
+
+        slots = asyncio.Semaphore(settings.LEADS_IMPORT_UPLOAD_CONCURRENCY)
+
+        async def upload(row: ImportRow):
+            async with slots:
+                info = job.members[row.resume_name]
+                filename = posixpath.basename(info.filename)
+                try:
+                    data = await asyncio.to_thread(job.archive.read, info)
+                    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                    row.lead.resume_path = await self.file_service.upload_resume_bytes(
+                        data, filename, row.lead.email, content_type, lead_id=row.lead.id
+                    )
+                except HTTPException as e:
+                    row.finish(LeadImportRowStatus.FAILED, e.detail)
+                except Exception as e:
+                    logger.error(f"Import upload error for {row.lead.email}: {e}")
+                    row.finish(LeadImportRowStatus.FAILED, "Resume upload failed")
+
+        tasks = [asyncio.create_task(upload(row)) for row in with_resume]
+        try:
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                await task
+                if done % settings.LEADS_IMPORT_PROGRESS_INTERVAL == 0 or done == len(tasks):
+                    yield {"stage": "uploading", "uploaded": done, "total": len(tasks)}
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _insert(self, db: AsyncSession, rows: List[ImportRow]) -> int:
+        """COPY rows into leads and stage their lead.created events in the same transaction"""
+        if not rows:
+            return 0
+
+        for row in rows:
+            row.lead.status = LeadStatus.PENDING
+        by_email = {row.lead.email.lower(): row for row in rows}
+
+        try:
+            inserted = await lead_crud.bulk_insert(db, [
+                {
+                    "id": row.lead.id,
+                    "first_name": row.lead.first_name,
+                    "last_name": row.lead.last_name,
+                    "email": row.lead.email,
+                    "resume_path": row.lead.resume_path,
+                    "status": row.lead.status.value,
+                }
+                for row in rows
+            ])
+            for db_lead in inserted:
+                lead_response = LeadResponse.from_orm(db_lead)
+                event_publisher.enqueue_lead_created(
+                    db,
+                    lead_response=lead_response,
+                    metadata={"source": "lead_import", "event_version": "1.0"}
+                )
+                by_email[db_lead.email.lower()].finish(LeadImportRowStatus.CREATED, lead_id=db_lead.id)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Bulk insert failed: {e}")
+            for row in rows:
+                row.finish(LeadImportRowStatus.FAILED, "Failed to store lead")
+            await self._remove_resumes(rows)
+            return 0
+
+        outbox_relay.notify()
+
+        # Lost a race with a concurrent insert of the same email; its resume is now an orphan
+        lost = [row for row in rows if row.result is None]
+        for row in lost:
+            row.finish(LeadImportRowStatus.DUPLICATE, "A lead with this email already exists")
+        await self._remove_resumes(lost)
+        return len(inserted)
+
+    async def _remove_resumes(self, rows: List[ImportRow]):
+        """Best-effort removal of resumes uploaded for rows that were not stored"""
+        for row in rows:
+            if row.lead.resume_path:
+                try:
+                    await self.file_service.storage.remove_object(row.lead.resume_path)
+                except Exception as e:
+                    logger.warning(f"Could not remove orphaned resume {row.lead.resume_path}: {e}")
+
+    @staticmethod
+    def _report(job: LeadImportJob) -> LeadImportReport:
+        results = [row.result for row in job.rows]
+        counts = {status: 0 for status in LeadImportRowStatus}
+        for result in results:
+            counts[result.status] += 1
+        return LeadImportReport(
+            total_rows=len(results),
+            created=counts[LeadImportRowStatus.CREATED],
+            duplicates=counts[LeadImportRowStatus.DUPLICATE],
+            invalid=counts[LeadImportRowStatus.INVALID],
+            failed=counts[LeadImportRowStatus.FAILED],
+            rows=results
+        )
+
@@ -1,17 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from fastapi import UploadFile, HTTPException
 from pydantic import ValidationError
+import asyncio
 import uuid
 import logging
 import math
-import urllib.parse
 from typing import Optional
 from app.models.lead import LeadStatus
-from app.schemas.lead import LeadResponse, LeadCreate, LeadListResponse
+from app.schemas.lead import (
+    LeadResponse,
+    LeadCreate,
+    LeadListResponse,
+    CountStrategy,
+    LeadBulkStatusUpdateRequest,
+    LeadBulkStatusUpdateResponse,
+)
 from app.services.file_service import FileUploadService
+from app.services.resume_url_service import resume_url_service
+from app.services.lead_cache import lead_cache
 from app.crud.lead import lead as lead_crud
 from app.messaging.publisher import event_publisher
+from app.messaging.outbox_relay import outbox_relay
 from app.core.config import settings
+from app.utils import encode_cursor, decode_cursor
 import uuid
 import logging
 import math
@@ -29,7 +41,7 @@ class LeadService:
         last_name: str,
         email: str,
         resume_file: UploadFile,
-        db: Session
+        db: AsyncSession
     ) -> LeadResponse:
         """Create a new lead with resume upload"""
         
@@ -42,54 +54,104 @@ class LeadService:
         except ValidationError as e:
             raise HTTPException(status_code=400, detail=f"Validation error: {e.errors()[0]['msg']}")
         
-        existing_lead = lead_crud.get_by_email(db, lead_data.email)
-        if existing_lead:
-            raise HTTPException(
-                status_code=409, 
-                detail=f"A lead with email {lead_data.email} already exists"
-            )
+        if not resume_file.filename:
+            raise HTTPException(status_code=400, detail="No file provided")
+        
+        lead_data.id = uuid.uuid4()
+        # Keyed by lead id, so an upload racing a duplicate submission never overwrites the existing lead's resume
+        lead_data.resume_path = self.file_service.resume_path(lead_data.email, resume_file.filename, lead_id=lead_data.id)
+        lead_data.status = LeadStatus.PENDING
+        uploaded = False
         
         try:
-            resume_path = await self.file_service.upload_resume(resume_file, lead_data.email)
-            
-            lead_data.id = uuid.uuid4()
-            lead_data.resume_path = resume_path
-            lead_data.status = LeadStatus.PENDING
-            
-            db_lead = lead_crud.create(db, obj_in=lead_data)
+            if settings.LEAD_CREATE_PIPELINED:
+                db_lead = await self._reserve_and_upload(db, lead_data, resume_file)
+            else:
+                db_lead = await self._reserve(db, lead_data)
+                await self.file_service.upload_resume(resume_file, lead_data.email, resume_path=db_lead.resume_path)
+            uploaded = True
             
             lead_response = LeadResponse.from_orm(db_lead)
             lead_response.resume_url = self._generate_resume_url(db_lead.resume_path)
             
-            await self._publish_lead_created_event(lead_response)
+            # The event is committed atomically with the lead and relayed to Kafka in the background
+            self._enqueue_lead_created_event(db, lead_response)
+            await db.commit()
+            outbox_relay.notify()
             return lead_response
             
         except HTTPException:
+            # Releases the reservation when the upload is rejected
+            await db.rollback()
+            if uploaded:
+                await self._discard_resume(lead_data.resume_path)
             raise
             
         except Exception as e:
+            await db.rollback()
+            if uploaded:
+                await self._discard_resume(lead_data.resume_path)
             logger.error(f"Unexpected error for {email}: {e}")
             raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
-    async def _publish_lead_created_event(self, lead_response: LeadResponse):
-        """Publish lead created event - internal business logic"""
-        try:
-            await event_publisher.publish_lead_created(
-                lead_response=lead_response,
-                metadata={
-                    "source": "lead_service",
-                    "event_version": "1.0"
-                }
+    async def _reserve(self, db: AsyncSession, lead_data: LeadCreate):
+        """Insert the lead uncommitted, or raise 409 if the email is taken.
+
+        The uncommitted row makes concurrent submissions of the same email wait and
+        then conflict, and the database decides duplicates in this one statement.
+        """
+        db_lead = await lead_crud.create_if_email_absent(db, obj_in=lead_data)
+        if db_lead is None:
+            raise HTTPException(
+                status_code=409, 
+                detail=f"A lead with email {lead_data.email} already exists"
             )
-            logger.info(f"Lead created event published for {lead_response.email}")
-            
+        return db_lead
+
+    async def _reserve_and_upload(self, db: AsyncSession, lead_data: LeadCreate, resume_file: UploadFile):
+        """Reserve the email while the resume uploads, so the request waits for the slower of the two.
+
+        If either side fails, a completed upload is deleted before the error is raised;
+        the caller rolls the reservation back. A duplicate email wins over upload errors.
+        """
+        reservation, upload = await asyncio.gather(
+            self._reserve(db, lead_data),
+            self.file_service.upload_resume(resume_file, lead_data.email, resume_path=lead_data.resume_path),
+            return_exceptions=True
+        )
+        if isinstance(reservation, BaseException) or isinstance(upload, BaseException):
+            if not isinstance(upload, BaseException):
+                await self._discard_resume(lead_data.resume_path)
+            raise reservation if isinstance(reservation, BaseException) else upload
+        return reservation
+
+    async def _discard_resume(self, resume_path: str):
+        """Delete the resume of a lead that was not created; a failure leaves an orphan, which is logged"""
+        try:
+            await self.file_service.storage.remove_object(resume_path)
         except Exception as e:
-            logger.error(f"Failed to publish lead created event: {e}")
+            logger.warning(f"Could not remove orphaned resume {resume_path}: {e}")
+
+    def _enqueue_lead_created_event(self, db: AsyncSession, lead_response: LeadResponse):
+        """Stage lead created event in the outbox - internal business logic"""
+        event_publisher.enqueue_lead_created(
+            db,
+            lead_response=lead_response,
+            metadata={
+                "source": "lead_service",
+                "event_version": "1.0"
+            }
+        )
     
-    def get_lead_by_id(self, db: Session, lead_id: str) -> LeadResponse:
-        """Get a specific lead by ID"""
+    async def get_lead_by_id(self, db: AsyncSession, lead_id: str) -> LeadResponse:
+        """Get a specific lead by ID, from the lead cache when enabled"""
+        cached = lead_cache.get(lead_id)
+        if cached is not None:
+            # The cached URL may have been re-signed since; the URL cache knows the current one
+            return cached.model_copy(update={"resume_url": self._generate_resume_url(cached.resume_path)})
+
         try:
-            lead = lead_crud.get(db, id=lead_id)
+            lead = await lead_crud.get(db, id=lead_id)
             if not lead:
                 raise HTTPException(
                     status_code=404, 
@@ -98,6 +160,7 @@ class LeadService:
             
             lead_response = LeadResponse.from_orm(lead)
             lead_response.resume_url = self._generate_resume_url(lead.resume_path)
+            lead_cache.set(lead_response)
             
             return lead_response
             
@@ -109,18 +172,18 @@ class LeadService:
     
     async def update_lead(
         self,
-        db: Session,
+        db: AsyncSession,
         lead_id: str,
         first_name: Optional[str] = None,
         last_name: Optional[str] = None,
         email: Optional[str] = None,
         resume_file: Optional[UploadFile] = None,
+        expected_version: Optional[int] = None,
     ) -> LeadResponse:
-        """Update lead info and optionally upload a new resume"""
-        lead = lead_crud.get(db, id=lead_id)
-        if not lead:
-            raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
+        """Update lead info and optionally upload a new resume.
 
+        With expected_version the update only applies if the lead is still at that version.
+        """
         update_data = {}
         if first_name is not None:
             update_data["first_name"] = first_name.strip()
@@ -129,26 +192,51 @@ class LeadService:
         if email is not None:
             update_data["email"] = email.strip()
 
-        # Use the new email if provided, otherwise use the existing email
-        email_for_resume = email.strip() if email is not None else lead.email
-
         # If a new resume is uploaded, upload and update path
         if resume_file is not None:
+            # Use the new email if provided, otherwise look up the existing email
+            if email is not None:
+                email_for_resume = email.strip()
+            else:
+                lead = await lead_crud.get(db, id=lead_id)
+                if not lead:
+                    raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
+                email_for_resume = lead.email
             resume_path = await self.file_service.upload_resume(resume_file, email_for_resume)
             update_data["resume_path"] = resume_path
 
-        updated_lead = lead_crud.update(db, db_obj=lead, obj_in=update_data)
+        try:
+            updated_lead = await lead_crud.update_by_id(
+                db, id=lead_id, obj_in=update_data, expected_version=expected_version
+            )
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=f"A lead with email {update_data.get('email')} already exists")
+
+        if updated_lead is None:
+            if expected_version is not None and await lead_crud.get(db, id=lead_id):
+                raise self._version_conflict()
+            raise HTTPException(status_code=404, detail=f"Lead with ID {lead_id} not found")
+
+        lead_cache.invalidate([updated_lead.id])
         lead_response = LeadResponse.from_orm(updated_lead)
         lead_response.resume_url = self._generate_resume_url(updated_lead.resume_path)
         return lead_response
     
-    def get_paginated_leads(
+    async def get_paginated_leads(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         page: int = 1, 
-        page_size: int = 10
+        page_size: int = 10,
+        cursor: Optional[str] = None,
+        count_strategy: Optional[CountStrategy] = None
     ) -> LeadListResponse:
-        """Get paginated leads with resume URLs"""
+        """Get paginated leads with resume URLs.
+
+        Pages are addressed either by page number (OFFSET) or by the opaque
+        next_cursor returned with every page that has a successor (keyset).
+        The total is computed with count_strategy, defaulting to LEADS_COUNT_STRATEGY.
+        """
         
         # Validate pagination parameters
         if page < 1:
@@ -156,61 +244,88 @@ class LeadService:
         if page_size < 1 or page_size > 100:
             raise HTTPException(status_code=400, detail="Page size must be between 1 and 100")
         
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        
+        if count_strategy is None:
+            count_strategy = settings.LEADS_COUNT_STRATEGY
+        
         try:
-            leads, total = lead_crud.get_paginated(db, page=page, page_size=page_size)
+            if after is not None:
+                leads, has_more = await lead_crud.get_keyset_page(db, page_size=page_size, after=after)
+                page = None
+            else:
+                leads, has_more = await lead_crud.get_paginated(db, page=page, page_size=page_size)
             
+            total, total_is_estimate = await lead_crud.count(db, count_strategy)
+            
+            # Sign the whole page at once; repeat visits are served from the URL cache
+            resume_urls = resume_url_service.get_urls(lead.resume_path for lead in leads)
             lead_responses = []
             for lead in leads:
                 lead_response = LeadResponse.from_orm(lead)
-                lead_response.resume_url = self._generate_resume_url(lead.resume_path)
+                lead_response.resume_url = resume_urls.get(lead.resume_path)
                 lead_responses.append(lead_response)
             
             total_pages = math.ceil(total / page_size) if total > 0 else 1
             
+            next_cursor = None
+            if has_more and lead_responses:
+                last = lead_responses[-1]
+                next_cursor = encode_cursor(last.created_at, last.id)
+            
             return LeadListResponse(
                 leads=lead_responses,
                 total=total,
+                total_is_estimate=total_is_estimate,
                 page=page,
                 page_size=page_size,
-                total_pages=total_pages
+                total_pages=total_pages,
+                next_cursor=next_cursor
             )
             
         except Exception as e:
             logger.error(f"Error fetching paginated leads: {e}")
             raise HTTPException(status_code=500, detail="Failed to fetch leads")
         
-    def _generate_resume_url(self, resume_path: str) -> str:
-        """Generate MinIO URL from resume path"""
-        if not resume_path:
-            return None
-            
-        # URL encode the path
-        encoded_path = urllib.parse.quote(resume_path, safe='')
-        
-        # Generate MinIO browser URL
-        minio_url = f"{settings.MINIO_URL}/browser/leads/{encoded_path}"
-        
-        return minio_url
+    def _generate_resume_url(self, resume_path: str) -> Optional[str]:
+        """Presigned download URL for a resume, signed locally and cached"""
+        return resume_url_service.get_url(resume_path)
 
-    def update_lead_status(self, db: Session, email: str, new_status: LeadStatus) -> LeadResponse:
-        """Update lead status via their email (attorney only)"""
+    @staticmethod
+    def _version_conflict() -> HTTPException:
+        return HTTPException(
+            status_code=409,
+            detail="Lead was modified by another request; reload it and retry"
+        )
+
+    async def update_lead_status(
+        self,
+        db: AsyncSession,
+        email: str,
+        new_status: LeadStatus,
+        expected_version: Optional[int] = None
+    ) -> LeadResponse:
+        """Update lead status via their email in a single statement (attorney only)"""
         try:
-            existing_lead = lead_crud.get_by_email(db, email)
-            if not existing_lead:
-                raise HTTPException(
-                    status_code=404, 
-                    detail=f"Lead with email {email} not found"
-                )
-            
             update_data = {"status": new_status}
-            updated_lead = lead_crud.update(db, db_obj=existing_lead, obj_in=update_data)
+            updated_lead = await lead_crud.update_by_email(
+                db, email=email, obj_in=update_data, expected_version=expected_version
+            )
             
             if not updated_lead:
+                if expected_version is not None and await lead_crud.get_by_email(db, email):
+                    raise self._version_conflict()
                 raise HTTPException(
-                    status_code=500, 
-                    detail="Failed to update lead status"
+                    status_code=404, 
+                    detail=f"Lead with email {email} not found"
                 )
             
+            lead_cache.invalidate([updated_lead.id])
             lead_response = LeadResponse.from_orm(updated_lead)
             
             logger.info(f"Lead status updated: {email} -> {new_status}")
@@ -221,3 +336,45 @@ class LeadService:
         except Exception as e:
             logger.error(f"Error updating lead status for {email}: {e}")
             raise HTTPException(status_code=500, detail="Failed to update lead status")
+
+    async def update_lead_status_bulk(
+        self, db: AsyncSession, request: LeadBulkStatusUpdateRequest
+    ) -> LeadBulkStatusUpdateResponse:
+        """Update the status of many leads, addressed by email or ID, in a single statement (attorney only)"""
+        by_email = bool(request.emails)
+        # Keep the caller's order but send each key once
+        if by_email:
+            unique_emails = {}
+            for email in request.emails:
+                unique_emails.setdefault(email.lower(), email)
+            keys = list(unique_emails.values())
+        else:
+            keys = list(dict.fromkeys(request.ids))
+
+        try:
+            if by_email:
+                updated = await lead_crud.update_status_bulk(db, request.status, emails=keys)
+            else:
+                updated = await lead_crud.update_status_bulk(db, request.status, ids=keys)
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"Error bulk updating lead status: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update lead status")
+
+        lead_cache.invalidate(lead_id for lead_id, _ in updated)
+        if by_email:
+            found = {email.lower() for _, email in updated}
+            matched = [key for key in keys if key.lower() in found]
+        else:
+            found = {lead_id for lead_id, _ in updated}
+            matched = [str(key) for key in keys if key in found]
+        matched_set = set(matched)
+        unmatched = [str(key) for key in keys if str(key) not in matched_set]
+
+        logger.info(f"Lead status bulk update: {len(matched)} -> {request.status}, {len(unmatched)} unmatched")
+        return LeadBulkStatusUpdateResponse(
+            status=request.status,
+            updated=len(updated),
+            matched=matched,
+            unmatched=unmatched
+        )
@@ -0,0 +1,50 @@
+from datetime import timedelta
+from typing import Dict, Iterable, Optional
+import logging
+from app.storage import ObjectStorage, get_storage
+from app.core.config import settings
+from app.utils import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeUrlService:
+    """Presigned resume download URLs, signed locally and cached per resume_path.
+
+    Cache entries expire RESUME_URL_CACHE_MARGIN_SECONDS before the signature does,
+    so a URL handed out from the cache is always valid for at least that long.
+    """
+
+    def __init__(self, storage: Optional[ObjectStorage] = None):
+        self.storage = storage or get_storage()
+        self.expires = timedelta(seconds=settings.RESUME_URL_EXPIRY_SECONDS)
+        ttl = max(settings.RESUME_URL_EXPIRY_SECONDS - settings.RESUME_URL_CACHE_MARGIN_SECONDS, 0)
+        self.cache: TTLCache[str, str] = TTLCache(maxsize=settings.RESUME_URL_CACHE_SIZE, ttl=ttl)
+
+    def get_url(self, resume_path: Optional[str]) -> Optional[str]:
+        """Download URL for one resume"""
+        return self.get_urls([resume_path]).get(resume_path)
+
+    def get_urls(self, resume_paths: Iterable[Optional[str]]) -> Dict[str, Optional[str]]:
+        """Download URLs for a page of resumes; only paths missing from the cache are signed"""
+        urls: Dict[str, Optional[str]] = {}
+        for resume_path in resume_paths:
+            if not resume_path or resume_path in urls:
+                continue
+            url = self.cache.get(resume_path)
+            if url is None:
+                url = self._sign(resume_path)
+                if url is not None:
+                    self.cache.set(resume_path, url)
+            urls[resume_path] = url
+        return urls
+
+    def _sign(self, resume_path: str) -> Optional[str]:
+        try:
+            return self.storage.presigned_get_url(resume_path, self.expires)
+        except Exception as e:
+            logger.error(f"Failed to presign resume URL for {resume_path}: {e}")
+            return None
+
+
+resume_url_service = ResumeUrlService()
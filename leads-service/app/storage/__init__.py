@@ -0,0 +1,52 @@
+"""Object storage backends for resume files."""
+
+from .base import ObjectStorage, StorageError
+from .memory_storage import InMemoryStorage
+from .local_storage import LocalFileStorage
+from .minio_storage import MinioStorage
+from typing import Optional
+import threading
+from app.core.config import settings
+
+# Created on first use, so importing the app never builds clients or touches the network
+_storage: Optional[ObjectStorage] = None
+_storage_lock = threading.Lock()
+
+
+def create_storage() -> ObjectStorage:
+    """Create the storage backend selected by STORAGE_BACKEND"""
+    backend = settings.STORAGE_BACKEND.lower()
+    if backend == "memory":
+        return InMemoryStorage()
+    if backend == "local":
+        return LocalFileStorage(settings.STORAGE_LOCAL_ROOT, settings.MINIO_BUCKET_NAME)
+    if backend == "minio":
+        from app.core.s3 import get_s3_client, create_signing_client
+        return MinioStorage(
+            get_s3_client(),
+            settings.MINIO_BUCKET_NAME,
+            max_workers=settings.S3_MAX_WORKERS,
+            signing_client=create_signing_client()
+        )
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+
+def get_storage() -> ObjectStorage:
+    """Dependency function to get the configured object storage backend"""
+    global _storage
+    if _storage is None:
+        with _storage_lock:
+            if _storage is None:
+                _storage = create_storage()
+    return _storage
+
+
+__all__ = [
+    "ObjectStorage",
+    "StorageError",
+    "InMemoryStorage",
+    "LocalFileStorage",
+    "MinioStorage",
+    "create_storage",
+    "get_storage",
+]
@@ -0,0 +1,51 @@
+"""Async object storage interface shared by all backends."""
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import BinaryIO, Optional
+
+
+class StorageError(Exception):
+    """Raised when a storage backend fails to complete an operation"""
+
+
+class ObjectStorage(ABC):
+    """Async interface for storing resume objects under a single bucket"""
+
+    backend_name: str = "abstract"
+
+    @abstractmethod
+    async def put_object(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str = "application/octet-stream",
+        part_size: int = 0
+    ) -> None:
+        """Store data under object_name. length=-1 reads data until EOF in part_size parts"""
+
+    @abstractmethod
+    async def get_object(self, object_name: str) -> bytes:
+        """Return the full content of an object"""
+
+    @abstractmethod
+    async def remove_object(self, object_name: str) -> None:
+        """Delete an object, ignoring objects that do not exist"""
+
+    @abstractmethod
+    async def ensure_bucket(self) -> None:
+        """Create the backing bucket/directory if it is missing"""
+
+    @abstractmethod
+    async def health_check(self) -> bool:
+        """Return True when the backend can serve requests"""
+
+    def presigned_get_url(self, object_name: str, expires: timedelta) -> Optional[str]:
+        """Return a URL that downloads the object until it expires, or None if the backend has none.
+
+        Must not do I/O: it is called for every lead on a listing page.
+        """
+        return None
+
+    async def close(self) -> None:
+        """Release resources held by the backend"""
@@ -0,0 +1,76 @@
+"""Local filesystem storage backend."""
+import asyncio
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+from app.storage.base import ObjectStorage, StorageError
+
+
+class LocalFileStorage(ObjectStorage):
+    """Stores objects as files under root/bucket, writing off the event loop"""
+
+    backend_name = "local"
+
+    def __init__(self, root: str, bucket_name: str, chunk_size: int = 1024 * 1024):
+        self.base_path = (Path(root) / bucket_name).resolve()
+        self.chunk_size = chunk_size
+
+    def _path_for(self, object_name: str) -> Path:
+        path = (self.base_path / object_name).resolve()
+        if self.base_path not in path.parents:
+            raise StorageError(f"Invalid object name: {object_name}")
+        return path
+
+    def _write(self, path: Path, data: BinaryIO, length: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per write: concurrent puts of the same key must not share a temp file
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "wb") as target:
+                if length >= 0:
+                    remaining = length
+                    while remaining:
+                        chunk = data.read(min(self.chunk_size, remaining))
+                        if not chunk:
+                            break
+                        target.write(chunk)
+                        remaining -= len(chunk)
+                else:
+                    shutil.copyfileobj(data, target, self.chunk_size)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    async def put_object(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str = "application/octet-stream",
+        part_size: int = 0
+    ) -> None:
+        path = self._path_for(object_name)
+        try:
+            await asyncio.to_thread(self._write, path, data, length)
+        except OSError as e:
+            raise StorageError(str(e)) from e
+
+    async def get_object(self, object_name: str) -> bytes:
+        path = self._path_for(object_name)
+        try:
+            return await asyncio.to_thread(path.read_bytes)
+        except OSError as e:
+            raise StorageError(str(e)) from e
+
+    async def remove_object(self, object_name: str) -> None:
+        path = self._path_for(object_name)
+        await asyncio.to_thread(path.unlink, True)
+
+    async def ensure_bucket(self) -> None:
+        await asyncio.to_thread(self.base_path.mkdir, parents=True, exist_ok=True)
+
+    async def health_check(self) -> bool:
+        return await asyncio.to_thread(os.access, self.base_path, os.W_OK)
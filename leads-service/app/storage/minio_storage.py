@@ -0,0 +1,96 @@
+"""MinIO/S3 storage backend with blocking client calls offloaded to a bounded executor."""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+from typing import BinaryIO, Callable, Optional, TypeVar
+from minio import Minio
+from minio.error import S3Error
+from app.storage.base import ObjectStorage, StorageError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class MinioStorage(ObjectStorage):
+    """Runs MinIO client calls on a dedicated thread pool so transfers never block the loop.
+
+    The client's urllib3 pool is shared by every worker thread, so connections are
+    reused across uploads; max_workers caps how many transfers run at once.
+    """
+
+    backend_name = "minio"
+
+    def __init__(self, client: Minio, bucket_name: str, max_workers: int = 8, signing_client: Optional[Minio] = None):
+        self.client = client
+        # Presigning needs the region up front to stay local; see create_signing_client
+        self.signing_client = signing_client or client
+        self.bucket_name = bucket_name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="minio")
+        self._slots = asyncio.Semaphore(max_workers)
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        # Waiting on the semaphore keeps excess callers queued on the loop instead
+        # of piling work (and open upload streams) into the executor queue.
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+            except S3Error as e:
+                raise StorageError(str(e)) from e
+
+    async def put_object(
+        self,
+        object_name: str,
+        data: BinaryIO,
+        length: int,
+        content_type: str = "application/octet-stream",
+        part_size: int = 0
+    ) -> None:
+        await self._run(
+            self.client.put_object,
+            bucket_name=self.bucket_name,
+            object_name=object_name,
+            data=data,
+            length=length,
+            part_size=part_size,
+            content_type=content_type
+        )
+
+    async def get_object(self, object_name: str) -> bytes:
+        def _read() -> bytes:
+            response = self.client.get_object(self.bucket_name, object_name)
+            try:
+                return response.read()
+            finally:
+                response.close()
+                response.release_conn()
+
+        return await self._run(_read)
+
+    async def remove_object(self, object_name: str) -> None:
+        await self._run(self.client.remove_object, self.bucket_name, object_name)
+
+    async def ensure_bucket(self) -> None:
+        def _ensure() -> None:
+            if not self.client.bucket_exists(self.bucket_name):
+                self.client.make_bucket(self.bucket_name)
+                logger.info(f"Created S3 bucket: {self.bucket_name}")
+
+        await self._run(_ensure)
+
+    def presigned_get_url(self, object_name: str, expires: timedelta) -> Optional[str]:
+        return self.signing_client.presigned_get_object(self.bucket_name, object_name, expires=expires)
+
+    async def health_check(self) -> bool:
+        try:
+            return await self._run(self.client.bucket_exists, self.bucket_name)
+        except Exception as e:
+            logger.error(f"MinIO storage health check failed: {e}")
+            return False
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False)
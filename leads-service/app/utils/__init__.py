@@ -1,5 +1,12 @@
 """Utility functions for the application."""
 
-from .json_utils import make_json_safe
+from .json_utils import dumps, dumps_str, loads, ORJSONResponse
+from .pagination import encode_cursor, decode_cursor
+from .cache import TTLCache
+from .histogram import Histogram, LATENCY_BUCKETS
+from .conditional import make_etag, is_not_modified
 
-__all__ = ["make_json_safe"]
+__all__ = [
+    "dumps", "dumps_str", "loads", "ORJSONResponse",
+    "encode_cursor", "decode_cursor", "TTLCache", "Histogram", "LATENCY_BUCKETS",
+    "make_etag", "is_not_modified"]
@@ -0,0 +1,20 @@
+"""ETag validators for conditional GET requests."""
+import hashlib
+from typing import Any, Optional
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag over the given parts of a representation"""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode("utf-8"), digest_size=12)
+    return f'"{digest.hexdigest()}"'
+
+
+def is_not_modified(etag: str, if_none_match: Optional[str]) -> bool:
+    """RFC 9110 If-None-Match evaluation for GET"""
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: a W/ prefix on either side does not matter for GET
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
@@ -1,19 +1,40 @@
-"""JSON serialization utilities."""
-from datetime import datetime
+"""JSON serialization utilities.
+
+Everything the service turns into JSON (API responses, Kafka values, JSONB
+columns) goes through these helpers. orjson encodes UUID, datetime, date and
+Enum values natively, so payloads can be handed over as built by Pydantic's
+model_dump() without first converting them to strings in Python.
+"""
 from typing import Any
-from uuid import UUID
-
-
-def make_json_safe(obj: Any) -> Any:
-    """Convert objects to JSON-serializable format.
-    """
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, UUID):
-        return str(obj)
-    elif isinstance(obj, dict):
-        return {k: make_json_safe(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [make_json_safe(item) for item in obj]
-    else:
-        return obj
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not know about"""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes"""
+    return orjson.dumps(obj, default=_default)
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize obj to a JSON string, for APIs that expect text (e.g. SQLAlchemy JSON columns)"""
+    return orjson.dumps(obj, default=_default).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from bytes or str"""
+    return orjson.loads(data)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; used as the application's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
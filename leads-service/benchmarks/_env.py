@@ -0,0 +1,25 @@
+"""Default settings so benchmarks can import the app without a .env file."""
+import os
+
+BENCHMARK_ENV = {
+    "ALLOWED_ORIGINS": "http://localhost",
+    "POSTGRES_SERVER": "127.0.0.1",
+    "POSTGRES_USER": "postgres",
+    "POSTGRES_PASSWORD": "postgres",
+    "POSTGRES_DB": "alma",
+    "MINIO_URL": "http://127.0.0.1:9001",
+    "MINIO_ENDPOINT": "127.0.0.1:9000",
+    "MINIO_ACCESS_KEY": "benchmark",
+    "MINIO_SECRET_KEY": "benchmark",
+    "MINIO_BUCKET_NAME": "leads",
+    "STORAGE_BACKEND": "memory",
+    "KAFKA_BOOTSTRAP_SERVERS": "127.0.0.1:9092",
+    "KAFKA_NEW_LEADS_TOPIC": "new_leads",
+    "SECRET_KEY": "benchmark-secret",
+}
+
+
+def configure_benchmark_env() -> None:
+    """Fill in any settings the caller has not provided"""
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
@@ -0,0 +1,176 @@
+"""Lead submission latency, sequential vs pipelined create_lead.
+
+Drives LeadService.create_lead with stand-ins that only add latency (no
+Postgres, MinIO or Kafka):
+  * the email reservation (INSERT ... ON CONFLICT) takes --reserve-ms
+  * the resume upload takes --upload-ms on top of the memory backend
+  * the commit (lead plus outbox row) takes --commit-ms
+
+  * sequential - reserve, then upload, then commit (LEAD_CREATE_PIPELINED=false)
+  * pipelined  - reserve and upload at the same time, then commit
+
+--duplicates sends that share of submissions with an email that is already
+taken, which the pipelined path pays for with an upload it then deletes.
+
+Usage (from leads-service/):
+    python -m benchmarks.bench_create_lead --leads 500 --concurrency 20
+"""
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+from benchmarks._env import configure_benchmark_env
+
+configure_benchmark_env()
+
+from fastapi import HTTPException  # noqa: E402
+from starlette.datastructures import Headers, UploadFile  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.lead import Lead, LeadStatus  # noqa: E402
+from app.services import lead_service as lead_service_module  # noqa: E402
+from app.services.lead_service import LeadService  # noqa: E402
+from app.storage import InMemoryStorage  # noqa: E402
+
+RESUME = b"%PDF-1.4\n" + b"x" * 64 * 1024
+
+
+class SlowStorage(InMemoryStorage):
+    """Memory backend whose uploads take a fixed extra time, like a MinIO round trip"""
+
+    def __init__(self, latency_s: float):
+        super().__init__()
+        self.latency_s = latency_s
+        self.removed = 0
+
+    async def put_object(self, object_name, data, length, content_type="application/octet-stream", part_size=0):
+        await asyncio.sleep(self.latency_s)
+        await super().put_object(object_name, data, length, content_type=content_type, part_size=part_size)
+
+    async def remove_object(self, object_name):
+        self.removed += 1
+        await super().remove_object(object_name)
+
+
+class StubCrud:
+    """create_if_email_absent with a fixed reservation time; emails in `taken` are duplicates"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.taken = set()
+
+    async def create_if_email_absent(self, db, *, obj_in):
+        await asyncio.sleep(self.latency_s)
+        if obj_in.email in self.taken:
+            return None
+        return Lead(
+            id=obj_in.id, first_name=obj_in.first_name, last_name=obj_in.last_name, email=obj_in.email,
+            resume_path=obj_in.resume_path, status=LeadStatus.PENDING, created_at=datetime.now(timezone.utc), version=1
+        )
+
+
+class StubSession:
+    """Session whose commit takes a fixed time"""
+
+    def __init__(self, commit_latency_s: float):
+        self.commit_latency_s = commit_latency_s
+
+    def add(self, instance):
+        pass
+
+    async def commit(self):
+        await asyncio.sleep(self.commit_latency_s)
+
+    async def rollback(self):
+        pass
+
+
+def make_upload() -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spooled.write(RESUME)
+    spooled.seek(0)
+    return UploadFile(
+        spooled,
+        size=len(RESUME),
+        filename="resume.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_mode(name: str, pipelined: bool, args) -> dict:
+    settings.LEAD_CREATE_PIPELINED = pipelined
+    crud = StubCrud(args.reserve_ms / 1000)
+    lead_service_module.lead_crud = crud
+    service = LeadService()
+    storage = SlowStorage(args.upload_ms / 1000)
+    service.file_service.storage = storage
+
+    duplicate_every = round(1 / args.duplicates) if args.duplicates > 0 else 0
+    slots = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    outcomes = {"created": 0, "duplicate": 0}
+
+    async def one(i: int) -> None:
+        email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+        if duplicate_every and i % duplicate_every == 0:
+            crud.taken.add(email)
+        async with slots:
+            started = time.perf_counter()
+            try:
+                await service.create_lead("Bench", f"Lead{i}", email, make_upload(), StubSession(args.commit_ms / 1000))
+                outcomes["created"] += 1
+            except HTTPException as e:
+                if e.status_code != 409:
+                    raise
+                outcomes["duplicate"] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.leads)))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "mode": name,
+        "leads_per_s": round(outcomes["created"] / elapsed, 1),
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 1),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 1),
+        "duplicates": outcomes["duplicate"],
+        "discarded": storage.removed,
+    }
+
+
+async def main_async(args) -> None:
+    results = [
+        await run_mode("sequential", False, args),
+        await run_mode("pipelined", True, args),
+    ]
+
+    print(f"{'mode':<11} {'leads/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9} {'409s':>5} {'discarded':>10}")
+    for result in results:
+        print(f"{result['mode']:<11} {result['leads_per_s']:>8} {result['p50_ms']:>9} {result['p95_ms']:>9} "
+              f"{result['p99_ms']:>9} {result['duplicates']:>5} {result['discarded']:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--reserve-ms", type=float, default=8.0, help="email reservation round trip")
+    parser.add_argument("--upload-ms", type=float, default=25.0, help="resume upload round trip")
+    parser.add_argument("--commit-ms", type=float, default=4.0, help="commit round trip")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="share of submissions with a taken email")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
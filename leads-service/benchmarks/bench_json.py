@@ -0,0 +1,115 @@
+"""JSON serialization: the previous stdlib path vs the orjson serializer.
+
+Cases, each timed per operation:
+  * event   - build the lead.created Kafka value and encode it
+              (make_json_safe walk + json.dumps  vs  model_dump + orjson)
+  * consume - decode a lead.created value in the notifications consumer
+  * listing - render a GET /leads page of --page-size leads
+              (JSONResponse  vs  ORJSONResponse)
+
+Usage (from leads-service/):
+    python -m benchmarks.bench_json --iterations 20000 --page-size 100
+"""
+import argparse
+import json
+import timeit
+import uuid
+from datetime import datetime, timedelta
+from typing import Any
+
+from benchmarks._env import configure_benchmark_env
+
+configure_benchmark_env()
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from app.schemas.events import LeadCreatedEvent  # noqa: E402
+from app.schemas.lead import LeadListResponse, LeadResponse, LeadStatus  # noqa: E402
+from app.utils import ORJSONResponse, dumps, loads  # noqa: E402
+
+
+def make_json_safe(obj: Any) -> Any:
+    """The recursive walk the event builder used before the orjson serializer"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, uuid.UUID):
+        return str(obj)
+    elif isinstance(obj, dict):
+        return {k: make_json_safe(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [make_json_safe(item) for item in obj]
+    else:
+        return obj
+
+
+def _lead(i: int) -> LeadResponse:
+    created_at = datetime(2024, 1, 1) + timedelta(seconds=i)
+    return LeadResponse(
+        id=uuid.uuid4(),
+        first_name=f"First{i}",
+        last_name=f"Last{i}",
+        email=f"lead{i}@bench.test",
+        resume_path=f"lead{i}@bench.test/resume/resume.pdf",
+        resume_url=f"http://127.0.0.1:9001/browser/leads/lead{i}%40bench.test%2Fresume%2Fresume.pdf",
+        status=LeadStatus.PENDING,
+        created_at=created_at,
+        updated_at=created_at
+    )
+
+
+def _per_op_us(fn, iterations: int) -> float:
+    return min(timeit.repeat(fn, number=iterations, repeat=3)) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    lead = _lead(0)
+    event = LeadCreatedEvent.from_lead_response(lead)
+    encoded = dumps(event.to_kafka_message().value)
+
+    page = LeadListResponse(
+        leads=[_lead(i) for i in range(args.page_size)],
+        total=10_000,
+        page=1,
+        page_size=args.page_size,
+        total_pages=10_000 // args.page_size
+    )
+    # FastAPI validates the response model into JSON-compatible data before rendering
+    content = jsonable_encoder(page)
+    listing_iterations = max(args.iterations // args.page_size, 100)
+
+    cases = [
+        (
+            "event",
+            lambda: json.dumps(make_json_safe(event.model_dump())).encode("utf-8"),
+            lambda: dumps(event.to_kafka_message().value),
+            args.iterations,
+        ),
+        (
+            "consume",
+            lambda: json.loads(encoded.decode("utf-8")),
+            lambda: loads(encoded),
+            args.iterations,
+        ),
+        (
+            f"listing ({args.page_size})",
+            lambda: JSONResponse(content),
+            lambda: ORJSONResponse(content),
+            listing_iterations,
+        ),
+    ]
+
+    print(f"{'case':<16} {'stdlib (us)':>12} {'orjson (us)':>12} {'speedup':>8}")
+    for name, before, after, iterations in cases:
+        before_us = _per_op_us(before, iterations)
+        after_us = _per_op_us(after, iterations)
+        print(f"{name:<16} {before_us:>12.2f} {after_us:>12.2f} {before_us / after_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Login throughput and event-loop stall, bcrypt inline vs the bounded hasher pool.
+
+Drives AuthService.authenticate_user with a stand-in session (no Postgres):
+  * inline - bcrypt called on the event loop, like login used to
+  * pool   - PasswordHasher with --workers threads and a --max-queue wait limit
+
+A ticker task measures how late the loop wakes it up, i.e. how long a lead
+submission on the same worker would have waited behind the logins. With a
+small --max-queue some logins are shed with 503 instead of queueing.
+
+Usage (from leads-service/):
+    python -m benchmarks.bench_login --logins 64 --concurrency 32 --rounds 12
+"""
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+
+from benchmarks._env import configure_benchmark_env
+
+configure_benchmark_env()
+
+from fastapi import HTTPException  # noqa: E402
+from passlib.context import CryptContext  # noqa: E402
+
+from app.authentication import security, service as auth_service_module  # noqa: E402
+from app.authentication.security import PasswordHasher  # noqa: E402
+from app.authentication.service import AuthService  # noqa: E402
+
+
+class StubSession:
+    """Returns the same user for every lookup"""
+
+    def __init__(self, user):
+        self.user = user
+
+    async def execute(self, statement):
+        user = self.user
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: user))
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class InlineHasher:
+    """Runs bcrypt directly on the loop thread"""
+
+    async def verify_and_update(self, password, hashed_password):
+        return security.verify_and_update_password(password, hashed_password)
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run_mode(name: str, hasher, logins: int, concurrency: int, hashed_password: str) -> dict:
+    auth_service_module.password_hasher = hasher
+    auth = AuthService()
+    db = StubSession(SimpleNamespace(username="bench", hashed_password=hashed_password, role="attorney"))
+    slots = asyncio.Semaphore(concurrency)
+    outcomes = {"ok": 0, "shed": 0}
+
+    async def one() -> None:
+        async with slots:
+            try:
+                await auth.authenticate_user("bench", "bench-password", db)
+                outcomes["ok"] += 1
+            except HTTPException as e:
+                if e.status_code != 503:
+                    raise
+                outcomes["shed"] += 1
+
+    stop = asyncio.Event()
+    lags: list = []
+    ticker = asyncio.create_task(_measure_loop_lag(stop, 0.005, lags))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+
+    return {
+        "mode": name,
+        "logins_per_s": round(outcomes["ok"] / elapsed, 1),
+        "shed": outcomes["shed"],
+        "elapsed_s": round(elapsed, 3),
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 1),
+    }
+
+
+async def main_async(args) -> None:
+    security.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+    hashed_password = security.hash_password("bench-password")
+
+    modes = [
+        ("inline", InlineHasher()),
+        ("pool", PasswordHasher(workers=args.workers, max_queue=args.max_queue)),
+    ]
+    results = [
+        await run_mode(name, hasher, args.logins, args.concurrency, hashed_password)
+        for name, hasher in modes
+    ]
+
+    print(f"{'mode':<8} {'logins/s':>9} {'shed':>6} {'elapsed (s)':>12} {'max loop lag (ms)':>18}")
+    for result in results:
+        print(f"{result['mode']:<8} {result['logins_per_s']:>9} {result['shed']:>6} "
+              f"{result['elapsed_s']:>12} {result['max_loop_lag_ms']:>18}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=4, help="hasher pool size")
+    parser.add_argument("--max-queue", type=int, default=64, help="calls allowed to wait for a worker")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
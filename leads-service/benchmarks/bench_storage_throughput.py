@@ -0,0 +1,130 @@
+"""Resume upload throughput and event-loop stall per storage backend.
+
+Runs FileUploadService against each backend with no MinIO running:
+  * minio-inline  - the pre-storage-layer behaviour: a MinIO stand-in with
+                    simulated network latency called directly on the loop
+  * minio         - the same stand-in behind MinioStorage's bounded executor
+  * local, memory - the filesystem and in-memory backends
+
+While uploads run, a ticker task measures how late the loop wakes it up;
+the worst lag is what every other in-flight request would have felt.
+
+Usage (from leads-service/):
+    python -m benchmarks.bench_storage_throughput --uploads 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import io
+import tempfile
+import time
+
+from benchmarks._env import configure_benchmark_env
+
+configure_benchmark_env()
+
+from starlette.datastructures import Headers, UploadFile  # noqa: E402
+
+from app.services.file_service import FileUploadService  # noqa: E402
+from app.storage import InMemoryStorage, LocalFileStorage, MinioStorage, ObjectStorage  # noqa: E402
+
+
+class SlowS3Client:
+    """MinIO client stand-in that drains the stream and sleeps for a fixed network latency"""
+
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+
+    def bucket_exists(self, bucket_name):
+        return True
+
+    def put_object(self, bucket_name, object_name, data, length, content_type=None, part_size=0):
+        while data.read(part_size or length or 1024 * 1024):
+            pass
+        time.sleep(self.latency_s)
+
+
+class InlineMinioStorage(MinioStorage):
+    """Calls the client on the event loop thread, like FileUploadService used to"""
+
+    async def put_object(self, object_name, data, length, content_type="application/octet-stream", part_size=0):
+        self.client.put_object(self.bucket_name, object_name, data, length, content_type, part_size)
+
+
+async def _measure_loop_lag(stop: asyncio.Event, interval: float, lags: list) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def run_backend(name: str, storage: ObjectStorage, uploads: int, concurrency: int, payload: bytes) -> dict:
+    service = FileUploadService()
+    service.storage = storage
+    await storage.ensure_bucket()
+
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with slots:
+            upload = UploadFile(
+                io.BytesIO(payload),
+                size=len(payload),
+                filename="resume.pdf",
+                headers=Headers({"content-type": "application/pdf"}),
+            )
+            await service.upload_resume(upload, f"lead{i}@bench.test")
+
+    stop = asyncio.Event()
+    lags: list = []
+    ticker = asyncio.create_task(_measure_loop_lag(stop, 0.005, lags))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(uploads)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await ticker
+    await storage.close()
+
+    return {
+        "backend": name,
+        "uploads_per_s": round(uploads / elapsed, 1),
+        "elapsed_s": round(elapsed, 3),
+        "max_loop_lag_ms": round(max(lags, default=0.0) * 1000, 1),
+    }
+
+
+async def main_async(args) -> None:
+    payload = b"x" * int(args.size_kb * 1024)
+    latency = args.latency_ms / 1000
+
+    with tempfile.TemporaryDirectory() as root:
+        backends = [
+            ("minio-inline", InlineMinioStorage(SlowS3Client(latency), "leads", max_workers=args.workers)),
+            ("minio", MinioStorage(SlowS3Client(latency), "leads", max_workers=args.workers)),
+            ("local", LocalFileStorage(root, "leads")),
+            ("memory", InMemoryStorage()),
+        ]
+        results = [
+            await run_backend(name, storage, args.uploads, args.concurrency, payload)
+            for name, storage in backends
+        ]
+
+    print(f"{'backend':<14} {'uploads/s':>10} {'elapsed (s)':>12} {'max loop lag (ms)':>18}")
+    for result in results:
+        print(f"{result['backend']:<14} {result['uploads_per_s']:>10} "
+              f"{result['elapsed_s']:>12} {result['max_loop_lag_ms']:>18}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--size-kb", type=float, default=512)
+    parser.add_argument("--latency-ms", type=float, default=20, help="simulated MinIO round trip")
+    parser.add_argument("--workers", type=int, default=8, help="MinIO storage executor size")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
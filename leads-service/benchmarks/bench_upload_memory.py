@@ -0,0 +1,129 @@
+"""Peak memory of concurrent resume uploads, buffered vs streaming.
+
+Each mode runs in its own interpreter so ru_maxrss is not polluted by the
+other run. Uploads are backed by spooled temp files exactly like Starlette's
+multipart parser produces, and the MinIO client behind MinioStorage is
+replaced by one that consumes the stream the same way Minio.put_object does,
+then discards it.
+
+Usage (from leads-service/):
+    python -m benchmarks.bench_upload_memory --concurrency 50 --size-mb 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks._env import configure_benchmark_env
+
+configure_benchmark_env()
+
+from minio.helpers import read_part_data  # noqa: E402
+from starlette.datastructures import Headers, UploadFile  # noqa: E402
+
+
+class DiscardingS3Client:
+    """Consumes put_object data the way the MinIO client does and throws it away"""
+
+    def __init__(self):
+        self.bytes_received = 0
+
+    def put_object(self, bucket_name, object_name, data, length, content_type=None, part_size=0):
+        if length >= 0:
+            self.bytes_received += len(data.read(length))
+            return
+
+        # Unknown length: the client buffers one part (+1 byte look-ahead) at a time
+        while True:
+            part = read_part_data(data, part_size + 1)
+            self.bytes_received += len(part)
+            if len(part) <= part_size:
+                return
+
+
+def make_upload(size: int, index: int) -> UploadFile:
+    spooled = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    block = os.urandom(64 * 1024)
+    written = 0
+    while written < size:
+        spooled.write(block[: size - written])
+        written += min(len(block), size - written)
+    spooled.seek(0)
+    return UploadFile(
+        spooled,
+        size=size,
+        filename=f"resume-{index}.pdf",
+        headers=Headers({"content-type": "application/pdf"}),
+    )
+
+
+async def run_mode(streaming: bool, concurrency: int, size: int, workers: int) -> dict:
+    from app.services.file_service import FileUploadService
+    from app.storage import MinioStorage
+
+    s3_client = DiscardingS3Client()
+    service = FileUploadService()
+    service.streaming = streaming
+    service.storage = MinioStorage(s3_client, "leads", max_workers=workers)
+
+    uploads = [make_upload(size, i) for i in range(concurrency)]
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        service.upload_resume(upload, f"lead{i}@bench.test") for i, upload in enumerate(uploads)
+    ))
+    elapsed = time.perf_counter() - started
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "mode": "streaming" if streaming else "buffered",
+        "concurrency": concurrency,
+        "file_size_mb": size / (1024 * 1024),
+        "elapsed_s": round(elapsed, 3),
+        "python_heap_peak_mb": round(traced_peak / (1024 * 1024), 1),
+        # Linux reports ru_maxrss in KiB
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "bytes_uploaded": s3_client.bytes_received,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--size-mb", type=float, default=8)
+    parser.add_argument("--workers", type=int, default=8, help="MinIO storage executor size")
+    parser.add_argument("--mode", choices=["buffered", "streaming"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+
+    if args.mode:
+        result = asyncio.run(run_mode(args.mode == "streaming", args.concurrency, size, args.workers))
+        print(json.dumps(result))
+        return
+
+    results = []
+    for mode in ("buffered", "streaming"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_upload_memory", "--mode", mode,
+             "--concurrency", str(args.concurrency), "--size-mb", str(args.size_mb),
+             "--workers", str(args.workers)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'mode':<10} {'peak RSS (MB)':>14} {'heap peak (MB)':>15} {'elapsed (s)':>12}")
+    for result in results:
+        print(f"{result['mode']:<10} {result['peak_rss_mb']:>14} "
+              f"{result['python_heap_peak_mb']:>15} {result['elapsed_s']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Leads service process for bench_e2e: the real app with in-process stand-ins.
+
+Postgres is real (whatever POSTGRES_* points at). Resumes go to the memory
+storage backend and Kafka is replaced by InProcessProducer, which serializes
+each message like the real producer and acknowledges it after --broker-latency-ms.
+Admission control keeps its concurrency limit, but its rate limits default to
+off: every request comes from one load generator, and the test measures capacity.
+
+Usage (normally started by bench_e2e):
+    python -m benchmarks.e2e_server --port 8100
+"""
+import argparse
+import asyncio
+import os
+
+from benchmarks._env import configure_benchmark_env
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("ADMISSION_CLIENT_RATE", "0")
+os.environ.setdefault("ADMISSION_GLOBAL_RATE", "0")
+configure_benchmark_env()
+
+import uvicorn  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.messaging.kafka_client import kafka_client  # noqa: E402
+
+
+class InProcessProducer:
+    """AIOKafkaProducer stand-in that acknowledges every message after a fixed latency"""
+
+    def __init__(self, serialize, latency_s: float):
+        self.serialize = serialize
+        self.latency_s = latency_s
+        self.messages = 0
+
+    async def send(self, topic, value=None, key=None, headers=None):
+        self.serialize(value)
+        self.messages += 1
+        delivery = asyncio.get_running_loop().create_future()
+        asyncio.get_running_loop().call_later(self.latency_s, delivery.set_result, None)
+        return delivery
+
+    async def stop(self):
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--broker-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    # Marked started, so the app's startup keeps this producer instead of connecting to Kafka
+    kafka_client.producer = InProcessProducer(kafka_client._serialize_value, args.broker_latency_ms / 1000)
+    kafka_client.started = True
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
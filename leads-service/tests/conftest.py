@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import Mock, AsyncMock
 from fastapi.testclient import TestClient
 from app.main import app
+from app.core.sql_profiler import sql_profiler
 from app.models.lead import LeadStatus
 from app.schemas.lead import LeadResponse, LeadListResponse
 import uuid
@@ -11,6 +12,11 @@ from datetime import datetime
 def client():
     return TestClient(app)
 
+@pytest.fixture
+def query_budget():
+    """`with query_budget(n):` fails the test if the block issues more than n SQL statements"""
+    return sql_profiler.query_budget
+
 @pytest.fixture
 def mock_db():
     return Mock()
@@ -0,0 +1,173 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.admission import AdmissionControlMiddleware, AdmissionController, TokenBucket, client_address
+from app.main import app
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = dict(
+        max_concurrency=2, max_queue=2, queue_target=0.2, global_rate=0, global_burst=0,
+        client_rate=0, client_burst=0, max_clients=100, retry_after=1
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+class TestTokenBucket:
+
+    def test_allows_burst_then_refills_at_rate(self):
+        """Test the bucket allows a burst, then refills at its rate"""
+        now = [0.0]
+        bucket = TokenBucket(rate=2.0, burst=3, timer=lambda: now[0])
+
+        assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.try_acquire() == pytest.approx(0.5)
+
+        now[0] = 0.5
+        assert bucket.try_acquire() == 0.0
+
+
+class TestAdmissionController:
+
+    @pytest.mark.asyncio
+    async def test_client_rate_limit_is_per_ip(self):
+        """Test one client's limit does not affect another client"""
+        controller = make_controller(max_concurrency=10, client_rate=0.5, client_burst=2)
+
+        assert await controller.admit("10.0.0.1") is None
+        assert await controller.admit("10.0.0.1") is None
+        rejection = await controller.admit("10.0.0.1")
+        assert await controller.admit("10.0.0.2") is None
+
+        assert rejection.status_code == 429
+        assert rejection.outcome == "rate_limited_client"
+        assert rejection.retry_after == 2
+        assert controller.stats()["rate_limited_client"] == 1
+        assert controller.stats()["admitted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_global_rate_limit(self):
+        """Test the global bucket rejects with 429 once empty"""
+        controller = make_controller(max_concurrency=10, global_rate=1, global_burst=1)
+
+        assert await controller.admit("10.0.0.1") is None
+        rejection = await controller.admit("10.0.0.2")
+
+        assert rejection.status_code == 429
+        assert rejection.outcome == "rate_limited_global"
+
+    @pytest.mark.asyncio
+    async def test_waiting_request_gets_released_slot(self):
+        """Test a queued request takes over the slot released by a finished one"""
+        controller = make_controller(max_concurrency=1)
+        assert await controller.admit("a") is None
+
+        waiting = asyncio.create_task(controller.admit("b"))
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 1
+
+        controller.release(0.01)
+        assert await waiting is None
+        assert controller.in_flight == 1
+
+        controller.release(0.01)
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_sheds_after_queue_target(self):
+        """Test a request that waits past the queue target gets 503"""
+        controller = make_controller(max_concurrency=1, queue_target=0.05)
+        await controller.admit("a")
+
+        rejection = await controller.admit("b")
+
+        assert rejection.status_code == 503
+        assert rejection.outcome == "overloaded"
+        assert controller.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_sheds_immediately_when_queue_is_full(self):
+        """Test a request finding the queue full is shed without waiting"""
+        controller = make_controller(max_concurrency=1, max_queue=0, queue_target=5.0)
+        await controller.admit("a")
+
+        rejection = await asyncio.wait_for(controller.admit("b"), 0.5)
+
+        assert rejection.outcome == "overloaded"
+
+    @pytest.mark.asyncio
+    async def test_sheds_immediately_when_expected_wait_exceeds_target(self):
+        """Test a request is shed at once when recent service times predict a long wait"""
+        controller = make_controller(max_concurrency=1, queue_target=0.5)
+        await controller.admit("a")
+        controller.service_time = 2.0
+
+        rejection = await asyncio.wait_for(controller.admit("b"), 0.1)
+
+        assert rejection.outcome == "overloaded"
+
+    def test_forwarded_for_only_when_trusted(self):
+        """Test X-Forwarded-For is used only when proxies are trusted"""
+        scope = {"client": ("10.0.0.9", 1234), "headers": [(b"x-forwarded-for", b"203.0.113.7")]}
+
+        assert client_address(scope, trusted_hops=0) == "10.0.0.9"
+        assert client_address(scope, trusted_hops=1) == "203.0.113.7"
+
+    def test_forwarded_for_ignores_spoofed_leading_entries(self):
+        """Test entries left of the trusted proxies' hops are ignored"""
+        # The client forged "1.2.3.4"; the CDN appended the client (203.0.113.7), the load balancer the CDN
+        scope = {"client": ("10.0.0.9", 1234), "headers": [
+            (b"x-forwarded-for", b"1.2.3.4, 203.0.113.7"),
+            (b"x-forwarded-for", b"198.51.100.2"),
+        ]}
+
+        assert client_address(scope, trusted_hops=1) == "198.51.100.2"
+        assert client_address(scope, trusted_hops=2) == "203.0.113.7"
+        # Fewer entries than trusted proxies means the header didn't come through them
+        assert client_address(scope, trusted_hops=4) == "10.0.0.9"
+
+
+class TestAdmissionControlMiddleware:
+
+    def setup_method(self):
+        self.controller = make_controller(max_concurrency=10, client_rate=0.01, client_burst=1)
+        guarded = FastAPI()
+
+        @guarded.post("/leads")
+        async def create():
+            return {"created": True}
+
+        @guarded.get("/leads")
+        async def listing():
+            return []
+
+        guarded.add_middleware(AdmissionControlMiddleware, controller=self.controller, routes=[("POST", "/leads")])
+        self.client = TestClient(guarded)
+
+    def test_rejects_with_retry_after(self):
+        """Test a rate-limited submission gets 429 with Retry-After and holds no slot"""
+        assert self.client.post("/leads").status_code == 200
+        response = self.client.post("/leads")
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.json()["error"] == "Request rejected"
+        assert self.controller.in_flight == 0
+
+    def test_unguarded_routes_pass_through(self):
+        """Test routes outside the guarded list skip admission"""
+        for _ in range(3):
+            assert self.client.get("/leads").status_code == 200
+        assert self.controller.stats()["admitted"] == 0
+
+    @patch('app.main.admission_controller')
+    def test_counters_in_diagnostics(self, mock_controller):
+        """Test admission counters are reported in /diagnostics"""
+        mock_controller.stats.return_value = {"admitted": 5, "overloaded": 1}
+
+        response = TestClient(app).get("/diagnostics")
+
+        assert response.json()["admission"] == {"admitted": 5, "overloaded": 1}
@@ -0,0 +1,122 @@
+import asyncio
+import io
+import threading
+import pytest
+from unittest.mock import Mock, AsyncMock
+from fastapi import HTTPException
+from app.services.file_service import FileUploadService, SizeLimitedReader
+from app.storage import InMemoryStorage, LocalFileStorage, StorageError
+
+
+class TestFileUploadService:
+
+    def setup_method(self):
+        self.service = FileUploadService()
+        self.service.storage = InMemoryStorage()
+        self.service.max_file_size = 1024
+        self.service.chunk_size = 256
+
+    def _upload(self, content: bytes, size=None):
+        file = Mock()
+        file.filename = "resume.pdf"
+        file.content_type = "application/pdf"
+        file.size = size
+        file.file = io.BytesIO(content)
+        file.read = AsyncMock(return_value=content)
+        file.seek = AsyncMock()
+        return file
+
+    @pytest.mark.asyncio
+    async def test_streaming_upload_stores_file(self):
+        """Test streaming mode stores the file without reading it into memory up front"""
+        file = self._upload(b"x" * 512, size=512)
+
+        path = await self.service.upload_resume(file, "john@test.com")
+
+        assert path == "john@test.com/resume/resume.pdf"
+        assert await self.service.storage.get_object(path) == b"x" * 512
+        file.read.assert_not_awaited()
+
+    def test_resume_path_is_unique_per_lead(self):
+        """Test resumes of different leads with the same email and filename get different keys"""
+        first = self.service.resume_path("john@test.com", "resume.pdf", lead_id="a1")
+        second = self.service.resume_path("john@test.com", "resume.pdf", lead_id="b2")
+
+        assert first == "john@test.com/resume/a1/resume.pdf"
+        assert first != second
+
+    @pytest.mark.asyncio
+    async def test_streaming_upload_rejects_declared_oversize_before_reading(self):
+        """Test oversized uploads are rejected from the declared size alone"""
+        file = self._upload(b"", size=4096)
+
+        with pytest.raises(HTTPException) as exc:
+            await self.service.upload_resume(file, "john@test.com")
+
+        assert exc.value.status_code == 400
+        assert self.service.storage.objects == {}
+
+    def test_reader_aborts_once_limit_is_crossed(self):
+        """Test the reader stops after the first chunk past the limit"""
+        source = io.BytesIO(b"x" * 10_000)
+        reader = SizeLimitedReader(source, max_size=1024, chunk_size=256)
+
+        with pytest.raises(HTTPException):
+            while reader.read(5 * 1024 * 1024):
+                pass
+
+        assert reader.bytes_read <= 1024 + 256
+
+    @pytest.mark.asyncio
+    async def test_streaming_upload_rejects_undeclared_oversize(self):
+        """Test oversized uploads without a declared size are aborted while streaming"""
+        file = self._upload(b"x" * 4096)
+
+        with pytest.raises(HTTPException) as exc:
+            await self.service.upload_resume(file, "john@test.com")
+
+        assert exc.value.status_code == 400
+        assert self.service.storage.objects == {}
+
+
+class TestLocalFileStorage:
+
+    @pytest.mark.asyncio
+    async def test_round_trip(self, tmp_path):
+        """Test objects written to disk can be read back and removed"""
+        storage = LocalFileStorage(str(tmp_path), "leads")
+        await storage.put_object("john@test.com/resume/cv.pdf", io.BytesIO(b"pdf"), length=-1)
+
+        assert await storage.get_object("john@test.com/resume/cv.pdf") == b"pdf"
+        await storage.remove_object("john@test.com/resume/cv.pdf")
+        with pytest.raises(StorageError):
+            await storage.get_object("john@test.com/resume/cv.pdf")
+
+    @pytest.mark.asyncio
+    async def test_rejects_paths_outside_bucket(self, tmp_path):
+        """Test object names cannot escape the bucket directory"""
+        storage = LocalFileStorage(str(tmp_path), "leads")
+
+        with pytest.raises(StorageError):
+            await storage.put_object("../outside.pdf", io.BytesIO(b"pdf"), length=3)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_to_one_key_do_not_collide(self, tmp_path):
+        """Test overlapping puts of the same object each use their own temp file"""
+        storage = LocalFileStorage(str(tmp_path), "leads")
+        both_writing = threading.Barrier(2, timeout=5)
+
+        class OverlappingReader(io.BytesIO):
+            def read(self, size=-1):
+                chunk = super().read(size)
+                if chunk:
+                    both_writing.wait()
+                return chunk
+
+        await asyncio.gather(*(
+            storage.put_object("john@test.com/resume/cv.pdf", OverlappingReader(body), length=len(body))
+            for body in (b"first", b"second")
+        ))
+
+        assert await storage.get_object("john@test.com/resume/cv.pdf") in (b"first", b"second")
+        assert [p.name for p in (tmp_path / "leads" / "john@test.com" / "resume").iterdir()] == ["cv.pdf"]
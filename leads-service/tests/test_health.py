@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from app.core.health import HealthProber
+
+
+class TestHealthProber:
+
+    def setup_method(self):
+        self.prober = HealthProber(interval=10.0, timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_first_round(self):
+        """Test readiness stays false until every critical check has run once"""
+        self.prober.register("postgres", AsyncMock(return_value=None))
+
+        assert not self.prober.ready()
+        assert self.prober.snapshot()["checks"]["postgres"]["healthy"] is None
+
+        await self.prober.probe_all()
+
+        assert self.prober.ready()
+        check = self.prober.snapshot()["checks"]["postgres"]
+        assert check["healthy"] is True
+        assert check["latency_ms"] is not None
+        assert check["stale"] is False
+
+    @pytest.mark.asyncio
+    async def test_failures_and_timeouts_fail_readiness(self):
+        """Test errors and timed-out checks are recorded and fail readiness"""
+        async def hang():
+            await asyncio.sleep(60)
+
+        self.prober.register("postgres", AsyncMock(side_effect=ConnectionError("pool exhausted")))
+        self.prober.register("storage", hang)
+
+        await self.prober.probe_all()
+
+        checks = self.prober.snapshot()["checks"]
+        assert not self.prober.ready()
+        assert checks["postgres"]["error"] == "pool exhausted"
+        assert checks["storage"]["error"] == "timed out after 0.1s"
+        await self.prober.stop()
+
+    @pytest.mark.asyncio
+    async def test_stuck_check_is_not_started_twice(self):
+        """Test a check still running from the last round is not started again"""
+        release = asyncio.Event()
+        calls = 0
+
+        async def stuck():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+
+        self.prober.register("storage", stuck)
+        await self.prober.probe_all()
+        await self.prober.probe_all()
+
+        assert calls == 1
+        assert self.prober.snapshot()["checks"]["storage"]["error"] == "previous check still running"
+
+        release.set()
+        await asyncio.sleep(0)
+        await self.prober.probe_all()
+        assert calls == 2
+        assert self.prober.ready()
+
+    @pytest.mark.asyncio
+    async def test_non_critical_checks_do_not_gate_readiness(self):
+        """Test a failing non-critical check is reported but the service stays ready"""
+        self.prober.register("postgres", AsyncMock(return_value=True))
+        self.prober.register("kafka", AsyncMock(return_value=False), critical=False)
+
+        await self.prober.probe_all()
+
+        assert self.prober.ready()
+        assert self.prober.snapshot()["checks"]["kafka"]["healthy"] is False
+
+    @pytest.mark.asyncio
+    async def test_stale_results_fail_readiness(self):
+        """Test results older than a few rounds count as failed"""
+        self.prober.register("postgres", AsyncMock(return_value=True))
+        await self.prober.probe_all()
+
+        with patch('app.core.health.time.monotonic', return_value=self.prober._results["postgres"]["checked_at"] + 60):
+            assert not self.prober.ready()
+            assert self.prober.snapshot()["checks"]["postgres"]["stale"] is True
+
+    @pytest.mark.asyncio
+    async def test_check_with_its_own_interval_runs_less_often(self):
+        """Test a check with its own interval is skipped until that interval elapses"""
+        postgres = AsyncMock(return_value=True)
+        smtp = AsyncMock(return_value=True)
+        self.prober.register("postgres", postgres)
+        self.prober.register("smtp", smtp, critical=False, interval=300.0)
+
+        await self.prober.probe_due()
+        started = self.prober._last_probe["smtp"]
+        with patch('app.core.health.time.monotonic', return_value=started + 10.0):
+            await self.prober.probe_due()
+            # Fresh for three of its own rounds, not three of the prober's
+            assert self.prober.snapshot()["checks"]["smtp"]["stale"] is False
+        with patch('app.core.health.time.monotonic', return_value=started + 300.0):
+            await self.prober.probe_due()
+
+        assert postgres.await_count == 3
+        assert smtp.await_count == 2
+
+
+class TestHealthEndpoints:
+
+    def test_liveness(self, client):
+        """Test GET /health/live answers without touching dependencies"""
+        response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+
+    @patch('app.main.health_prober')
+    def test_readiness_serves_cached_results(self, mock_prober, client):
+        """Test GET /health/ready returns 503 from cached results without probing"""
+        mock_prober.snapshot.return_value = {
+            "ready": False,
+            "checks": {"postgres": {"healthy": False, "critical": True, "latency_ms": 2000.0, "error": "timed out after 2.0s"}}
+        }
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "not_ready"
+        assert response.json()["checks"]["postgres"]["error"] == "timed out after 2.0s"
+        mock_prober.probe_all.assert_not_called()
+
+    @patch('app.main.health_prober')
+    def test_health_reports_probed_state(self, mock_prober, client):
+        """Test GET /health maps cached check results to service states"""
+        mock_prober.snapshot.return_value = {
+            "ready": True,
+            "checks": {
+                "postgres": {"healthy": True},
+                "storage": {"healthy": True},
+                "kafka": {"healthy": False},
+            }
+        }
+
+        response = client.get("/health")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "degraded"
+        assert response.json()["services"]["postgres"] == "connected"
+        assert response.json()["services"]["kafka"] == "disconnected"
@@ -0,0 +1,39 @@
+import json
+import uuid
+from datetime import datetime
+from app.schemas.events import LeadCreatedEvent
+from app.schemas.lead import LeadResponse, LeadStatus
+from app.utils import dumps, dumps_str, loads
+
+
+class TestJsonUtils:
+
+    def setup_method(self):
+        self.lead = LeadResponse(
+            id=uuid.uuid4(),
+            first_name="Ada",
+            last_name="Lovelace",
+            email="ada@example.com",
+            resume_path="ada@example.com/resume/cv.pdf",
+            status=LeadStatus.PENDING,
+            created_at=datetime(2024, 5, 1, 12, 30, 15, 123456),
+            updated_at=datetime(2024, 5, 1, 12, 30, 15)
+        )
+
+    def test_dumps_encodes_uuid_datetime_and_enum(self):
+        """Test native types are encoded the same way str() and isoformat() would"""
+        data = loads(dumps(self.lead.model_dump()))
+
+        assert data["id"] == str(self.lead.id)
+        assert data["created_at"] == self.lead.created_at.isoformat()
+        assert data["updated_at"] == self.lead.updated_at.isoformat()
+        assert data["status"] == LeadStatus.PENDING.value
+
+    def test_event_payload_matches_stdlib_output(self):
+        """Test the Kafka payload decodes to what the old make_json_safe + json.dumps path produced"""
+        event = LeadCreatedEvent.from_lead_response(self.lead, event_id="evt-1")
+        message = event.to_kafka_message(topic="new_leads")
+
+        expected = json.loads(event.model_dump_json())
+        assert loads(dumps(message.value)) == expected
+        assert json.loads(dumps_str(message.value)) == expected
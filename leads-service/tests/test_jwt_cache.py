@@ -0,0 +1,58 @@
+import pytest
+import time
+from jose import jwt
+from unittest.mock import patch
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+from app.authentication import jwt as jwt_auth
+from app.authentication.jwt import create_access_token, get_current_user, flush_token_cache, token_cache
+from app.core.config import settings
+
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+
+class TestJWTCache:
+
+    def setup_method(self):
+        flush_token_cache()
+        self.hits = token_cache.hits
+        self.misses = token_cache.misses
+
+    def test_second_request_is_served_from_cache(self):
+        """Test a verified token is not decoded again"""
+        token = create_access_token({"sub": "attorney@test.com", "role": "attorney"})
+
+        first = get_current_user(_credentials(token))
+        with patch.object(jwt_auth.jwt, "decode", side_effect=AssertionError("decoded twice")):
+            second = get_current_user(_credentials(token))
+
+        assert first == second == {"username": "attorney@test.com", "role": "attorney"}
+        assert token_cache.hits == self.hits + 1
+        assert token_cache.misses == self.misses + 1
+
+    def test_expired_token_is_not_cached(self):
+        """Test a token past its exp is rejected and never cached"""
+        token = jwt.encode(
+            {"sub": "client@test.com", "role": "client", "exp": int(time.time()) - 1},
+            settings.SECRET_KEY, algorithm=settings.ALGORITHM
+        )
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_user(_credentials(token))
+
+        assert exc_info.value.status_code == 401
+        assert len(token_cache) == 0
+
+    def test_secret_rotation_flushes_cache(self):
+        """Test tokens signed with a rotated-out key are verified again and rejected"""
+        token = create_access_token({"sub": "attorney@test.com", "role": "attorney"})
+        get_current_user(_credentials(token))
+
+        with patch.object(settings, "SECRET_KEY", "rotated-secret"):
+            with pytest.raises(HTTPException) as exc_info:
+                get_current_user(_credentials(token))
+
+        assert exc_info.value.status_code == 401
+        flush_token_cache()
@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from prometheus_client import REGISTRY
+from app.messaging.kafka_client import KafkaClient
+from app.schemas.events import KafkaMessage
+
+
+class FakeProducer:
+    """Producer stand-in whose delivery futures the test resolves"""
+
+    def __init__(self):
+        self.sent = []
+        self.deliveries = []
+
+    async def send(self, topic, value=None, key=None, headers=None):
+        self.sent.append((topic, value, key, headers))
+        delivery = asyncio.get_running_loop().create_future()
+        self.deliveries.append(delivery)
+        return delivery
+
+
+class TestKafkaClient:
+
+    def setup_method(self):
+        self.client = KafkaClient()
+        self.producer = FakeProducer()
+        self.client.producer = self.producer
+        self.client.started = True
+
+    @pytest.mark.asyncio
+    async def test_send_message_passes_key_and_headers(self):
+        """Test key and headers reach the producer"""
+        task = asyncio.create_task(
+            self.client.send_message("new_leads", {"a": 1}, key="lead-1", headers={"event_type": "lead.created"})
+        )
+        await asyncio.sleep(0)
+        self.producer.deliveries[0].set_result(None)
+
+        assert await task is True
+        assert self.producer.sent == [("new_leads", {"a": 1}, "lead-1", [("event_type", b"lead.created")])]
+        assert self.client.metrics.sent == 1
+
+    @pytest.mark.asyncio
+    async def test_throughput_mode_does_not_wait_for_delivery(self):
+        """Test fire-and-forget sends return once buffered and are tracked as in flight"""
+        with patch('app.messaging.kafka_client.settings') as mock_settings:
+            mock_settings.KAFKA_PRODUCER_MODE = "throughput"
+            assert await self.client.send_message("new_leads", {"a": 1}) is True
+
+        assert self.client.metrics.in_flight == 1
+        self.producer.deliveries[0].set_exception(RuntimeError("broker down"))
+        await asyncio.sleep(0)
+        assert self.client.metrics.in_flight == 0
+        assert self.client.metrics.failed == 1
+
+    @pytest.mark.asyncio
+    async def test_send_batch_reports_each_delivery(self):
+        """Test send_batch buffers the whole batch before waiting and reports per message"""
+        published = REGISTRY.get_sample_value("leads_kafka_publish_duration_seconds_count", {"topic": "new_leads"}) or 0
+        failures = REGISTRY.get_sample_value("leads_kafka_publish_failures_total", {"topic": "new_leads"}) or 0
+        messages = [KafkaMessage(topic="new_leads", key=str(i), value={"i": i}) for i in range(3)]
+        task = asyncio.create_task(self.client.send_batch(messages))
+        await asyncio.sleep(0)
+
+        assert len(self.producer.sent) == 3
+        self.producer.deliveries[0].set_result(None)
+        self.producer.deliveries[1].set_exception(RuntimeError("broker down"))
+        self.producer.deliveries[2].set_result(None)
+
+        assert await task == [True, False, True]
+        assert self.client.metrics.batch_sizes.snapshot()["count"] == 1
+        assert REGISTRY.get_sample_value("leads_kafka_publish_duration_seconds_count", {"topic": "new_leads"}) == published + 2
+        assert REGISTRY.get_sample_value("leads_kafka_publish_failures_total", {"topic": "new_leads"}) == failures + 1
+
+    @pytest.mark.asyncio
+    async def test_send_batch_without_producer(self):
+        """Test every message fails when Kafka is unavailable"""
+        self.client.started = False
+        with patch.object(KafkaClient, 'start'):
+            assert await self.client.send_batch([KafkaMessage(topic="t", value={})]) == [False]
@@ -3,6 +3,7 @@ from unittest.mock import patch, Mock
 from fastapi import HTTPException
 from app.schemas.lead import LeadListResponse
 from app.models.lead import LeadStatus
+import uuid
 
 class TestLeadAPI:
     
@@ -161,3 +162,46 @@ class TestLeadAPI:
             assert response.status_code == 422  # Validation error
         finally:
             client.app.dependency_overrides.clear()
+
+    def test_bulk_update_lead_status_requires_one_key_list(self, client):
+        """Test PATCH /leads/status/bulk rejects requests with both or neither of emails and ids"""
+        from app.authentication.jwt import require_attorney
+
+        client.app.dependency_overrides[require_attorney] = lambda: {"username": "attorney1", "role": "attorney"}
+
+        try:
+            response = client.patch("/api/v1/leads/status/bulk",
+                headers={"Authorization": "Bearer attorney_token"},
+                json={"emails": ["john@test.com"], "ids": [str(uuid.uuid4())], "status": "REACHED_OUT"}
+            )
+
+            assert response.status_code == 422
+        finally:
+            client.app.dependency_overrides.clear()
+
+    @patch('app.api.v1.endpoints.leads.lead_service.get_lead_by_id')
+    def test_get_lead_conditional_requests(self, mock_get_lead, client, sample_lead_response):
+        """Test GET /leads/{id} sends validators and answers matching conditionals with 304"""
+        from app.authentication.jwt import get_current_user
+
+        client.app.dependency_overrides[get_current_user] = lambda: {"username": "attorney1", "role": "attorney"}
+        mock_get_lead.return_value = sample_lead_response
+        url = f"/api/v1/leads/{sample_lead_response.id}"
+
+        try:
+            first = client.get(url)
+            etag = first.headers["ETag"]
+            by_etag = client.get(url, headers={"If-None-Match": etag})
+            stale = client.get(url, headers={"If-None-Match": '"other"'})
+            by_date = client.get(url, headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        finally:
+            client.app.dependency_overrides.clear()
+
+        assert first.status_code == 200
+        assert first.json()["id"] == str(sample_lead_response.id)
+        assert "Last-Modified" not in first.headers
+        assert by_etag.status_code == 304 and by_etag.content == b""
+        assert by_etag.headers["ETag"] == etag
+        assert stale.status_code == 200
+        # A date can't vouch for a presigned URL that may have expired, so it is ignored
+        assert by_date.status_code == 200
@@ -0,0 +1,52 @@
+import pytest
+from unittest.mock import patch, AsyncMock, MagicMock
+from app.services.lead_count_compactor import LeadCountCompactor
+
+
+def _session_factory(session):
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=context)
+
+
+class TestLeadCountCompactor:
+
+    def setup_method(self):
+        self.compactor = LeadCountCompactor()
+
+    @patch('app.services.lead_count_compactor.lead_crud')
+    @pytest.mark.asyncio
+    async def test_compacts_on_a_primary_session(self, mock_crud):
+        """Test a round folds the deltas through a primary session and counts it"""
+        primary = MagicMock()
+        mock_crud.compact_counts = AsyncMock()
+
+        with patch('app.services.lead_count_compactor.AsyncPostgresSessionLocal', _session_factory(primary)):
+            await self.compactor.compact()
+
+        mock_crud.compact_counts.assert_awaited_once_with(primary)
+        assert self.compactor.stats() == {"running": False, "compactions": 1, "failed": 0}
+
+    @patch('app.services.lead_count_compactor.lead_crud')
+    @pytest.mark.asyncio
+    async def test_failed_round_is_counted_not_raised(self, mock_crud):
+        """Test a database error doesn't end the loop"""
+        mock_crud.compact_counts = AsyncMock(side_effect=ConnectionError("primary down"))
+
+        with patch('app.services.lead_count_compactor.AsyncPostgresSessionLocal', _session_factory(MagicMock())):
+            await self.compactor.compact()
+
+        assert self.compactor.failed == 1
+        assert self.compactor.compactions == 0
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        """Test the loop starts once and stops cleanly"""
+        with patch.object(self.compactor, "compact", AsyncMock()) as mock_compact:
+            await self.compactor.start()
+            await self.compactor.start()
+            await self.compactor.stop()
+
+        assert mock_compact.await_count <= 1
+        assert not self.compactor.started
@@ -0,0 +1,115 @@
+import pytest
+import uuid
+from unittest.mock import AsyncMock, Mock
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from app.core.config import Settings
+from app.crud.lead import CRUDLead, EXACT_COUNT_BELOW
+from app.models.lead import Lead
+from app.schemas.lead import CountStrategy, LeadCreate
+
+
+class TestLeadCount:
+
+    def setup_method(self):
+        self.crud = CRUDLead(Lead)
+        self.db = Mock()
+
+    @pytest.mark.asyncio
+    async def test_cached_count_reuses_exact_count(self):
+        """Test cached strategy counts once and flags reused totals as estimates"""
+        self.db.scalar = AsyncMock(return_value=42)
+
+        first = await self.crud.count(self.db, CountStrategy.CACHED)
+        second = await self.crud.count(self.db, CountStrategy.CACHED)
+
+        assert first == (42, False)
+        assert second == (42, True)
+        self.db.scalar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_estimate_uses_reltuples_for_large_tables(self):
+        """Test estimate strategy returns the planner estimate without counting"""
+        self.db.scalar = AsyncMock(return_value=2_500_000)
+
+        assert await self.crud.count(self.db, CountStrategy.ESTIMATE) == (2_500_000, True)
+        self.db.scalar.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_estimate_falls_back_to_exact_for_small_or_unanalyzed_tables(self):
+        """Test estimate strategy counts exactly when reltuples is unreliable"""
+        self.db.scalar = AsyncMock(side_effect=[-1, 17])
+
+        assert await self.crud.count(self.db, CountStrategy.ESTIMATE) == (17, False)
+        assert EXACT_COUNT_BELOW > 17
+
+    def test_unknown_default_strategy_is_rejected_at_startup(self):
+        """Test a misspelt LEADS_COUNT_STRATEGY fails settings validation instead of every listing"""
+        assert Settings(LEADS_COUNT_STRATEGY="estimate").LEADS_COUNT_STRATEGY is CountStrategy.ESTIMATE
+        with pytest.raises(ValidationError):
+            Settings(LEADS_COUNT_STRATEGY="countr")
+
+
+class TestCRUDWrites:
+
+    def setup_method(self):
+        self.crud = CRUDLead(Lead)
+        self.db = Mock()
+        self.db.scalar = AsyncMock(return_value=Mock())
+        self.db.commit = AsyncMock()
+
+    def _sql(self):
+        stmt = self.db.scalar.await_args[0][0]
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_create_is_one_insert_returning(self):
+        """Test create issues a single INSERT ... RETURNING and leaves the commit to the caller"""
+        lead_in = LeadCreate(id=uuid.uuid4(), first_name="Ada", last_name="Lovelace", email="ada@test.com",
+                             resume_path="ada@test.com/resume/cv.pdf")
+
+        await self.crud.create(self.db, obj_in=lead_in, commit=False)
+
+        sql = self._sql()
+        assert sql.startswith("INSERT INTO alma_lead_service.leads")
+        assert "RETURNING" in sql
+        self.db.scalar.assert_awaited_once()
+        self.db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_update_by_id_checks_and_bumps_version(self):
+        """Test update_by_id is one UPDATE ... RETURNING guarded by the expected version"""
+        await self.crud.update_by_id(self.db, id=uuid.uuid4(), obj_in={"first_name": "Ada", "bogus": 1},
+                                     expected_version=4)
+
+        sql = self._sql()
+        assert sql.startswith("UPDATE alma_lead_service.leads SET first_name=")
+        assert "version=(alma_lead_service.leads.version + " in sql
+        assert "alma_lead_service.leads.version = " in sql
+        assert "bogus" not in sql
+        assert "RETURNING" in sql
+        self.db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_empty_update_still_checks_expected_version(self):
+        """Test an update with no changed columns only returns the row if its version matches"""
+        self.db.scalar = AsyncMock(return_value=None)
+
+        result = await self.crud.update_by_id(self.db, id=uuid.uuid4(), obj_in={"bogus": 1}, expected_version=4)
+
+        sql = self._sql()
+        assert result is None
+        assert sql.startswith("SELECT")
+        assert "alma_lead_service.leads.version = " in sql
+        self.db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_create_if_email_absent_conflicts_on_lowercased_email(self):
+        """Test duplicate detection is left to the case-insensitive unique index"""
+        lead_in = LeadCreate(id=uuid.uuid4(), first_name="Ada", last_name="Lovelace", email="Ada@test.com",
+                             resume_path="Ada@test.com/resume/cv.pdf")
+
+        await self.crud.create_if_email_absent(self.db, obj_in=lead_in)
+
+        assert "ON CONFLICT (lower(email)) DO NOTHING RETURNING" in self._sql()
+        self.db.commit.assert_not_awaited()
@@ -0,0 +1,156 @@
+import io
+import zipfile
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, Mock
+from app.models.lead import LeadStatus
+from app.schemas.lead import LeadImportRowStatus
+from app.services.lead_import_service import LeadImportService, LeadImportJob
+from app.storage import InMemoryStorage
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def _inserted(db, rows):
+    return [
+        SimpleNamespace(
+            id=row["id"], first_name=row["first_name"], last_name=row["last_name"], email=row["email"],
+            resume_path=row["resume_path"], resume_url=None, status=LeadStatus.PENDING,
+            created_at=datetime.now(), updated_at=None
+        )
+        for row in rows
+    ]
+
+
+class TestLeadImportService:
+
+    def setup_method(self):
+        self.service = LeadImportService()
+        self.storage = InMemoryStorage()
+        self.service.file_service.storage = self.storage
+        self.db = Mock()
+        self.db.commit = AsyncMock()
+        self.db.rollback = AsyncMock()
+
+    def test_parse_csv_and_ndjson(self):
+        """Test both formats produce rows with normalized field names"""
+        csv_rows = LeadImportService.parse_rows(
+            b"First_Name,last_name,email\nAda,Lovelace,ada@test.com\n", "leads.csv", "text/csv"
+        )
+        ndjson_rows = LeadImportService.parse_rows(
+            b'{"first_name": "Ada", "last_name": "Lovelace", "email": "ada@test.com"}\n\nnot json\n',
+            "leads.ndjson", "application/x-ndjson"
+        )
+
+        assert csv_rows[0].fields == {"first_name": "Ada", "last_name": "Lovelace", "email": "ada@test.com"}
+        assert ndjson_rows[0].fields["email"] == "ada@test.com"
+        assert ndjson_rows[1].result.status == LeadImportRowStatus.INVALID
+
+    @patch('app.services.lead_import_service.outbox_relay')
+    @patch('app.services.lead_import_service.event_publisher')
+    @patch('app.services.lead_import_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_import_reports_every_row(self, mock_crud, mock_publisher, mock_relay):
+        """Test invalid, duplicate and new rows are reported and only new rows are inserted"""
+        content = (
+            b"first_name,last_name,email,resume\n"
+            b"Ada,Lovelace,ada@test.com,cv/ada.pdf\n"
+            b"Alan,Turing,alan@test.com,\n"
+            b"Grace,Hopper,not-an-email,\n"
+            b"Ada,Again,ada@test.com,\n"
+            b"Old,Lead,old@test.com,\n"
+            b"Missing,Resume,missing@test.com,nope.pdf\n"
+        )
+        job = LeadImportJob(
+            LeadImportService.parse_rows(content, "leads.csv", "text/csv"),
+            _zip({"cv/ada.pdf": b"%PDF ada"})
+        )
+        mock_crud.get_existing_emails = AsyncMock(return_value={"old@test.com"})
+        mock_crud.bulk_insert = AsyncMock(side_effect=_inserted)
+
+        report = await self.service.run(self.db, job)
+
+        statuses = [row.status for row in report.rows]
+        assert statuses == [
+            LeadImportRowStatus.CREATED,
+            LeadImportRowStatus.CREATED,
+            LeadImportRowStatus.INVALID,
+            LeadImportRowStatus.DUPLICATE,
+            LeadImportRowStatus.DUPLICATE,
+            LeadImportRowStatus.INVALID,
+        ]
+        assert (report.created, report.duplicates, report.invalid, report.failed) == (2, 2, 2, 0)
+
+        inserted_rows = mock_crud.bulk_insert.await_args[0][1]
+        assert [row["email"] for row in inserted_rows] == ["ada@test.com", "alan@test.com"]
+        resume_path = f"ada@test.com/resume/{inserted_rows[0]['id']}/ada.pdf"
+        assert inserted_rows[0]["resume_path"] == resume_path
+        assert inserted_rows[1]["resume_path"] == ""
+        assert self.storage.objects[resume_path] == (b"%PDF ada", "application/pdf")
+        assert mock_publisher.enqueue_lead_created.call_count == 2
+        self.db.commit.assert_awaited_once()
+        mock_relay.notify.assert_called_once()
+
+    @patch('app.services.lead_import_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_failed_insert_removes_uploaded_resumes(self, mock_crud):
+        """Test a failed COPY rolls back and cleans up the resumes uploaded for it"""
+        job = LeadImportJob(
+            LeadImportService.parse_rows(
+                b'{"first_name": "Ada", "last_name": "Lovelace", "email": "ada@test.com", "resume": "ada.pdf"}',
+                "leads.ndjson", ""
+            ),
+            _zip({"ada.pdf": b"%PDF"})
+        )
+        mock_crud.get_existing_emails = AsyncMock(return_value=set())
+        mock_crud.bulk_insert = AsyncMock(side_effect=RuntimeError("copy failed"))
+
+        report = await self.service.run(self.db, job)
+
+        assert report.failed == 1
+        assert self.storage.objects == {}
+        self.db.rollback.assert_awaited_once()
+
+    @patch('app.services.lead_import_service.outbox_relay')
+    @patch('app.services.lead_import_service.event_publisher')
+    @patch('app.services.lead_import_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_rows_lost_to_a_concurrent_insert_remove_their_resumes(self, mock_crud, mock_publisher, mock_relay):
+        """Test rows skipped by ON CONFLICT are reported as duplicates and their resumes removed"""
+        job = LeadImportJob(
+            LeadImportService.parse_rows(
+                b"first_name,last_name,email,resume\n"
+                b"Ada,Lovelace,ada@test.com,ada.pdf\n"
+                b"Alan,Turing,alan@test.com,alan.pdf\n",
+                "leads.csv", "text/csv"
+            ),
+            _zip({"ada.pdf": b"%PDF ada", "alan.pdf": b"%PDF alan"})
+        )
+        mock_crud.get_existing_emails = AsyncMock(return_value=set())
+        mock_crud.bulk_insert = AsyncMock(side_effect=lambda db, rows: _inserted(db, rows[:1]))
+
+        report = await self.service.run(self.db, job)
+
+        assert [row.status for row in report.rows] == [LeadImportRowStatus.CREATED, LeadImportRowStatus.DUPLICATE]
+        kept = mock_crud.bulk_insert.await_args[0][1][0]
+        assert list(self.storage.objects) == [kept["resume_path"]]
+
+    @patch('app.services.lead_import_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_import_leads_yields_progress_then_report(self, mock_crud):
+        """Test progress stages are reported in order, ending with the report"""
+        job = LeadImportJob(LeadImportService.parse_rows(b'{"email": "bad"}', "leads.ndjson", ""))
+        mock_crud.get_existing_emails = AsyncMock(return_value=set())
+
+        stages = [progress["stage"] async for progress in self.service.import_leads(self.db, job)]
+
+        assert stages == ["validated", "deduplicated", "inserted", "done"]
+        mock_crud.get_existing_emails.assert_awaited_once_with(self.db, [])
@@ -1,9 +1,11 @@
 import pytest
 from unittest.mock import patch, AsyncMock, Mock
 from app.services.lead_service import LeadService
+from app.services.lead_cache import LeadCache
 from fastapi import HTTPException
-from app.schemas.lead import LeadResponse
+from app.schemas.lead import LeadResponse, LeadBulkStatusUpdateRequest
 from app.models.lead import LeadStatus
+from app.utils import encode_cursor, decode_cursor
 import uuid
 from datetime import datetime
 import logging
@@ -17,33 +19,126 @@ class TestLeadService:
     @patch('app.services.lead_service.FileUploadService')
     @pytest.mark.asyncio
     async def test_create_lead_success(self, mock_file_service_class, mock_crud, mock_db, mock_file):
-        """Test service creates lead successfully"""
+        """Test service reserves the email, then uploads and commits"""
         mock_file_service = Mock()
-        mock_file_service.upload_resume = AsyncMock(return_value="path/resume.pdf")
+        mock_file_service.resume_path = Mock(return_value="john@test.com/resume/resume.pdf")
+        mock_file_service.upload_resume = AsyncMock(return_value="john@test.com/resume/resume.pdf")
         mock_file_service_class.return_value = mock_file_service
         
-        # Mock get_by_email to return None (no existing lead)
-        mock_crud.get_by_email.return_value = None
-        
         mock_lead_response = LeadResponse(
             id=uuid.uuid4(),
             first_name="John",
             last_name="Doe",
             email="john@test.com",
-            resume_path="path/resume.pdf",
+            resume_path="john@test.com/resume/resume.pdf",
             status=LeadStatus.PENDING,
             created_at=datetime.now()
         )
-        mock_crud.create.return_value = mock_lead_response
+        mock_crud.create_if_email_absent = AsyncMock(return_value=mock_lead_response)
+        mock_crud.get_by_email = AsyncMock()
+        mock_db.commit = AsyncMock()
         
         with patch.object(LeadResponse, 'from_orm', return_value=mock_lead_response):
-            with patch.object(self.service, '_generate_resume_url', return_value="http://test-url"):
-                with patch.object(self.service, '_publish_lead_created_event', new_callable=AsyncMock):
+            with patch.object(LeadService, '_generate_resume_url', return_value="http://test-url"):
+                with patch.object(LeadService, '_enqueue_lead_created_event') as mock_enqueue:
                     service = LeadService()
                     result = await service.create_lead("John", "Doe", "john@test.com", mock_file, mock_db)
         
         assert result.first_name == "John"
-        mock_crud.create.assert_called_once()
+        mock_crud.create_if_email_absent.assert_awaited_once()
+        assert mock_crud.create_if_email_absent.await_args.kwargs["obj_in"].resume_path == "john@test.com/resume/resume.pdf"
+        mock_crud.get_by_email.assert_not_awaited()
+        mock_file_service.upload_resume.assert_awaited_once_with(
+            mock_file, "john@test.com", resume_path="john@test.com/resume/resume.pdf"
+        )
+        mock_enqueue.assert_called_once_with(mock_db, mock_lead_response)
+        mock_db.commit.assert_awaited_once()
+
+    @patch('app.services.lead_service.lead_crud')
+    @patch('app.services.lead_service.FileUploadService')
+    @pytest.mark.asyncio
+    async def test_create_lead_duplicate_discards_upload(self, mock_file_service_class, mock_crud, mock_db, mock_file):
+        """Test a duplicate email is rejected and the resume uploaded alongside the reservation is deleted"""
+        mock_file_service = Mock()
+        mock_file_service.resume_path = Mock(return_value="john@test.com/resume/1/resume.pdf")
+        mock_file_service.upload_resume = AsyncMock()
+        mock_file_service.storage.remove_object = AsyncMock()
+        mock_file_service_class.return_value = mock_file_service
+        mock_crud.create_if_email_absent = AsyncMock(return_value=None)
+        mock_db.rollback = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc:
+            await LeadService().create_lead("John", "Doe", "john@test.com", mock_file, mock_db)
+
+        assert exc.value.status_code == 409
+        mock_file_service.storage.remove_object.assert_awaited_once_with("john@test.com/resume/1/resume.pdf")
+        mock_db.rollback.assert_awaited_once()
+
+    @patch('app.services.lead_service.settings.LEAD_CREATE_PIPELINED', False)
+    @patch('app.services.lead_service.lead_crud')
+    @patch('app.services.lead_service.FileUploadService')
+    @pytest.mark.asyncio
+    async def test_create_lead_sequential_duplicate_skips_upload(self, mock_file_service_class, mock_crud, mock_db, mock_file):
+        """Test the sequential path rejects a duplicate email before any upload"""
+        mock_file_service = Mock()
+        mock_file_service.resume_path = Mock(return_value="john@test.com/resume/1/resume.pdf")
+        mock_file_service.upload_resume = AsyncMock()
+        mock_file_service_class.return_value = mock_file_service
+        mock_crud.create_if_email_absent = AsyncMock(return_value=None)
+        mock_db.rollback = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc:
+            await LeadService().create_lead("John", "Doe", "john@test.com", mock_file, mock_db)
+
+        assert exc.value.status_code == 409
+        mock_file_service.upload_resume.assert_not_awaited()
+        mock_db.rollback.assert_awaited_once()
+
+    @patch('app.services.lead_service.lead_crud')
+    @patch('app.services.lead_service.FileUploadService')
+    @pytest.mark.asyncio
+    async def test_create_lead_rejected_upload_releases_reservation(self, mock_file_service_class, mock_crud, mock_db, mock_file):
+        """Test a rejected upload rolls the reservation back and has nothing to delete"""
+        mock_file_service = Mock()
+        mock_file_service.resume_path = Mock(return_value="john@test.com/resume/1/resume.pdf")
+        mock_file_service.upload_resume = AsyncMock(side_effect=HTTPException(status_code=400, detail="File too large"))
+        mock_file_service.storage.remove_object = AsyncMock()
+        mock_file_service_class.return_value = mock_file_service
+        mock_crud.create_if_email_absent = AsyncMock(return_value=Mock())
+        mock_db.rollback = AsyncMock()
+        mock_db.commit = AsyncMock()
+
+        with pytest.raises(HTTPException) as exc:
+            await LeadService().create_lead("John", "Doe", "john@test.com", mock_file, mock_db)
+
+        assert exc.value.status_code == 400
+        mock_db.rollback.assert_awaited_once()
+        mock_db.commit.assert_not_awaited()
+        mock_file_service.storage.remove_object.assert_not_awaited()
+
+    @patch('app.services.lead_service.lead_crud')
+    @patch('app.services.lead_service.FileUploadService')
+    @pytest.mark.asyncio
+    async def test_create_lead_failed_commit_discards_upload(self, mock_file_service_class, mock_crud, mock_db, mock_file, sample_lead_response):
+        """Test the uploaded resume is deleted when the lead cannot be committed"""
+        mock_file_service = Mock()
+        mock_file_service.resume_path = Mock(return_value="john@test.com/resume/1/resume.pdf")
+        mock_file_service.upload_resume = AsyncMock()
+        mock_file_service.storage.remove_object = AsyncMock()
+        mock_file_service_class.return_value = mock_file_service
+        mock_crud.create_if_email_absent = AsyncMock(return_value=Mock(resume_path="john@test.com/resume/1/resume.pdf"))
+        mock_db.commit = AsyncMock(side_effect=ConnectionError("connection lost"))
+        mock_db.rollback = AsyncMock()
+
+        with patch.object(LeadResponse, 'from_orm', return_value=sample_lead_response):
+            with patch.object(LeadService, '_generate_resume_url', return_value=None):
+                with patch.object(LeadService, '_enqueue_lead_created_event'):
+                    with pytest.raises(HTTPException) as exc:
+                        await LeadService().create_lead("John", "Doe", "john@test.com", mock_file, mock_db)
+
+        assert exc.value.status_code == 500
+        mock_db.rollback.assert_awaited_once()
+        mock_file_service.storage.remove_object.assert_awaited_once_with("john@test.com/resume/1/resume.pdf")
 
     @pytest.mark.asyncio
     async def test_create_lead_invalid_email(self, mock_db, mock_file):
@@ -55,7 +150,8 @@ class TestLeadService:
 
     @patch('app.services.lead_service.lead_crud')
     @patch('app.services.lead_service.FileUploadService')
-    def test_get_paginated_leads_success(self, mock_file_service_class, mock_crud, mock_db):
+    @pytest.mark.asyncio
+    async def test_get_paginated_leads_success(self, mock_file_service_class, mock_crud, mock_db):
         """Test service returns paginated leads"""
         mock_file_service = Mock()
         mock_file_service_class.return_value = mock_file_service
@@ -69,11 +165,12 @@ class TestLeadService:
             status=LeadStatus.PENDING,
             created_at=datetime.now()
         )
-        mock_crud.get_paginated.return_value = ([mock_lead_response], 1)
+        mock_crud.get_paginated = AsyncMock(return_value=([mock_lead_response], False))
+        mock_crud.count = AsyncMock(return_value=(1, False))
         
         with patch.object(LeadResponse, 'from_orm', return_value=mock_lead_response):
             service = LeadService()
-            result = service.get_paginated_leads(mock_db, page=1, page_size=10)
+            result = await service.get_paginated_leads(mock_db, page=1, page_size=10)
         
         assert result.total == 1
         assert result.page == 1
@@ -81,17 +178,12 @@ class TestLeadService:
 
     @patch('app.services.lead_service.lead_crud')
     @patch('app.services.lead_service.FileUploadService')
-    def test_update_lead_status_success(self, mock_file_service_class, mock_crud, mock_db):
-        """Test service updates lead status successfully"""
+    @pytest.mark.asyncio
+    async def test_update_lead_status_success(self, mock_file_service_class, mock_crud, mock_db):
+        """Test service updates lead status with a single UPDATE ... RETURNING"""
         mock_file_service = Mock()
         mock_file_service_class.return_value = mock_file_service
         
-        mock_existing_lead = Mock()
-        mock_existing_lead.email = "john@test.com"
-        mock_existing_lead.status = LeadStatus.PENDING
-        mock_existing_lead.resume_path = "path/resume.pdf"
-        mock_crud.get_by_email.return_value = mock_existing_lead
-        
         mock_updated_lead = LeadResponse(
             id=uuid.uuid4(),
             first_name="John",
@@ -99,53 +191,198 @@ class TestLeadService:
             email="john@test.com",
             resume_path="path/resume.pdf",
             status=LeadStatus.REACHED_OUT,
-            created_at=datetime.now()
+            created_at=datetime.now(),
+            version=2
         )
-        mock_crud.update.return_value = mock_updated_lead
+        mock_crud.update_by_email = AsyncMock(return_value=mock_updated_lead)
+        mock_crud.get_by_email = AsyncMock()
         
         with patch.object(LeadResponse, 'from_orm', return_value=mock_updated_lead):
             service = LeadService()
-            result = service.update_lead_status(mock_db, "john@test.com", LeadStatus.REACHED_OUT)
+            result = await service.update_lead_status(mock_db, "john@test.com", LeadStatus.REACHED_OUT)
         
         assert result.email == "john@test.com"
         assert result.status == LeadStatus.REACHED_OUT
-        mock_crud.get_by_email.assert_called_once_with(mock_db, "john@test.com")
-        mock_crud.update.assert_called_once()
+        mock_crud.update_by_email.assert_awaited_once_with(
+            mock_db, email="john@test.com", obj_in={"status": LeadStatus.REACHED_OUT}, expected_version=None
+        )
+        mock_crud.get_by_email.assert_not_awaited()
 
     @patch('app.services.lead_service.lead_crud')
-    def test_update_lead_status_lead_not_found(self, mock_crud, mock_db):
+    @pytest.mark.asyncio
+    async def test_update_lead_status_lead_not_found(self, mock_crud, mock_db):
         """Test service handles lead not found"""
-        mock_crud.get_by_email.return_value = None
+        mock_crud.update_by_email = AsyncMock(return_value=None)
         
         with pytest.raises(HTTPException) as exc:
-            self.service.update_lead_status(mock_db, "nonexistent@test.com", LeadStatus.REACHED_OUT)
+            await self.service.update_lead_status(mock_db, "nonexistent@test.com", LeadStatus.REACHED_OUT)
         
         assert exc.value.status_code == 404
         assert "not found" in str(exc.value.detail)
 
     @patch('app.services.lead_service.lead_crud')
-    def test_update_lead_status_update_fails(self, mock_crud, mock_db):
-        """Test service handles update failure"""
-        mock_existing_lead = Mock()
-        mock_crud.get_by_email.return_value = mock_existing_lead
-        
-        mock_crud.update.return_value = None
+    @pytest.mark.asyncio
+    async def test_update_lead_status_version_conflict(self, mock_crud, mock_db):
+        """Test service reports a stale expected version as a conflict"""
+        mock_crud.update_by_email = AsyncMock(return_value=None)
+        mock_crud.get_by_email = AsyncMock(return_value=Mock())
         
         with pytest.raises(HTTPException) as exc:
-            self.service.update_lead_status(mock_db, "john@test.com", LeadStatus.REACHED_OUT)
+            await self.service.update_lead_status(mock_db, "john@test.com", LeadStatus.REACHED_OUT, expected_version=3)
         
-        assert exc.value.status_code == 500
-        assert "Failed to update" in str(exc.value.detail)
+        assert exc.value.status_code == 409
 
     @patch('app.services.lead_service.lead_crud')
-    def test_update_lead_status_database_error(self, mock_crud, mock_db):
+    @pytest.mark.asyncio
+    async def test_update_lead_status_database_error(self, mock_crud, mock_db):
         """Test service handles database errors"""
-        mock_existing_lead = Mock()
-        mock_crud.get_by_email.return_value = mock_existing_lead
-        
-        mock_crud.update.side_effect = Exception("Database error")
+        mock_crud.update_by_email = AsyncMock(side_effect=Exception("Database error"))
         
         with pytest.raises(HTTPException) as exc:
-            self.service.update_lead_status(mock_db, "john@test.com", LeadStatus.REACHED_OUT)
+            await self.service.update_lead_status(mock_db, "john@test.com", LeadStatus.REACHED_OUT)
         
         assert exc.value.status_code == 500
+
+    @patch('app.services.lead_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_update_lead_skips_select_without_resume(self, mock_crud, mock_db, sample_lead_response):
+        """Test updating fields only issues the UPDATE, without loading the lead first"""
+        mock_crud.get = AsyncMock()
+        mock_crud.update_by_id = AsyncMock(return_value=sample_lead_response)
+        lead_id = str(sample_lead_response.id)
+
+        with patch.object(LeadResponse, 'from_orm', return_value=sample_lead_response):
+            await self.service.update_lead(mock_db, lead_id, first_name=" John ", expected_version=1)
+
+        mock_crud.update_by_id.assert_awaited_once_with(
+            mock_db, id=lead_id, obj_in={"first_name": "John"}, expected_version=1
+        )
+        mock_crud.get.assert_not_awaited()
+
+    @patch('app.services.lead_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_get_paginated_leads_by_cursor(self, mock_crud, mock_db):
+        """Test service pages by keyset when a cursor is given and returns the next cursor"""
+        leads = [
+            LeadResponse(
+                id=uuid.uuid4(),
+                first_name="Jane",
+                last_name="Smith",
+                email=f"jane{i}@test.com",
+                resume_path="path/resume.pdf",
+                status=LeadStatus.PENDING,
+                created_at=datetime(2025, 10, 3, 12, 0, i)
+            )
+            for i in range(2)
+        ]
+        mock_crud.get_keyset_page = AsyncMock(return_value=(leads, True))
+        mock_crud.count = AsyncMock(return_value=(5, True))
+        cursor = encode_cursor(datetime(2025, 10, 4), uuid.uuid4())
+
+        result = await self.service.get_paginated_leads(mock_db, page_size=2, cursor=cursor)
+
+        assert result.page is None
+        assert result.total == 5
+        assert result.total_is_estimate is True
+        assert decode_cursor(result.next_cursor) == (leads[-1].created_at, leads[-1].id)
+        assert mock_crud.get_keyset_page.await_args.kwargs["after"] == decode_cursor(cursor)
+
+    @pytest.mark.asyncio
+    async def test_get_paginated_leads_invalid_cursor(self, mock_db):
+        """Test service rejects tampered cursors"""
+        with pytest.raises(HTTPException) as exc:
+            await self.service.get_paginated_leads(mock_db, cursor="not-a-cursor")
+
+        assert exc.value.status_code == 400
+
+    @patch('app.services.lead_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_update_lead_status_bulk_reports_unmatched(self, mock_crud, mock_db):
+        """Test bulk status update issues one update and splits matched from unmatched emails"""
+        mock_crud.update_status_bulk = AsyncMock(return_value=[(uuid.uuid4(), "a@test.com")])
+        request = LeadBulkStatusUpdateRequest(
+            emails=["a@test.com", "b@test.com", "a@test.com"], status=LeadStatus.REACHED_OUT
+        )
+
+        result = await self.service.update_lead_status_bulk(mock_db, request)
+
+        mock_crud.update_status_bulk.assert_awaited_once_with(
+            mock_db, LeadStatus.REACHED_OUT, emails=["a@test.com", "b@test.com"]
+        )
+        assert result.updated == 1
+        assert result.matched == ["a@test.com"]
+        assert result.unmatched == ["b@test.com"]
+
+    @patch('app.services.lead_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_update_lead_status_bulk_by_id(self, mock_crud, mock_db):
+        """Test bulk status update matches on IDs when IDs are given"""
+        found, missing = uuid.uuid4(), uuid.uuid4()
+        mock_crud.update_status_bulk = AsyncMock(return_value=[(found, "a@test.com")])
+        request = LeadBulkStatusUpdateRequest(ids=[found, missing], status=LeadStatus.REACHED_OUT)
+
+        result = await self.service.update_lead_status_bulk(mock_db, request)
+
+        assert mock_crud.update_status_bulk.await_args.kwargs == {"ids": [found, missing]}
+        assert result.matched == [str(found)]
+        assert result.unmatched == [str(missing)]
+
+
+
+class TestLeadCache:
+
+    def setup_method(self):
+        self.service = LeadService()
+        self.cache = LeadCache(maxsize=10, ttl=60)
+
+    @patch('app.services.lead_service.resume_url_service')
+    @patch('app.services.lead_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_get_lead_served_from_cache(self, mock_crud, mock_urls, mock_db, sample_lead_response):
+        """Test a cached lead is returned without a query, with a current resume URL"""
+        mock_crud.get = AsyncMock(return_value=sample_lead_response)
+        mock_urls.get_url = Mock(side_effect=["https://signed/1", "https://signed/2"])
+        lead_id = str(sample_lead_response.id)
+
+        with patch('app.services.lead_service.lead_cache', self.cache), \
+                patch.object(LeadResponse, 'from_orm', return_value=sample_lead_response.model_copy()):
+            first = await self.service.get_lead_by_id(mock_db, lead_id)
+            second = await self.service.get_lead_by_id(mock_db, lead_id.upper())
+
+        mock_crud.get.assert_awaited_once()
+        assert first.id == second.id
+        assert second.resume_url == "https://signed/2"
+        assert self.cache.stats()["hits"] == 1
+
+    @patch('app.services.lead_service.lead_crud')
+    @pytest.mark.asyncio
+    async def test_writes_invalidate_cached_leads(self, mock_crud, mock_db, sample_lead_response):
+        """Test update_lead, update_lead_status and the bulk update drop the leads they change"""
+        other = sample_lead_response.model_copy(update={"id": uuid.uuid4()})
+        mock_crud.update_by_id = AsyncMock(return_value=sample_lead_response)
+        mock_crud.update_by_email = AsyncMock(return_value=sample_lead_response)
+        mock_crud.update_status_bulk = AsyncMock(return_value=[(other.id, other.email)])
+
+        with patch('app.services.lead_service.lead_cache', self.cache), \
+                patch.object(LeadResponse, 'from_orm', return_value=sample_lead_response):
+            self.cache.set(sample_lead_response)
+            await self.service.update_lead(mock_db, str(sample_lead_response.id), first_name="Jane")
+            assert self.cache.get(sample_lead_response.id) is None
+
+            self.cache.set(sample_lead_response)
+            await self.service.update_lead_status(mock_db, sample_lead_response.email, LeadStatus.REACHED_OUT)
+            assert self.cache.get(sample_lead_response.id) is None
+
+            self.cache.set(other)
+            await self.service.update_lead_status_bulk(
+                mock_db, LeadBulkStatusUpdateRequest(ids=[other.id], status=LeadStatus.REACHED_OUT)
+            )
+            assert self.cache.get(other.id) is None
+
+    def test_disabled_cache_stores_nothing(self, sample_lead_response):
+        """Test a zero TTL turns the cache off"""
+        cache = LeadCache(maxsize=10, ttl=0)
+        cache.set(sample_lead_response)
+
+        assert cache.get(sample_lead_response.id) is None
+        assert cache.stats()["enabled"] is False
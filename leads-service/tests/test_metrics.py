@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from prometheus_client import REGISTRY
+from app.core.metrics import instrument_engine, _sql_operation
+from app.services.file_service import FileUploadService
+from app.storage import InMemoryStorage, StorageError
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetrics:
+
+    def test_requests_are_labelled_by_route_template(self, client):
+        """Test latency is recorded per route template and status, and /metrics exposes it"""
+        labels = {"method": "GET", "route": "/api/v1/leads/{lead_id}", "status": "403"}
+        before = _sample("leads_http_request_duration_seconds_count", **labels)
+
+        client.get("/api/v1/leads/123")
+        response = client.get("/metrics")
+
+        assert _sample("leads_http_request_duration_seconds_count", **labels) == before + 1
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert b"leads_http_requests_in_flight" in response.content
+
+    def test_unknown_paths_share_one_label(self, client):
+        """Test unmatched paths do not create a label per URL"""
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = _sample("leads_http_request_duration_seconds_count", **labels)
+
+        client.get("/no/such/path/1")
+        client.get("/no/such/path/2")
+
+        assert _sample("leads_http_request_duration_seconds_count", **labels) == before + 2
+
+    def test_unknown_methods_share_one_label(self, client):
+        """Test arbitrary request methods do not create a label per method"""
+        labels = {"method": "OTHER", "route": "unmatched", "status": "404"}
+        before = _sample("leads_http_request_duration_seconds_count", **labels)
+
+        for i in range(3):
+            client.request(f"XMETH{i}", "/nope")
+
+        assert _sample("leads_http_request_duration_seconds_count", **labels) == before + 3
+        assert _sample("leads_http_request_duration_seconds_count", method="XMETH0", route="unmatched", status="404") == 0.0
+
+    def test_statements_are_timed_by_operation(self):
+        """Test engine hooks time statements and bucket unknown verbs as OTHER"""
+        engine = create_engine("sqlite://")
+        instrument_engine(engine, "test")
+        before = _sample("leads_db_query_duration_seconds_count", engine="test", operation="SELECT")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+        assert _sample("leads_db_query_duration_seconds_count", engine="test", operation="SELECT") == before + 1
+        assert _sql_operation("  with x as (select 1) select * from x") == "WITH"
+        assert _sql_operation("VACUUM leads") == "OTHER"
+
+    @pytest.mark.asyncio
+    async def test_uploads_record_duration_and_bytes(self):
+        """Test stored resumes are sized and timed, and storage failures counted as errors"""
+        service = FileUploadService()
+        service.storage = InMemoryStorage()
+        success = _sample("leads_s3_upload_duration_seconds_count", outcome="success")
+        errors = _sample("leads_s3_upload_duration_seconds_count", outcome="error")
+        total_bytes = _sample("leads_s3_upload_bytes_sum")
+
+        await service.upload_resume_bytes(b"x" * 2048, "cv.pdf", "ada@test.com", "application/pdf")
+        service.storage = Mock(put_object=AsyncMock(side_effect=StorageError("down")))
+        with pytest.raises(HTTPException):
+            await service.upload_resume_bytes(b"x", "cv.pdf", "ada@test.com", "application/pdf")
+
+        assert _sample("leads_s3_upload_duration_seconds_count", outcome="success") == success + 1
+        assert _sample("leads_s3_upload_duration_seconds_count", outcome="error") == errors + 1
+        assert _sample("leads_s3_upload_bytes_sum") == total_bytes + 2048
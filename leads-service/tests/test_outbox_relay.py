@@ -0,0 +1,47 @@
+import pytest
+import uuid
+from datetime import timedelta
+from unittest.mock import patch, AsyncMock
+from app.messaging.outbox_relay import OutboxRelay
+from app.models.outbox import OutboxEvent
+
+
+class TestOutboxRelay:
+
+    def setup_method(self):
+        self.relay = OutboxRelay()
+
+    def _event(self):
+        return OutboxEvent(id=uuid.uuid4(), topic="new_leads", key="k", payload={"event_type": "lead.created"})
+
+    @patch('app.messaging.outbox_relay.kafka_client')
+    @pytest.mark.asyncio
+    async def test_publish_batch_splits_published_and_failed(self, mock_kafka):
+        """Test events Kafka accepts are marked published and the rest are kept for retry"""
+        ok, rejected, broken = self._event(), self._event(), self._event()
+        mock_kafka.send_batch = AsyncMock(return_value=[True, False, False])
+
+        published_ids, failures = await self.relay.publish_batch([ok, rejected, broken])
+
+        assert published_ids == [ok.id]
+        assert set(failures) == {rejected.id, broken.id}
+        messages = mock_kafka.send_batch.call_args[0][0]
+        assert [m.key for m in messages] == ["k", "k", "k"]
+
+    @patch('app.messaging.outbox_relay.kafka_client')
+    @pytest.mark.asyncio
+    async def test_publish_batch_failure_keeps_every_event(self, mock_kafka):
+        """Test a batch that raises leaves all events for retry"""
+        events = [self._event(), self._event()]
+        mock_kafka.send_batch = AsyncMock(side_effect=RuntimeError("broker down"))
+
+        published_ids, failures = await self.relay.publish_batch(events)
+
+        assert published_ids == []
+        assert set(failures.values()) == {"broker down"}
+
+    def test_backoff_grows_exponentially_and_is_capped(self):
+        """Test retry delay doubles per attempt up to the configured maximum"""
+        assert self.relay.backoff(1) == timedelta(seconds=1)
+        assert self.relay.backoff(4) == timedelta(seconds=8)
+        assert self.relay.backoff(50) == timedelta(seconds=300)
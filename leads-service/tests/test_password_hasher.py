@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, Mock
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from app.authentication import security
+from app.authentication.security import PasswordHasher
+from app.authentication.service import AuthService
+from app.core.config import settings
+from app.core.postgres import get_async_postgres_db
+from app.main import app
+
+# Low bcrypt costs keep these tests fast; the behaviour does not depend on the cost
+FAST_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4)
+OLD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5)
+
+
+class TestPasswordHasher:
+
+    def setup_method(self):
+        self.hasher = PasswordHasher(workers=1, max_queue=1)
+
+    @patch.object(security, "pwd_context", FAST_CONTEXT)
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_off_the_loop(self):
+        """Test hashing runs on the bcrypt pool, not the event loop thread"""
+        threads = []
+        original = security.hash_password
+
+        def tracking_hash(password):
+            threads.append(threading.current_thread().name)
+            return original(password)
+
+        with patch.object(security, "hash_password", tracking_hash):
+            hashed = await self.hasher._run(security.hash_password, "s3cret")
+
+        assert threads[0].startswith("bcrypt")
+        assert await self.hasher.verify("s3cret", hashed) is True
+        assert await self.hasher.verify("wrong", hashed) is False
+        assert self.hasher.stats()["completed"] == 3
+
+    @patch.object(security, "pwd_context", FAST_CONTEXT)
+    @pytest.mark.asyncio
+    async def test_verify_and_update_rehashes_outdated_cost(self):
+        """Test a hash made with another cost comes back with a replacement"""
+        verified, new_hash = await self.hasher.verify_and_update("s3cret", OLD_CONTEXT.hash("s3cret"))
+        current, no_hash = await self.hasher.verify_and_update("s3cret", FAST_CONTEXT.hash("s3cret"))
+
+        assert verified and current
+        assert new_hash is not None and FAST_CONTEXT.verify("s3cret", new_hash)
+        assert no_hash is None
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_rejects_immediately(self):
+        """Test calls beyond workers + queue get a 503 with Retry-After instead of waiting"""
+        release = threading.Event()
+        blocked = [asyncio.create_task(self.hasher._run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await self.hasher.hash("s3cret")
+
+        release.set()
+        await asyncio.gather(*blocked)
+        assert exc_info.value.status_code == 503
+        assert self.hasher.stats()["rejected"] == 1
+        assert self.hasher.stats()["in_flight"] == 0
+
+
+class TestAuthServiceRehash:
+
+    def setup_method(self):
+        self.service = AuthService()
+        self.user = SimpleNamespace(username="attorney", hashed_password="old-hash", role="attorney")
+        self.db = Mock()
+        result = Mock()
+        result.scalars.return_value.first.return_value = self.user
+        self.db.execute = AsyncMock(return_value=result)
+        self.db.commit = AsyncMock()
+        self.db.rollback = AsyncMock()
+
+    @patch('app.authentication.service.password_hasher')
+    @pytest.mark.asyncio
+    async def test_login_stores_rehashed_password(self, mock_hasher):
+        """Test a successful login with an outdated hash saves the new one"""
+        mock_hasher.verify_and_update = AsyncMock(return_value=(True, "new-hash"))
+
+        user = await self.service.authenticate_user("attorney", "s3cret", self.db)
+
+        assert user.hashed_password == "new-hash"
+        self.db.commit.assert_awaited_once()
+
+    @patch('app.authentication.service.password_hasher')
+    @pytest.mark.asyncio
+    async def test_login_with_current_hash_does_not_write(self, mock_hasher):
+        """Test no write happens when the stored hash is current"""
+        mock_hasher.verify_and_update = AsyncMock(return_value=(True, None))
+
+        await self.service.authenticate_user("attorney", "s3cret", self.db)
+
+        self.db.commit.assert_not_awaited()
+
+    @patch('app.authentication.service.password_hasher')
+    @pytest.mark.asyncio
+    async def test_saturation_is_not_turned_into_500(self, mock_hasher):
+        """Test the pool's 503 reaches the client unchanged"""
+        mock_hasher.verify_and_update = AsyncMock(side_effect=HTTPException(status_code=503, detail="busy"))
+
+        with pytest.raises(HTTPException) as exc_info:
+            await self.service.authenticate_user("attorney", "s3cret", self.db)
+
+        assert exc_info.value.status_code == 503
+
+    def test_saturated_login_returns_retry_after(self):
+        """Test a saturated pool's 503 reaches the client with its Retry-After header"""
+        saturated = PasswordHasher(workers=1, max_queue=0)
+        saturated.in_flight = 1
+        app.dependency_overrides[get_async_postgres_db] = lambda: self.db
+        try:
+            with patch('app.authentication.service.password_hasher', saturated):
+                response = TestClient(app).post(
+                    "/api/v1/auth/login", json={"username": "attorney", "password": "s3cret"}
+                )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+        assert response.json()["error"] == "Request failed"
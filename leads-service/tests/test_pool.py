@@ -0,0 +1,72 @@
+import sqlite3
+import pytest
+from unittest.mock import patch, AsyncMock, Mock
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from app.core.pool import PoolMetrics, instrumented_pool_class
+from app.core.postgres import warm_up_pool
+
+
+class TestPoolInstrumentation:
+
+    def setup_method(self):
+        self.metrics = PoolMetrics("test")
+        pool_class = instrumented_pool_class(QueuePool, self.metrics)
+        self.pool = pool_class(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=1, timeout=0.05)
+
+    def test_checkouts_are_timed_and_counted(self):
+        """Test occupancy, overflow and waits are reported while connections are out"""
+        first = self.pool.connect()
+        second = self.pool.connect()
+
+        stats = self.metrics.snapshot()
+        assert (stats["checked_out"], stats["overflow"], stats["max_overflow"]) == (2, 1, 1)
+        assert stats["wait_seconds"]["count"] == 2
+
+        first.close()
+        second.close()
+        assert self.metrics.snapshot()["checked_out"] == 0
+
+    def test_exhausted_pool_counts_timeouts(self):
+        """Test a checkout that gives up is counted and its wait recorded"""
+        held = [self.pool.connect(), self.pool.connect()]
+
+        with pytest.raises(PoolTimeoutError):
+            self.pool.connect()
+
+        stats = self.metrics.snapshot()
+        assert stats["timeouts"] == 1
+        assert stats["wait_seconds"]["max"] >= 0.05
+        for connection in held:
+            connection.close()
+
+    def test_recreated_pool_keeps_metrics(self):
+        """Test engine.dispose() style recreation reports through the same metrics"""
+        recreated = self.pool.recreate()
+        recreated.connect().close()
+
+        assert self.metrics.pool is recreated
+        assert self.metrics.snapshot()["wait_seconds"]["count"] == 1
+
+
+class TestPoolWarmUp:
+
+    @pytest.mark.asyncio
+    async def test_warm_up_opens_and_returns_connections(self):
+        """Test warm-up opens connections concurrently and hands them back to the pool"""
+        connection = Mock(close=AsyncMock())
+        engine = Mock(connect=AsyncMock(return_value=connection))
+
+        with patch('app.core.postgres.settings.POSTGRES_POOL_SIZE', 3):
+            opened = await warm_up_pool(engine, 5)
+
+        assert opened == 3
+        assert connection.close.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_warm_up_tolerates_connect_failures(self):
+        """Test a failing connect leaves the remaining connections warmed"""
+        connection = Mock(close=AsyncMock())
+        engine = Mock(connect=AsyncMock(side_effect=[connection, OSError("refused")]))
+
+        assert await warm_up_pool(engine, 2) == 1
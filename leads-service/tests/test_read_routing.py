@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import patch, AsyncMock, Mock, MagicMock
+from app.core import postgres
+from app.core.postgres import ReplicaRouter, get_async_read_db
+from app.crud.lead import lead as lead_crud
+
+
+def _session(connection_error=None):
+    session = MagicMock()
+    session.connection = AsyncMock(side_effect=connection_error)
+    session.close = AsyncMock()
+    session.__aenter__ = AsyncMock(return_value=session)
+    session.__aexit__ = AsyncMock(return_value=False)
+    return session
+
+
+class TestReplicaRouter:
+
+    def setup_method(self):
+        self.router = ReplicaRouter(read_your_writes_seconds=5, retry_seconds=30)
+
+    def test_writer_is_pinned_to_primary(self):
+        """Test a user reads from the primary right after writing, others still use the replica"""
+        self.router.record_write("attorney1")
+
+        assert self.router.use_replica("attorney1") is False
+        assert self.router.use_replica("attorney2") is True
+
+    def test_read_your_writes_can_be_disabled(self):
+        """Test a zero window never pins users"""
+        router = ReplicaRouter(read_your_writes_seconds=0, retry_seconds=30)
+        router.record_write("attorney1")
+
+        assert router.use_replica("attorney1") is True
+
+    def test_failed_replica_is_skipped_until_retry(self):
+        """Test reads stay on the primary for the retry window after a failure"""
+        self.router.replica_failed(OSError("connection refused"))
+
+        assert self.router.use_replica("attorney1") is False
+        assert self.router.stats()["fallbacks"] == 1
+
+
+class TestReadSessionDependency:
+
+    def setup_method(self):
+        self.router = ReplicaRouter(read_your_writes_seconds=5, retry_seconds=30)
+
+    async def _session_for(self, user):
+        dependency = get_async_read_db(user)
+        db = await dependency.__anext__()
+        await dependency.aclose()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_reads_use_replica(self):
+        """Test a healthy replica serves reads"""
+        replica, primary = _session(), _session()
+
+        with patch.object(postgres, "replica_router", self.router), \
+                patch.object(postgres, "AsyncReplicaSessionLocal", Mock(return_value=replica)), \
+                patch.object(postgres, "AsyncPostgresSessionLocal", Mock(return_value=primary)):
+            db = await self._session_for({"username": "attorney1"})
+
+        assert db is replica
+        assert self.router.replica_reads == 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_falls_back_to_primary(self):
+        """Test a replica connection error is absorbed and the primary is used"""
+        replica, primary = _session(OSError("connection refused")), _session()
+
+        with patch.object(postgres, "replica_router", self.router), \
+                patch.object(postgres, "AsyncReplicaSessionLocal", Mock(return_value=replica)), \
+                patch.object(postgres, "AsyncPostgresSessionLocal", Mock(return_value=primary)):
+            db = await self._session_for({"username": "attorney1"})
+
+        assert db is primary
+        replica.close.assert_awaited_once()
+        assert self.router.use_replica("attorney1") is False
+
+    @pytest.mark.asyncio
+    async def test_recent_writer_reads_primary(self):
+        """Test read-your-writes routes the writer to the primary"""
+        replica, primary = _session(), _session()
+        self.router.record_write("attorney1")
+
+        with patch.object(postgres, "replica_router", self.router), \
+                patch.object(postgres, "AsyncReplicaSessionLocal", Mock(return_value=replica)), \
+                patch.object(postgres, "AsyncPostgresSessionLocal", Mock(return_value=primary)):
+            db = await self._session_for({"username": "attorney1"})
+
+        assert db is primary
+        replica.connection.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_counting_through_a_replica_session_never_writes(self):
+        """Test the counter strategy only reads; compaction happens in the background"""
+        replica = Mock()
+        replica.execute = AsyncMock()
+        replica.commit = AsyncMock()
+        replica.scalar = AsyncMock(return_value=3)
+
+        total = await lead_crud._count_from_counter_table(replica)
+
+        assert total == 3
+        replica.execute.assert_not_awaited()
+        replica.commit.assert_not_awaited()
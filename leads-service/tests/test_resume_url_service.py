@@ -0,0 +1,47 @@
+from datetime import timedelta
+from unittest.mock import Mock
+from urllib.parse import urlparse, parse_qs
+from minio import Minio
+from app.services.resume_url_service import ResumeUrlService
+from app.storage import InMemoryStorage, MinioStorage
+
+
+class TestResumeUrlService:
+
+    def setup_method(self):
+        self.storage = Mock()
+        self.storage.presigned_get_url = Mock(side_effect=lambda path, expires: f"https://signed/{path}")
+        self.service = ResumeUrlService(self.storage)
+
+    def test_get_urls_signs_each_path_once(self):
+        """Test a page is signed in one pass and repeated pages come from the cache"""
+        first = self.service.get_urls(["a/resume.pdf", "b/resume.pdf", "a/resume.pdf", None])
+        second = self.service.get_urls(["a/resume.pdf", "b/resume.pdf"])
+
+        assert first == {"a/resume.pdf": "https://signed/a/resume.pdf", "b/resume.pdf": "https://signed/b/resume.pdf"}
+        assert second == first
+        assert self.storage.presigned_get_url.call_count == 2
+        assert self.service.cache.hits == 2
+
+    def test_cache_expires_before_signature(self):
+        """Test cached URLs are dropped before the URL itself stops working"""
+        assert self.service.cache.ttl < self.service.expires.total_seconds()
+
+    def test_backend_without_urls(self):
+        """Test backends that cannot serve downloads yield no URL"""
+        service = ResumeUrlService(InMemoryStorage())
+
+        assert service.get_url("a/resume.pdf") is None
+        assert service.get_url("") is None
+
+    def test_minio_signing_is_local(self):
+        """Test presigning with a known region needs no reachable server"""
+        signer = Minio("127.0.0.1:1", access_key="key", secret_key="secret", secure=False, region="us-east-1")
+        storage = MinioStorage(Mock(), "leads", max_workers=1, signing_client=signer)
+
+        url = storage.presigned_get_url("ada@test.com/resume/cv.pdf", timedelta(hours=1))
+
+        parsed = urlparse(url)
+        assert parsed.netloc == "127.0.0.1:1"
+        assert parsed.path == "/leads/ada%40test.com/resume/cv.pdf"
+        assert parse_qs(parsed.query)["X-Amz-Expires"] == ["3600"]
@@ -0,0 +1,83 @@
+import logging
+import threading
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from app.core.sql_profiler import SQLProfiler, QueryBudgetExceeded, redact_parameters
+from app.services.lead_cache import LeadCache
+
+
+class TestSQLProfiler:
+
+    def setup_method(self):
+        self.profiler = SQLProfiler()
+        self.engine = create_engine("sqlite://")
+        self.profiler.instrument(self.engine)
+
+    def _run(self, *statements, **params):
+        with self.engine.connect() as connection:
+            for statement in statements:
+                connection.execute(text(statement), params)
+
+    def test_profile_counts_statements_of_its_context(self):
+        """Test statements are attributed to the active profile only"""
+        with self.profiler.profile() as profile:
+            self._run("SELECT 1", "SELECT 2")
+        self._run("SELECT 3")
+
+        assert profile.count == 2
+        assert self.profiler.statements == 3
+
+    def test_repeated_statement_is_flagged_as_n_plus_one(self, caplog):
+        """Test a statement repeated past the threshold is reported for the request"""
+        with patch('app.core.sql_profiler.settings.N_PLUS_ONE_THRESHOLD', 3):
+            with self.profiler.profile() as profile:
+                for lead_id in range(3):
+                    self._run("SELECT :id", id=lead_id)
+            with caplog.at_level(logging.WARNING, logger="app.core.sql_profiler"):
+                self.profiler.finish_request(profile, "GET", "/api/v1/leads")
+            assert profile.repeated() == [("SELECT ?", 3)]
+
+        assert self.profiler.n_plus_one_requests == 1
+        assert "Possible N+1 in GET /api/v1/leads: 3x SELECT ?" in caplog.text
+
+    def test_slow_query_log_redacts_parameters(self, caplog):
+        """Test slow queries are logged with parameter types, never values"""
+        with patch('app.core.sql_profiler.settings.SLOW_QUERY_THRESHOLD_MS', 0):
+            with caplog.at_level(logging.WARNING, logger="app.core.sql_profiler"):
+                self._run("SELECT :email", email="ada@test.com")
+
+        assert "Slow query" in caplog.text
+        assert "ada@test.com" not in caplog.text
+        assert self.profiler.slow_queries == 1
+        assert redact_parameters({"email": "ada@test.com", "n": 1}) == {"email": "str", "n": "int"}
+
+    def test_query_budget_sees_other_threads(self):
+        """Test the budget counts statements issued outside the test's own context"""
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            with self.profiler.query_budget(1):
+                worker = threading.Thread(target=self._run, args=("SELECT 1", "SELECT 1"))
+                worker.start()
+                worker.join()
+
+        assert "2 statements issued, budget is 1" in str(exc_info.value)
+        assert "2x SELECT 1" in str(exc_info.value)
+
+    @patch('app.services.lead_service.resume_url_service')
+    def test_cached_lead_read_issues_no_sql(self, mock_urls, client, query_budget, sample_lead_response):
+        """Test a lead served from the lead cache costs no SQL, checked with the query_budget fixture"""
+        from app.authentication.jwt import get_current_user
+
+        cache = LeadCache(maxsize=10, ttl=60)
+        cache.set(sample_lead_response)
+        mock_urls.get_url.return_value = "https://storage/resume.pdf"
+        client.app.dependency_overrides[get_current_user] = lambda: {"username": "attorney1", "role": "attorney"}
+        try:
+            with patch('app.services.lead_service.lead_cache', cache), query_budget(0):
+                response = client.get(f"/api/v1/leads/{sample_lead_response.id}")
+        finally:
+            client.app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        assert response.json()["resume_url"] == "https://storage/resume.pdf"
+        assert cache.stats()["hits"] == 1
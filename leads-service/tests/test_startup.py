@@ -0,0 +1,132 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from fastapi.testclient import TestClient
+from app.core.startup import StartupReport
+from app.main import app
+
+SERVICE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Records (and refuses) every socket connect or DNS lookup made while importing the app
+NO_NETWORK_IMPORT = """
+import socket
+
+attempts = []
+
+def refuse(*args, **kwargs):
+    attempts.append(args[1:] or args)
+    raise OSError("network I/O during import")
+
+socket.socket.connect = refuse
+socket.socket.connect_ex = refuse
+socket.create_connection = refuse
+socket.getaddrinfo = refuse
+
+import app.main
+
+assert not attempts, attempts
+"""
+
+
+class TestStartupReport:
+
+    def setup_method(self):
+        self.report = StartupReport()
+
+    @pytest.mark.asyncio
+    async def test_phases_run_concurrently(self):
+        """Test startup phases overlap instead of running one after another"""
+        async def slow():
+            await asyncio.sleep(0.2)
+            return True
+
+        started = time.perf_counter()
+        results = await self.report.run_concurrently({"a": (slow, 1.0), "b": (slow, 1.0), "c": (slow, 1.0)})
+
+        assert results == {"a": True, "b": True, "c": True}
+        assert time.perf_counter() - started < 0.5
+        assert self.report.healthy
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_a_hanging_phase(self):
+        """Test a hanging phase is cut off at its deadline while the others finish"""
+        async def hang():
+            await asyncio.sleep(60)
+
+        async def fine():
+            return None
+
+        started = time.perf_counter()
+        results = await self.report.run_concurrently({"stuck": (hang, 0.1), "ok": (fine, 1.0)})
+
+        assert time.perf_counter() - started < 1.0
+        assert results == {"stuck": False, "ok": True}
+        assert self.report.phases["stuck"]["error"] == "timed out after 0.1s"
+        assert not self.report.healthy
+
+    @pytest.mark.asyncio
+    async def test_errors_and_false_results_fail_the_phase(self):
+        """Test a raising phase or one returning False is reported as failed"""
+        async def broken():
+            raise ConnectionError("refused")
+
+        async def unhealthy():
+            return False
+
+        await self.report.run_concurrently({"broken": (broken, 1.0), "unhealthy": (unhealthy, 1.0)})
+        self.report.finish()
+
+        snapshot = self.report.snapshot()
+        assert snapshot["phases"]["broken"] == {"ok": False, "seconds": snapshot["phases"]["broken"]["seconds"], "error": "refused"}
+        assert snapshot["phases"]["unhealthy"]["ok"] is False
+        assert snapshot["total_seconds"] is not None
+
+
+class TestLifespan:
+
+    def test_importing_the_app_does_no_network_io(self):
+        """Test importing app.main opens no sockets and resolves no hosts"""
+        result = subprocess.run(
+            [sys.executable, "-c", NO_NETWORK_IMPORT], cwd=SERVICE_ROOT, capture_output=True, text=True, timeout=60
+        )
+        assert result.returncode == 0, result.stderr
+
+    @patch('app.main.lead_count_compactor')
+    @patch('app.main.health_prober')
+    @patch('app.main.outbox_relay')
+    @patch('app.main.kafka_client')
+    @patch('app.main.get_storage')
+    @patch('app.main.warm_up_pools', new_callable=AsyncMock)
+    @patch('app.main.check_postgres_health', new_callable=AsyncMock, return_value=True)
+    def test_startup_timings_reported(self, mock_health, mock_warm_up, mock_get_storage, mock_kafka, mock_relay, mock_prober, mock_compactor):
+        """Test the lifespan records each phase in /diagnostics and still starts when one times out"""
+        async def hanging_ensure_bucket():
+            await asyncio.sleep(60)
+
+        mock_get_storage.return_value = Mock(ensure_bucket=hanging_ensure_bucket)
+        mock_kafka.start = AsyncMock()
+        mock_kafka.stop = AsyncMock()
+        mock_kafka.started = True
+        mock_relay.start = AsyncMock()
+        mock_relay.stop = AsyncMock()
+        mock_prober.start = AsyncMock()
+        mock_prober.stop = AsyncMock()
+        mock_compactor.start = AsyncMock()
+        mock_compactor.stop = AsyncMock()
+
+        with patch('app.main.settings.STARTUP_S3_TIMEOUT_SECONDS', 0.1):
+            with TestClient(app) as client:
+                startup = client.get("/diagnostics").json()["startup"]
+
+        assert startup["healthy"] is False
+        assert set(startup["phases"]) == {"postgres", "storage", "kafka", "outbox_relay", "lead_count_compactor"}
+        assert startup["phases"]["storage"]["error"] == "timed out after 0.1s"
+        assert startup["phases"]["postgres"]["ok"] is True
+        mock_warm_up.assert_awaited_once()
+        mock_kafka.stop.assert_awaited_once()
+        mock_prober.start.assert_awaited_once()
+        mock_compactor.stop.assert_awaited_once()
@@ -14,11 +14,28 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_PORT: int = 5432
     
+    # Connection pool
+    POSTGRES_POOL_SIZE: int = 5
+    POSTGRES_MAX_OVERFLOW: int = 5
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = 30.0
+    POSTGRES_POOL_RECYCLE_SECONDS: int = 1800  # -1 never recycles
+    POSTGRES_POOL_PRE_PING: bool = True
+    POSTGRES_POOL_WARMUP_CONNECTIONS: int = 2  # opened at startup, capped at POSTGRES_POOL_SIZE
+    
     # Kafka
     KAFKA_BOOTSTRAP_SERVERS: str
     KAFKA_CONSUMER_GROUP: str
     KAFKA_NEW_LEADS_TOPIC: str
     
+    # Startup (dependency checks run concurrently, each bounded by its deadline)
+    STARTUP_POSTGRES_TIMEOUT_SECONDS: float = 10.0  # includes pool warm-up
+    STARTUP_KAFKA_TIMEOUT_SECONDS: float = 10.0
+    
+    # Health checks (run in the background; /health/ready serves the cached results)
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 10.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_SMTP_PROBE_INTERVAL_SECONDS: float = 300.0  # each probe is a connection to the mail provider
+    
     # Email
     SMTP_HOST: str = "smtp.gmail.com"
     SMTP_PORT: int = 587
@@ -0,0 +1,80 @@
+"""Connection pool settings and instrumentation for the service's engine."""
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+from typing import Any, Dict, Type
+import threading
+import time
+import logging
+from app.core.config import settings
+from app.utils import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class PoolMetrics:
+    """Checkout wait times and timeouts for one engine's pool"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Pool = None
+        self.wait_seconds = Histogram()
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Live pool occupancy plus checkout wait histogram"""
+        pool = self.pool
+        stats: Dict[str, Any] = {"name": self.name, "timeouts": self.timeouts}
+        if pool is not None and hasattr(pool, "checkedout"):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "max_overflow": pool._max_overflow,
+            })
+        stats["wait_seconds"] = self.wait_seconds.snapshot()
+        return stats
+
+
+def instrumented_pool_class(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Subclass of pool_class that times every checkout into metrics.
+
+    The wait covers queueing for a free connection and opening a new one. The
+    class carries the metrics, so pools recreated by engine.dispose() keep them.
+    """
+
+    class InstrumentedPool(pool_class):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            metrics.pool = self
+
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                metrics.record_timeout()
+                logger.warning(f"Connection pool {metrics.name} exhausted after {settings.POSTGRES_POOL_TIMEOUT_SECONDS}s")
+                raise
+            finally:
+                metrics.wait_seconds.observe(time.perf_counter() - started)
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_class.__name__}"
+    return InstrumentedPool
+
+
+def pool_options(pool_class: Type[Pool], metrics: PoolMetrics) -> Dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments for a pool configured from Settings"""
+    return {
+        "poolclass": instrumented_pool_class(pool_class, metrics),
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.POSTGRES_POOL_PRE_PING,
+    }
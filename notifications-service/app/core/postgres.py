@@ -1,13 +1,21 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
+from typing import Any, Dict
+import asyncio
 import logging
+import time
 from app.core.config import settings
+from app.core.pool import PoolMetrics, pool_options
 
 logger = logging.getLogger(__name__)
 
+# Checkout wait times and occupancy, reported on /diagnostics
+pool_metrics = PoolMetrics("primary")
+
 # Create PostgreSQL engine
-postgres_engine = create_engine(settings.database_url)
+postgres_engine = create_engine(settings.database_url, **pool_options(QueuePool, pool_metrics))
 
 # Create session factory
 PostgresSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=postgres_engine)
@@ -30,13 +38,51 @@ def get_postgres_engine():
     return postgres_engine
 
 
+def pool_stats() -> Dict[str, Any]:
+    """Occupancy and checkout wait histogram of the engine's pool"""
+    return pool_metrics.snapshot()
+
+
+def _open_connections(connections: int) -> int:
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(postgres_engine.connect())
+    except Exception as e:
+        logger.warning(f"Pool warm-up opened {len(opened)}/{connections} connections: {e}")
+    for connection in opened:
+        connection.close()
+    return len(opened)
+
+
+async def warm_up_pool() -> int:
+    """Open POSTGRES_POOL_WARMUP_CONNECTIONS pooled connections off the event loop"""
+    connections = min(settings.POSTGRES_POOL_WARMUP_CONNECTIONS, settings.POSTGRES_POOL_SIZE)
+    if connections <= 0:
+        return 0
+    started = time.perf_counter()
+    opened = await asyncio.to_thread(_open_connections, connections)
+    logger.info(f"Warmed pool with {opened} connections in {time.perf_counter() - started:.3f}s")
+    return opened
+
+
+def _ping() -> None:
+    with postgres_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def ping_postgres() -> None:
+    """SELECT 1 through the pool on a worker thread; raises when Postgres or a pooled connection is unavailable"""
+    await asyncio.to_thread(_ping)
+
+
 async def check_postgres_health() -> bool:
     """Check PostgreSQL database health"""
     try:
-        with postgres_engine.connect() as connection:
-            connection.info
-            logger.info("PostgreSQL health check passed")
-            return True
+        # The engine is synchronous; connect on a worker thread so startup deadlines can fire
+        await asyncio.to_thread(_ping)
+        logger.info("PostgreSQL health check passed")
+        return True
     except Exception as e:
         logger.error(f"PostgreSQL health check failed: {e}")
         return False
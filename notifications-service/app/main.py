@@ -1,55 +1,80 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import logging
 
 from app.core.config import settings
-from app.core.postgres import check_postgres_health
+from app.core.health import health_prober
+from app.core.postgres import check_postgres_health, ping_postgres, warm_up_pool, pool_stats
+from app.core.startup import StartupReport
 from app.messaging.kafka_consumer import kafka_consumer
+from app.services.email_service import email_service
+from app.utils import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create FastAPI application
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    version=settings.VERSION,
-    docs_url=None,
-    redoc_url=None,
-    openapi_url=None
+
+async def check_kafka_consumer() -> bool:
+    return kafka_consumer.consuming
+
+# Dependencies behind /health/ready; SMTP is reported but doesn't gate readiness
+health_prober.register("postgres", ping_postgres)
+health_prober.register("kafka_consumer", check_kafka_consumer)
+health_prober.register(
+    "smtp", email_service.ping, critical=False, interval=settings.HEALTH_SMTP_PROBE_INTERVAL_SECONDS
 )
 
-@app.on_event("startup")
-async def startup_event():
-    """Startup event handler"""
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start dependencies concurrently, each under its own deadline, then stop them on shutdown"""
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
-    
-    # Check PostgreSQL connectivity
-    logger.info("Checking PostgreSQL connection...")
-    postgres_healthy = await check_postgres_health()
-    
-    # Start Kafka Consumer on app startup
-    logger.info("Starting Kafka consumer...")
-    await kafka_consumer.start()
-    kafka_healthy = kafka_consumer.started
-    
-    if kafka_healthy:
-        logger.info("Kafka consumer started successfully")
-    else:
-        logger.error("Kafka consumer failed to start")
-    
+    report = StartupReport()
+    app.state.startup_report = report
+
+    async def start_postgres() -> bool:
+        healthy = await check_postgres_health()
+        if healthy:
+            await warm_up_pool()
+        return healthy
+
+    async def start_kafka_consumer() -> bool:
+        await kafka_consumer.start()
+        return kafka_consumer.started
+
+    await report.run_concurrently({
+        "postgres": (start_postgres, settings.STARTUP_POSTGRES_TIMEOUT_SECONDS),
+        "kafka_consumer": (start_kafka_consumer, settings.STARTUP_KAFKA_TIMEOUT_SECONDS),
+    })
+    report.finish()
+
     # Summary
-    if postgres_healthy and kafka_healthy:
+    if report.healthy:
         logger.info("All services healthy! Notification service ready.")
     else:
         logger.warning("⚠️ Some services are not healthy. Check logs above.")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Shutdown event handler"""
+    await health_prober.start()
+
+    yield
+
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    await health_prober.stop()
     # Stop Kafka Consumer on app shutdown
     await kafka_consumer.stop()
 
+# Create FastAPI application
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    version=settings.VERSION,
+    docs_url=None,
+    redoc_url=None,
+    openapi_url=None,
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
+
 @app.get("/")
 async def root():
     """Root endpoint for service identification"""
@@ -60,18 +85,44 @@ async def root():
         "version": settings.VERSION
     }
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and its event loop is serving requests"""
+    return {"status": "alive"}
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe from the background prober's cached results; never waits on a dependency"""
+    health = health_prober.snapshot()
+    return ORJSONResponse(
+        status_code=200 if health["ready"] else 503,
+        content={"status": "ready" if health["ready"] else "not_ready", **health, "version": settings.VERSION}
+    )
+
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (cached dependency state, always 200; use /health/ready for routing)"""
+    health = health_prober.snapshot()
+    services = {
+        name: "unknown" if check["healthy"] is None else "connected" if check["healthy"] else "disconnected"
+        for name, check in health["checks"].items()
+    }
+    services["kafka_consumer"] = "running" if kafka_consumer.consuming else "stopped"
     return {
-        "status": "healthy" if kafka_consumer.started else "degraded",
-        "services": {
-            "postgres": "connected",
-            "kafka_consumer": "running" if kafka_consumer.started else "stopped"
-        },
+        "status": "healthy" if all(check["healthy"] for check in health["checks"].values()) else "degraded",
+        "services": services,
         "version": settings.VERSION
     }
 
+@app.get("/diagnostics")
+async def diagnostics():
+    """Startup timings and runtime counters for the database pool"""
+    report = getattr(app.state, "startup_report", None)
+    return {
+        "startup": report.snapshot() if report else None,
+        "postgres_pool": pool_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -1,9 +1,9 @@
 from aiokafka import AIOKafkaConsumer
 import asyncio
-import json
 import logging
 from app.core.config import settings
 from app.services.email_service import email_service
+from app.utils import loads
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,11 @@ class KafkaConsumerService:
         self.started = False
         self._consuming_task = None
     
+    @property
+    def consuming(self) -> bool:
+        """Whether the consumer is started and its consume loop is still alive"""
+        return self.started and self._consuming_task is not None and not self._consuming_task.done()
+
     async def start(self):
         """Start Kafka consumer"""
         if self.started:
@@ -24,7 +29,7 @@ class KafkaConsumerService:
                 bootstrap_servers=settings.KAFKA_BOOTSTRAP_SERVERS,
                 group_id=settings.KAFKA_CONSUMER_GROUP,
                 auto_offset_reset='latest',
-                value_deserializer=lambda m: json.loads(m.decode('utf-8'))
+                value_deserializer=loads
             )
             
             await self.consumer.start()
@@ -34,6 +39,15 @@ class KafkaConsumerService:
             
             logger.info(f"Kafka consumer started for topic: {settings.KAFKA_NEW_LEADS_TOPIC}")
             
+        except asyncio.CancelledError:
+            # Startup deadline hit while joining the group; close the half-started consumer
+            consumer, self.consumer = self.consumer, None
+            if consumer is not None:
+                try:
+                    await consumer.stop()
+                except Exception as e:
+                    logger.warning(f"Error closing Kafka consumer: {e}")
+            raise
         except Exception as e:
             logger.error(f"Failed to start Kafka consumer: {e}")
             self.started = False
@@ -33,6 +33,20 @@ class EmailService:
             logger.error(f"Email failed: {e}")
             return False
     
+    async def ping(self) -> None:
+        """Connect to the SMTP server, read its greeting and disconnect; raises when it is unreachable"""
+        smtp = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=False,
+            timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+        )
+        await smtp.connect()
+        try:
+            await smtp.noop()
+        finally:
+            await smtp.quit()
+
     async def _send_attorney_email(self, lead_data: dict) -> bool:
         """Send notification to attorney"""
         try:
@@ -0,0 +1,6 @@
+"""Utility functions for the application."""
+
+from .json_utils import dumps, loads, ORJSONResponse
+from .histogram import Histogram, LATENCY_BUCKETS
+
+__all__ = ["dumps", "loads", "ORJSONResponse", "Histogram", "LATENCY_BUCKETS"]
@@ -0,0 +1,22 @@
+"""JSON serialization utilities, mirroring the leads-service serializer."""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes"""
+    return orjson.dumps(obj)
+
+
+def loads(data: Any) -> Any:
+    """Deserialize JSON from bytes or str"""
+    return orjson.loads(data)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; used as the application's default response class"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)